@@ -0,0 +1,58 @@
+"""Shows the CPU cost against the bytes saved when compressing request bodies.
+
+zstd rows are printed only when ``zstandard`` is installed.
+Run from the repository root with ``python -m benchmarks.bench_compression``.
+"""
+import importlib.util
+import timeit
+
+from incognia.compression import GzipCompressor, ZstdCompressor
+from incognia.json_util import encode
+
+ADDRESS = {
+    'type': 'shipping',
+    'structured_address': {'locale': 'pt-BR', 'country_name': 'Brasil', 'country_code': 'BR',
+                           'state': 'SP', 'city': 'São Paulo', 'neighborhood': 'Bela Vista',
+                           'street': 'Av. Paulista', 'number': '1578',
+                           'postal_code': '01310-200'},
+    'address_coordinates': {'lat': -23.561414, 'lng': -46.6558819},
+}
+PAYMENT_METHOD = {'type': 'credit_card',
+                  'credit_card_info': {'bin': '123456', 'last_four_digits': '1234',
+                                       'expiry_year': '2027', 'expiry_month': '10'}}
+
+
+def payload(size):
+    return encode({
+        'type': 'payment',
+        'request_token': 'request-token',
+        'account_id': 'account-id',
+        'addresses': [ADDRESS] * size,
+        'payment_methods': [PAYMENT_METHOD] * size,
+        'custom_properties': {f'property_{i}': f'value-{i * 7919}' for i in range(20 * size)},
+    })
+
+
+def compressors():
+    for level in (1, 6, 9):
+        yield f'gzip-{level}', GzipCompressor(level)
+    if importlib.util.find_spec('zstandard') is not None:
+        for level in (1, 3, 9):
+            yield f'zstd-{level}', ZstdCompressor(level)
+
+
+def main():
+    print(f'{"body":>8}{"codec":>10}{"bytes":>8}{"saved":>8}{"ratio":>8}{"us":>10}')
+    for size in (1, 4, 16):
+        data = payload(size)
+        for name, compressor in compressors():
+            compressed = compressor.compress(data)
+            seconds = min(timeit.repeat(lambda: compressor.compress(data), number=200,
+                                        repeat=3)) / 200
+            print(f'{len(data):>8}{name:>10}{len(compressed):>8}'
+                  f'{len(data) - len(compressed):>8}{len(data) / len(compressed):>8.2f}'
+                  f'{seconds * 1e6:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""Compares HTTP/1.1 (Urllib3Transport) with multiplexed HTTP/2 (Http2Transport).
+
+Both stubs run in separate processes and count the connections they accept. The HTTP/2 stub
+speaks cleartext HTTP/2 with prior knowledge, so it needs ``h2`` and the client needs
+``httpx[http2]``. Run from the repository root with ``python -m benchmarks.bench_http2``.
+"""
+import asyncio
+import multiprocessing
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from incognia.base_request import BaseRequest
+from incognia.transport import Http2Transport, Urllib3Transport
+
+CONCURRENCY = 100
+CALLS = 5_000
+PATH = '/api/v2/authentication/transactions'
+REQUEST_BODY = b'{"type": "login", "request_token": "request-token", "account_id": "account-id"}'
+RESPONSE_BODY = b'{"risk_assessment": "low_risk"}'
+
+
+def serve_http1(port, connections):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            super().setup()
+            with connections.get_lock():
+                connections.value += 1
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers['Content-Length']))
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(RESPONSE_BODY)))
+            self.end_headers()
+            self.wfile.write(RESPONSE_BODY)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+    server.daemon_threads = True
+    server.serve_forever()
+
+
+def serve_http2(port, connections):
+    import h2.config
+    import h2.connection
+    import h2.events
+
+    async def handle(reader, writer):
+        with connections.get_lock():
+            connections.value += 1
+        connection = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+        connection.initiate_connection()
+        writer.write(connection.data_to_send())
+        while True:
+            data = await reader.read(65535)
+            if not data:
+                break
+            for event in connection.receive_data(data):
+                if isinstance(event, h2.events.DataReceived):
+                    connection.acknowledge_received_data(event.flow_controlled_length,
+                                                         event.stream_id)
+                elif isinstance(event, h2.events.StreamEnded):
+                    connection.send_headers(event.stream_id, [
+                        (':status', '200'),
+                        ('content-type', 'application/json'),
+                        ('content-length', str(len(RESPONSE_BODY))),
+                    ])
+                    connection.send_data(event.stream_id, RESPONSE_BODY, end_stream=True)
+            writer.write(connection.data_to_send())
+            await writer.drain()
+        writer.close()
+
+    async def main():
+        server = await asyncio.start_server(handle, '127.0.0.1', port)
+        await server.serve_forever()
+
+    asyncio.run(main())
+
+
+def measure(name, serve, transport, port):
+    connections = multiprocessing.Value('i', 0)
+    server = multiprocessing.Process(target=serve, args=(port, connections), daemon=True)
+    server.start()
+    time.sleep(0.5)
+    url = f'http://127.0.0.1:{port}{PATH}'
+    base_request = BaseRequest(transport=transport)
+    try:
+        tracemalloc.start()
+        started_at = time.perf_counter()
+        with ThreadPoolExecutor(CONCURRENCY) as executor:
+            for _ in executor.map(lambda _: base_request.post(url, data=REQUEST_BODY),
+                                  range(CALLS)):
+                pass
+        elapsed = time.perf_counter() - started_at
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        transport.close()
+        print(f'{name:<10}{CALLS / elapsed:>12.0f}{connections.value:>14}'
+              f'{peak / 1024:>16.0f}')
+    finally:
+        server.terminate()
+
+
+def main():
+    print(f'{"protocol":<10}{"calls/s":>12}{"connections":>14}{"peak KiB":>16}')
+    measure('HTTP/1.1', serve_http1, Urllib3Transport(maxsize=CONCURRENCY), 18090)
+    client = httpx.AsyncClient(http1=False, http2=True,
+                               limits=httpx.Limits(max_connections=CONCURRENCY))
+    measure('HTTP/2', serve_http2, Http2Transport(client=client), 18091)
+
+
+if __name__ == '__main__':
+    main()
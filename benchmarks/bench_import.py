@@ -0,0 +1,32 @@
+"""Reports the cold import time of incognia.api with ``python -X importtime``.
+
+Run from the repository root with ``python -m benchmarks.bench_import``.
+"""
+import statistics
+import subprocess
+import sys
+
+RUNS = 10
+
+
+def import_times():
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import incognia.api'],
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines()[1:]:
+        self_us, cumulative_us, name = line.split('|')
+        times[name.strip()] = (int(self_us.split(':')[1]), int(cumulative_us))
+    return times
+
+
+def main():
+    runs = [import_times() for _ in range(RUNS)]
+    cumulative = statistics.median(run['incognia.api'][1] for run in runs)
+    print(f'incognia.api cumulative import time (median of {RUNS}): {cumulative / 1000:.1f} ms')
+    print('slowest modules by self time in the last run:')
+    for name, (self_us, _) in sorted(runs[-1].items(), key=lambda item: -item[1][0])[:10]:
+        print(f'{self_us / 1000:>8.2f} ms  {name}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Compares plain dict payload parts with incognia.compact_models.
+
+Run from the repository root with ``python -m benchmarks.bench_models``.
+"""
+import timeit
+import tracemalloc
+
+from incognia import compact_models
+from incognia.json_util import encode
+
+STRUCTURED_ADDRESS = {
+    'locale': 'pt-BR',
+    'country_name': 'Brasil',
+    'country_code': 'BR',
+    'state': 'SP',
+    'city': 'São Paulo',
+    'borough': '',
+    'neighborhood': 'Bela Vista',
+    'street': 'Av. Paulista',
+    'number': '1578',
+    'complements': 'Andar 2',
+    'postal_code': '01310-200'
+}
+COORDINATES = {'lat': -23.561414, 'lng': -46.6558819}
+CARD_INFO = {'bin': '123456', 'last_four_digits': '1234', 'expiry_year': '2027',
+             'expiry_month': '10'}
+COUNT = 10_000
+
+
+def dict_payload():
+    return {
+        'addresses': [{'type': 'shipping',
+                       'structured_address': dict(STRUCTURED_ADDRESS),
+                       'address_coordinates': dict(COORDINATES)}],
+        'payment_value': {'amount': 5.0, 'currency': 'BRL'},
+        'payment_methods': [{'type': 'credit_card', 'credit_card_info': dict(CARD_INFO)}],
+    }
+
+
+def compact_payload():
+    return {
+        'addresses': [compact_models.TransactionAddress(
+            type='shipping',
+            structured_address=compact_models.StructuredAddress(**STRUCTURED_ADDRESS),
+            address_coordinates=compact_models.Coordinates(**COORDINATES))],
+        'payment_value': compact_models.PaymentValue(amount=5.0, currency='BRL'),
+        'payment_methods': [compact_models.PaymentMethod(
+            type='credit_card', credit_card_info=compact_models.CardInfo(**CARD_INFO))],
+    }
+
+
+def measure_memory(factory):
+    tracemalloc.start()
+    payloads = [factory() for _ in range(COUNT)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del payloads
+    return size / COUNT
+
+
+def measure_encode(payload):
+    return min(timeit.repeat(lambda: encode(payload), number=COUNT, repeat=5)) / COUNT
+
+
+def main():
+    dict_bytes, compact_bytes = measure_memory(dict_payload), measure_memory(compact_payload)
+    reused_compact = compact_payload()
+    dict_seconds = measure_encode(dict_payload())
+    compact_seconds = measure_encode(reused_compact)
+    print(f'{"":<10}{"bytes/payload":>16}{"us/encode":>12}')
+    print(f'{"dict":<10}{dict_bytes:>16.0f}{dict_seconds * 1e6:>12.2f}')
+    print(f'{"compact":<10}{compact_bytes:>16.0f}{compact_seconds * 1e6:>12.2f}')
+
+
+if __name__ == '__main__':
+    main()
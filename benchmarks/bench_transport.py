@@ -0,0 +1,62 @@
+"""Compares the client-side CPU cost per call of the BaseRequest transports.
+
+The stub server runs in a separate process, so process_time only accounts for the client.
+Run from the repository root with ``python -m benchmarks.bench_transport``.
+"""
+import multiprocessing
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from incognia.base_request import BaseRequest
+from incognia.transport import RequestsTransport, Urllib3Transport
+
+CALLS = 2_000
+BODY = b'{"type": "login", "request_token": "request-token", "account_id": "account-id"}'
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        body = b'{"risk_assessment": "low_risk"}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port):
+    HTTPServer(('127.0.0.1', port), Handler).serve_forever()
+
+
+def measure(base_request, url):
+    base_request.post(url, data=BODY)
+    cpu, wall = time.process_time(), time.perf_counter()
+    for _ in range(CALLS):
+        base_request.post(url, headers={'Content-Type': 'application/json'}, data=BODY)
+    return (time.process_time() - cpu) / CALLS, (time.perf_counter() - wall) / CALLS
+
+
+def main(port=18089):
+    server = multiprocessing.Process(target=serve, args=(port,), daemon=True)
+    server.start()
+    time.sleep(0.5)
+    url = f'http://127.0.0.1:{port}/api/v2/authentication/transactions'
+    try:
+        print(f'{"transport":<12}{"cpu us/call":>14}{"wall us/call":>14}')
+        for name, transport in (('requests', RequestsTransport()),
+                                ('urllib3', Urllib3Transport())):
+            cpu, wall = measure(BaseRequest(transport=transport), url)
+            print(f'{name:<12}{cpu * 1e6:>14.1f}{wall * 1e6:>14.1f}')
+    finally:
+        server.terminate()
+
+
+if __name__ == '__main__':
+    main()
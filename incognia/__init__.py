@@ -1,9 +1,4 @@
-from importlib.metadata import version, PackageNotFoundError
-
-try:
-    __version__ = version('incognia-python')
-except PackageNotFoundError:
-    __version__ = 'unknown'
+from typing import Any
 
 __all__ = ['api',
            'datetime_util',
@@ -13,4 +8,35 @@ __all__ = ['api',
            'json_util',
            'models',
            'token_manager',
-           'base_request']
+           'base_request',
+           'compact_models',
+           'rate_limiter',
+           'concurrency_limiter',
+           'transport',
+           'compression',
+           'degradation',
+           'feedback_dispatcher',
+           'load_shedder',
+           'endpoint_pool',
+           'adaptive_timeout',
+           'flight_recorder',
+           'shared_metrics',
+           'green',
+           'event_loop',
+           'streaming',
+           'columnar',
+           'backfill',
+           'fair_share']
+
+
+def __getattr__(name: str) -> Any:
+    if name != '__version__':
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    from importlib.metadata import version, PackageNotFoundError
+
+    try:
+        value = version('incognia-python')
+    except PackageNotFoundError:
+        value = 'unknown'
+    globals()[name] = value
+    return value
@@ -0,0 +1,86 @@
+import math
+from collections import deque
+from threading import Lock
+from typing import Deque, Dict, Final, Optional, Tuple
+
+_DEFAULT_PERCENTILE: Final[float] = 99.0
+_DEFAULT_MULTIPLIER: Final[float] = 2.0
+_DEFAULT_FLOOR: Final[float] = 0.05
+_DEFAULT_CEILING: Final[float] = 5.0
+_DEFAULT_WINDOW: Final[int] = 1000
+_DEFAULT_MIN_SAMPLES: Final[int] = 50
+_RECOMPUTE_FRACTION: Final[int] = 50
+
+
+class _LatencyWindow:
+    def __init__(self, window: int, floor: float, ceiling: float):
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.floor: float = floor
+        self.ceiling: float = ceiling
+        self.percentile_latency: Optional[float] = None
+        self.stale: int = 0
+        self.mutex: Lock = Lock()
+
+
+class AdaptiveTimeout:
+    def __init__(self, percentile: float = _DEFAULT_PERCENTILE,
+                 multiplier: float = _DEFAULT_MULTIPLIER, floor: float = _DEFAULT_FLOOR,
+                 ceiling: float = _DEFAULT_CEILING, window: int = _DEFAULT_WINDOW,
+                 min_samples: int = _DEFAULT_MIN_SAMPLES,
+                 endpoint_bounds: Optional[Dict[str, Tuple[float, float]]] = None):
+        if not 0 < percentile <= 100:
+            raise ValueError('percentile must be in (0, 100]')
+        if not 0 < floor <= ceiling:
+            raise ValueError('bounds must satisfy 0 < floor <= ceiling')
+        self.__percentile: float = percentile
+        self.__multiplier: float = multiplier
+        self.__floor: float = floor
+        self.__ceiling: float = ceiling
+        self.__window: int = window
+        self.__min_samples: int = min(min_samples, window)
+        self.__recompute_every: int = max(1, window // _RECOMPUTE_FRACTION)
+        self.__endpoint_bounds: Dict[str, Tuple[float, float]] = dict(endpoint_bounds or {})
+        self.__windows: Dict[str, _LatencyWindow] = {}
+        self.__mutex: Lock = Lock()
+
+    def __latency_window(self, endpoint: str) -> _LatencyWindow:
+        latency_window = self.__windows.get(endpoint)
+        if latency_window is None:
+            with self.__mutex:
+                latency_window = self.__windows.get(endpoint)
+                if latency_window is None:
+                    floor, ceiling = self.__endpoint_bounds.get(endpoint,
+                                                                (self.__floor, self.__ceiling))
+                    latency_window = _LatencyWindow(self.__window, floor, ceiling)
+                    self.__windows[endpoint] = latency_window
+        return latency_window
+
+    def __compute_percentile(self, latency_window: _LatencyWindow) -> float:
+        latencies = sorted(latency_window.latencies)
+        rank = math.ceil(self.__percentile / 100 * len(latencies)) - 1
+        return latencies[min(len(latencies) - 1, max(0, rank))]
+
+    def observe(self, endpoint: str, latency: float) -> None:
+        latency_window = self.__latency_window(endpoint)
+        with latency_window.mutex:
+            latency_window.latencies.append(latency)
+            latency_window.stale += 1
+            if len(latency_window.latencies) >= self.__min_samples \
+                    and (latency_window.percentile_latency is None
+                         or latency_window.stale >= self.__recompute_every):
+                latency_window.percentile_latency = self.__compute_percentile(latency_window)
+                latency_window.stale = 0
+
+    def timeout(self, endpoint: str) -> float:
+        latency_window = self.__latency_window(endpoint)
+        percentile_latency = latency_window.percentile_latency
+        if percentile_latency is None:
+            return latency_window.ceiling
+        return min(latency_window.ceiling,
+                   max(latency_window.floor, percentile_latency * self.__multiplier))
+
+    def metrics(self) -> Dict[str, dict]:
+        return {endpoint: {'samples': len(latency_window.latencies),
+                           'percentile_latency': latency_window.percentile_latency,
+                           'timeout': self.timeout(endpoint)}
+                for endpoint, latency_window in list(self.__windows.items())}
@@ -1,10 +1,20 @@
+import contextlib
+import contextvars
 import datetime as dt
-from typing import Optional, List
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import (Any, ContextManager, Dict, Final, Iterable, Iterator, Optional, List, Mapping,
+                    Tuple)
 
 from .datetime_util import has_timezone, datetime_valid
+from .degradation import DegradationPolicy
 from .endpoints import Endpoints
-from .exceptions import IncogniaHTTPError, IncogniaError
-from .json_util import encode
+from . import exceptions, fair_share
+from .exceptions import IncogniaError
+from .json_util import encode, RawJSON
 from .models import (
     Coordinates,
     StructuredAddress,
@@ -17,18 +27,156 @@ from .models import (
     BankAccountInfo,
 )
 from .singleton import Singleton
-from .token_manager import TokenManager
+from .token_manager import TokenManager, TokenValues
 from .base_request import BaseRequest, JSON_CONTENT_HEADER
 
+_logger = logging.getLogger(__name__)
+
+_NO_KEY: Final[ContextManager[None]] = contextlib.nullcontext()
+
+
+@functools.lru_cache(maxsize=64)
+def _normalize_device_os(device_os: str) -> str:
+    return device_os.lower()
+
 
 class IncogniaAPI(metaclass=Singleton):
-    def __init__(self, client_id: str, client_secret: str):
-        self.__token_manager = TokenManager(client_id, client_secret)
-        self.__request = BaseRequest()
+    def __init__(self, client_id: str, client_secret: str,
+                 base_request: Optional[BaseRequest] = None,
+                 degradation_policy: Optional[DegradationPolicy] = None,
+                 token_refresh_before_seconds: Optional[float] = None,
+                 endpoints: Optional[Endpoints] = None, green: bool = False,
+                 multiplexed: bool = False):
+        if green and multiplexed:
+            raise IncogniaError('green and multiplexed cannot be combined.')
+        if green:
+            from .green import GreenTransport, TokenRefresher, cooperative_lock
+
+            self.__request = base_request or BaseRequest(transport=GreenTransport())
+        elif multiplexed:
+            from .transport import Http2Transport
+
+            self.__request = base_request or BaseRequest(transport=Http2Transport())
+        else:
+            self.__request = base_request or BaseRequest()
+        self.__degradation_policy = degradation_policy
+        self.__endpoints = endpoints or Endpoints()
+        self.__token_manager = TokenManager(client_id, client_secret, self.__request,
+                                            token_refresh_before_seconds,
+                                            endpoints=self.__endpoints,
+                                            lock=cooperative_lock() if green else None)
+        self.__token_refresher: Optional[Any] = None
+        if green:
+            self.__token_refresher = TokenRefresher(self.__token_manager)
+            self.__token_refresher.start()
+        self.__keyed_by_account: bool = self.__request.fair_share() is not None
+        endpoint_pool = self.__request.endpoint_pool()
+        if endpoint_pool is not None:
+            endpoint_pool.add_canonical(self.__endpoints.BASE)
+        flight_recorder = self.__request.flight_recorder()
+        if flight_recorder is not None:
+            flight_recorder.track_token_age(self.__token_manager.token_age)
+        self.__keep_warm_stop: Optional[threading.Event] = None
+        self.__headers: Optional[Tuple[TokenValues, Mapping[str, str]]] = None
+
+    def __json_headers(self) -> Mapping[str, str]:
+        token_values = self.__token_manager.get()
+        cached = self.__headers
+        if cached is None or cached[0] is not token_values:
+            access_token, token_type = token_values
+            headers = MappingProxyType({'Authorization': f'{token_type} {access_token}',
+                                        **JSON_CONTENT_HEADER})
+            self.__headers = cached = (token_values, headers)
+        return cached[1]
+
+    def __account_key(self, account_id: Optional[str]) -> ContextManager[None]:
+        if not self.__keyed_by_account or not account_id:
+            return _NO_KEY
+        return fair_share.account(account_id)
+
+    def __post_assessment(self, account_id: str, headers: Mapping[str, str], params: Optional[dict],
+                          data: bytes) -> dict:
+        if self.__keyed_by_account:
+            with fair_share.account(account_id):
+                return self.__send_assessment(account_id, headers, params, data)
+        return self.__send_assessment(account_id, headers, params, data)
+
+    def __send_assessment(self, account_id: str, headers: Mapping[str, str],
+                          params: Optional[dict], data: bytes) -> dict:
+        if self.__degradation_policy is None:
+            return self.__request.post(self.__endpoints.TRANSACTIONS, headers=headers,
+                                       params=params, data=data)
+        return self.__degradation_policy.run(
+            account_id, functools.partial(contextvars.copy_context().run, self.__request.post,
+                                          self.__endpoints.TRANSACTIONS, headers=headers,
+                                          params=params, data=data))
+
+    def __warmup(self, connections: int) -> int:
+        with ThreadPoolExecutor(1) as executor:
+            opened = executor.submit(self.__request.warmup, self.__endpoints.BASE, connections)
+            self.__token_manager.get()
+            return opened.result()
+
+    def __keep_warm(self, connections: int, interval: float, stop: threading.Event) -> None:
+        while not stop.wait(interval):
+            try:
+                self.__warmup(connections)
+            except Exception:
+                _logger.warning('keep-warm of the Incognia client failed', exc_info=True)
+
+    def warmup(self, connections: int = 1, keep_warm_interval: Optional[float] = None) -> int:
+        opened = self.__warmup(connections)
+        if keep_warm_interval is not None:
+            self.stop_keep_warm()
+            self.__keep_warm_stop = threading.Event()
+            threading.Thread(target=self.__keep_warm,
+                             args=(connections, keep_warm_interval, self.__keep_warm_stop),
+                             name='incognia-keep-warm', daemon=True).start()
+        return opened
 
-    def __get_authorization_header(self) -> dict:
-        access_token, token_type = self.__token_manager.get()
-        return {'Authorization': f'{token_type} {access_token}'}
+    async def warmup_async(self, connections: int = 1,
+                           keep_warm_interval: Optional[float] = None) -> int:
+        import asyncio
+
+        return await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(self.warmup, connections, keep_warm_interval))
+
+    def stop_keep_warm(self) -> None:
+        if self.__keep_warm_stop is not None:
+            self.__keep_warm_stop.set()
+            self.__keep_warm_stop = None
+
+    def stop_token_refresher(self) -> None:
+        if self.__token_refresher is not None:
+            self.__token_refresher.stop()
+            self.__token_refresher = None
+
+    def close(self) -> None:
+        self.stop_keep_warm()
+        self.stop_token_refresher()
+        if Singleton._instances.get(type(self)) is self:
+            del Singleton._instances[type(self)]
+
+    def stream_transactions(self, transactions: Iterable[Mapping[str, Any]], window: int = 16,
+                            ordered: bool = True) -> Iterator[Any]:
+        from .streaming import stream_transactions
+
+        return stream_transactions(self, transactions, window, ordered)
+
+    def register_batch(self, columns: Mapping[str, Any], transaction_type: str = 'payment',
+                       window: int = 16, evaluate: Optional[bool] = None) -> Dict[str, Any]:
+        from .columnar import ColumnarBatch, register_batch
+
+        batch = columns if isinstance(columns, ColumnarBatch) \
+            else ColumnarBatch(columns, transaction_type)
+        return register_batch(self.__post_transaction, batch, window, evaluate)
+
+    def __post_transaction(self, account_id: str, params: Optional[dict],
+                           data: bytes) -> Optional[dict]:
+        try:
+            return self.__post_assessment(account_id, self.__json_headers(), params, data)
+        except exceptions.IncogniaHTTPError as e:
+            raise exceptions.IncogniaHTTPError(e) from None
 
     def register_new_signup(self,
                             request_token: Optional[str],
@@ -46,26 +194,36 @@ class IncogniaAPI(metaclass=Singleton):
             raise IncogniaError('request_token is required.')
 
         try:
-            headers = self.__get_authorization_header()
-            headers.update(JSON_CONTENT_HEADER)
+            headers = self.__json_headers()
             body = {
-                'request_token': request_token,
-                'address_line': address_line,
-                'structured_address': structured_address,
-                'address_coordinates': address_coordinates,
-                'external_id': external_id,
-                'policy_id': policy_id,
-                'account_id': account_id,
-                'device_os': device_os.lower() if device_os is not None else None,
-                'app_version': app_version,
-                'person_id': person_id,
-                'custom_properties': custom_properties
+                'request_token': request_token
             }
+            if address_line is not None:
+                body['address_line'] = address_line
+            if structured_address is not None:
+                body['structured_address'] = structured_address
+            if address_coordinates is not None:
+                body['address_coordinates'] = address_coordinates
+            if external_id is not None:
+                body['external_id'] = external_id
+            if policy_id is not None:
+                body['policy_id'] = policy_id
+            if account_id is not None:
+                body['account_id'] = account_id
+            if device_os is not None:
+                body['device_os'] = _normalize_device_os(device_os)
+            if app_version is not None:
+                body['app_version'] = app_version
+            if person_id is not None:
+                body['person_id'] = person_id
+            if custom_properties is not None:
+                body['custom_properties'] = custom_properties
             data = encode(body)
-            return self.__request.post(Endpoints.SIGNUPS, headers=headers, data=data)
+            with self.__account_key(account_id):
+                return self.__request.post(self.__endpoints.SIGNUPS, headers=headers, data=data)
 
-        except IncogniaHTTPError as e:
-            raise IncogniaHTTPError(e) from None
+        except exceptions.IncogniaHTTPError as e:
+            raise exceptions.IncogniaHTTPError(e) from None
 
     def register_new_web_signup(self,
                                 request_token: Optional[str],
@@ -77,20 +235,24 @@ class IncogniaAPI(metaclass=Singleton):
             raise IncogniaError('request_token is required.')
 
         try:
-            headers = self.__get_authorization_header()
-            headers.update(JSON_CONTENT_HEADER)
+            headers = self.__json_headers()
             body = {
-                'request_token': request_token,
-                'policy_id': policy_id,
-                'account_id': account_id,
-                'custom_properties': custom_properties,
-                'person_id': person_id,
+                'request_token': request_token
             }
+            if policy_id is not None:
+                body['policy_id'] = policy_id
+            if account_id is not None:
+                body['account_id'] = account_id
+            if custom_properties is not None:
+                body['custom_properties'] = custom_properties
+            if person_id is not None:
+                body['person_id'] = person_id
             data = encode(body)
-            return self.__request.post(Endpoints.SIGNUPS, headers=headers, data=data)
+            with self.__account_key(account_id):
+                return self.__request.post(self.__endpoints.SIGNUPS, headers=headers, data=data)
 
-        except IncogniaHTTPError as e:
-            raise IncogniaHTTPError(e) from None
+        except exceptions.IncogniaHTTPError as e:
+            raise exceptions.IncogniaHTTPError(e) from None
 
     def register_feedback(self,
                           event: str,
@@ -112,28 +274,36 @@ class IncogniaAPI(metaclass=Singleton):
             raise IncogniaError('expires_at must have timezone')
 
         try:
-            headers = self.__get_authorization_header()
-            headers.update(JSON_CONTENT_HEADER)
+            headers = self.__json_headers()
             body = {
-                'event': event,
-                'external_id': external_id,
-                'login_id': login_id,
-                'payment_id': payment_id,
-                'signup_id': signup_id,
-                'account_id': account_id,
-                'installation_id': installation_id,
-                'request_token': request_token,
-                'person_id': person_id,
+                'event': event
             }
+            if external_id is not None:
+                body['external_id'] = external_id
+            if login_id is not None:
+                body['login_id'] = login_id
+            if payment_id is not None:
+                body['payment_id'] = payment_id
+            if signup_id is not None:
+                body['signup_id'] = signup_id
+            if account_id is not None:
+                body['account_id'] = account_id
+            if installation_id is not None:
+                body['installation_id'] = installation_id
+            if request_token is not None:
+                body['request_token'] = request_token
+            if person_id is not None:
+                body['person_id'] = person_id
             if occurred_at is not None:
                 body['occurred_at'] = occurred_at.isoformat()
             if expires_at is not None:
                 body['expires_at'] = expires_at.isoformat()
             data = encode(body)
-            return self.__request.post(Endpoints.FEEDBACKS, headers=headers, data=data)
+            with self.__account_key(account_id):
+                return self.__request.post(self.__endpoints.FEEDBACKS, headers=headers, data=data)
 
-        except IncogniaHTTPError as e:
-            raise IncogniaHTTPError(e) from None
+        except exceptions.IncogniaHTTPError as e:
+            raise exceptions.IncogniaHTTPError(e) from None
 
     def register_payment(self,
                          request_token: str,
@@ -157,7 +327,7 @@ class IncogniaAPI(metaclass=Singleton):
             raise IncogniaError('request_token is required.')
         if not account_id:
             raise IncogniaError('account_id is required.')
-        if location is not None:
+        if location is not None and not isinstance(location, RawJSON):
             if location['latitude'] is None:
                 raise IncogniaError('location argument requires "latitude" field')
             if location['longitude'] is None:
@@ -169,34 +339,46 @@ class IncogniaAPI(metaclass=Singleton):
                 raise IncogniaError('location["collected_at"] must conform to ISO-8601 format')
 
         try:
-            headers = self.__get_authorization_header()
-            headers.update(JSON_CONTENT_HEADER)
+            headers = self.__json_headers()
             params = None if evaluate is None else {'eval': evaluate}
             body = {
                 'type': 'payment',
                 'request_token': request_token,
-                'account_id': account_id,
-                'external_id': external_id,
-                'location': location,
-                'addresses': addresses,
-                'payment_value': payment_value,
-                'payment_methods': payment_methods,
-                'policy_id': policy_id,
-                'custom_properties': custom_properties,
-                'coupon': coupon,
-                'device_os': device_os.lower() if device_os is not None else None,
-                'app_version': app_version,
-                'store_id': store_id,
-                'person_id': person_id,
-                'debtor_account': debtor_account,
-                'creditor_account': creditor_account,
+                'account_id': account_id
             }
+            if external_id is not None:
+                body['external_id'] = external_id
+            if location is not None:
+                body['location'] = location
+            if addresses is not None:
+                body['addresses'] = addresses
+            if payment_value is not None:
+                body['payment_value'] = payment_value
+            if payment_methods is not None:
+                body['payment_methods'] = payment_methods
+            if policy_id is not None:
+                body['policy_id'] = policy_id
+            if custom_properties is not None:
+                body['custom_properties'] = custom_properties
+            if coupon is not None:
+                body['coupon'] = coupon
+            if device_os is not None:
+                body['device_os'] = _normalize_device_os(device_os)
+            if app_version is not None:
+                body['app_version'] = app_version
+            if store_id is not None:
+                body['store_id'] = store_id
+            if person_id is not None:
+                body['person_id'] = person_id
+            if debtor_account is not None:
+                body['debtor_account'] = debtor_account
+            if creditor_account is not None:
+                body['creditor_account'] = creditor_account
             data = encode(body)
-            return self.__request.post(Endpoints.TRANSACTIONS, headers=headers, params=params,
-                                       data=data)
+            return self.__post_assessment(account_id, headers, params, data)
 
-        except IncogniaHTTPError as e:
-            raise IncogniaHTTPError(e) from None
+        except exceptions.IncogniaHTTPError as e:
+            raise exceptions.IncogniaHTTPError(e) from None
 
     def register_login(self,
                        request_token: str,
@@ -214,7 +396,7 @@ class IncogniaAPI(metaclass=Singleton):
             raise IncogniaError('request_token is required.')
         if not account_id:
             raise IncogniaError('account_id is required.')
-        if location is not None:
+        if location is not None and not isinstance(location, RawJSON):
             if location['latitude'] is None:
                 raise IncogniaError('location argument requires "latitude" field')
             if location['longitude'] is None:
@@ -226,27 +408,32 @@ class IncogniaAPI(metaclass=Singleton):
                 raise IncogniaError('location["collected_at"] must conform to ISO-8601 format')
 
         try:
-            headers = self.__get_authorization_header()
-            headers.update(JSON_CONTENT_HEADER)
+            headers = self.__json_headers()
             params = None if evaluate is None else {'eval': evaluate}
             body = {
                 'type': 'login',
                 'request_token': request_token,
-                'account_id': account_id,
-                'location': location,
-                'external_id': external_id,
-                'policy_id': policy_id,
-                'device_os': device_os.lower() if device_os is not None else None,
-                'app_version': app_version,
-                'custom_properties': custom_properties,
-                'person_id': person_id,
+                'account_id': account_id
             }
+            if location is not None:
+                body['location'] = location
+            if external_id is not None:
+                body['external_id'] = external_id
+            if policy_id is not None:
+                body['policy_id'] = policy_id
+            if device_os is not None:
+                body['device_os'] = _normalize_device_os(device_os)
+            if app_version is not None:
+                body['app_version'] = app_version
+            if custom_properties is not None:
+                body['custom_properties'] = custom_properties
+            if person_id is not None:
+                body['person_id'] = person_id
             data = encode(body)
-            return self.__request.post(Endpoints.TRANSACTIONS, headers=headers, params=params,
-                                       data=data)
+            return self.__post_assessment(account_id, headers, params, data)
 
-        except IncogniaHTTPError as e:
-            raise IncogniaHTTPError(e) from None
+        except exceptions.IncogniaHTTPError as e:
+            raise exceptions.IncogniaHTTPError(e) from None
 
     def register_web_login(self,
                            request_token: str,
@@ -262,21 +449,25 @@ class IncogniaAPI(metaclass=Singleton):
             raise IncogniaError('account_id is required.')
 
         try:
-            headers = self.__get_authorization_header()
-            headers.update(JSON_CONTENT_HEADER)
+            headers = self.__json_headers()
             params = None if evaluate is None else {'eval': evaluate}
             body = {
                 'type': 'login',
                 'request_token': request_token,
-                'account_id': account_id,
-                'external_id': external_id,
-                'policy_id': policy_id,
-                'custom_properties': custom_properties,
-                'person_id': person_id,
+                'account_id': account_id
             }
+            if external_id is not None:
+                body['external_id'] = external_id
+            if policy_id is not None:
+                body['policy_id'] = policy_id
+            if custom_properties is not None:
+                body['custom_properties'] = custom_properties
+            if person_id is not None:
+                body['person_id'] = person_id
             data = encode(body)
-            return self.__request.post(Endpoints.TRANSACTIONS, headers=headers, params=params,
-                                       data=data)
+            with self.__account_key(account_id):
+                return self.__request.post(self.__endpoints.TRANSACTIONS, headers=headers,
+                                           params=params, data=data)
 
-        except IncogniaHTTPError as e:
-            raise IncogniaHTTPError(e) from None
+        except exceptions.IncogniaHTTPError as e:
+            raise exceptions.IncogniaHTTPError(e) from None
@@ -0,0 +1,324 @@
+import argparse
+import csv
+import datetime as dt
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import (Any, BinaryIO, Callable, Deque, Dict, Final, FrozenSet, Iterator, List,
+                    Mapping, Optional, Set, Tuple)
+
+from .api import IncogniaAPI
+from .base_request import BaseRequest
+from .datetime_util import has_timezone
+from .exceptions import IncogniaError
+from .feedback_dispatcher import FeedbackDispatcher
+from .feedback_events import FeedbackEvents
+from .rate_limiter import RateLimiter
+
+_logger = logging.getLogger(__name__)
+
+FIELDS: Final[Tuple[str, ...]] = ('event', 'external_id', 'login_id', 'payment_id', 'signup_id',
+                                  'account_id', 'installation_id', 'request_token',
+                                  'occurred_at', 'expires_at')
+_TIMESTAMPS: Final[FrozenSet[str]] = frozenset({'occurred_at', 'expires_at'})
+_EVENTS: Final[FrozenSet[str]] = frozenset(
+    value for name, value in vars(FeedbackEvents).items() if not name.startswith('_'))
+_DEFAULT_CONCURRENCY: Final[int] = 8
+_DEFAULT_CHECKPOINT_INTERVAL: Final[float] = 5.0
+
+
+def _parse_datetime(value: str) -> dt.datetime:
+    try:
+        parsed = dt.datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        raise IncogniaError(f'{value!r} does not conform to ISO-8601 format') from None
+    if not has_timezone(parsed):
+        raise IncogniaError(f'{value!r} must have timezone')
+    return parsed
+
+
+def feedback_from_record(record: Mapping[str, Any], columns: Mapping[str, str],
+                         events: Mapping[str, str]) -> Dict[str, Any]:
+    feedback: Dict[str, Any] = {}
+    for field, column in columns.items():
+        value = record.get(column)
+        if value is None or value == '':
+            continue
+        feedback[field] = _parse_datetime(value) if field in _TIMESTAMPS else value
+    event = feedback.get('event')
+    event = events.get(event, event)
+    if event not in _EVENTS:
+        raise IncogniaError(f'unknown feedback event: {event!r}')
+    feedback['event'] = event
+    return feedback
+
+
+def _write_durably(path: str, data: bytes) -> None:
+    temporary = f'{path}.tmp'
+    with open(temporary, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+    if hasattr(os, 'O_DIRECTORY'):
+        directory = os.open(os.path.dirname(os.path.abspath(path)), os.O_DIRECTORY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+
+class Checkpoint:
+    def __init__(self, path: str, input_path: str):
+        self.__path: str = path
+        self.__input: str = os.path.abspath(input_path)
+        self.offset: int = 0
+        self.done: Set[int] = set()
+        self.sent: int = 0
+        self.failed: int = 0
+
+    def load(self) -> bool:
+        try:
+            with open(self.__path, 'rb') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return False
+        if state['input'] != self.__input:
+            raise IncogniaError(f'checkpoint {self.__path} belongs to {state["input"]}')
+        self.offset, self.done = state['offset'], set(state['done'])
+        self.sent, self.failed = state['sent'], state['failed']
+        return True
+
+    def save(self) -> None:
+        _write_durably(self.__path, json.dumps({
+            'input': self.__input, 'offset': self.offset, 'done': sorted(self.done),
+            'sent': self.sent, 'failed': self.failed}).encode('utf-8'))
+
+
+class _Progress:
+    def __init__(self, checkpoint: Checkpoint):
+        self.__checkpoint: Checkpoint = checkpoint
+        self.__lines: Deque[Tuple[int, int]] = deque()
+        self.__mutex: threading.Lock = threading.Lock()
+
+    def add(self, start: int, end: int) -> None:
+        with self.__mutex:
+            self.__lines.append((start, end))
+
+    def complete(self, start: int, sent: Optional[bool]) -> None:
+        checkpoint = self.__checkpoint
+        with self.__mutex:
+            checkpoint.done.add(start)
+            if sent:
+                checkpoint.sent += 1
+            elif sent is not None:
+                checkpoint.failed += 1
+            while self.__lines and self.__lines[0][0] in checkpoint.done:
+                line_start, checkpoint.offset = self.__lines.popleft()
+                checkpoint.done.discard(line_start)
+
+    def save(self, before: Callable[[], None]) -> None:
+        with self.__mutex:
+            before()
+            self.__checkpoint.save()
+
+
+class _Lines:
+    def __init__(self, f: BinaryIO, offset: int):
+        f.seek(offset)
+        self.__f: BinaryIO = f
+        self.__start: int = offset
+        self.__end: int = offset
+        self.__raw: List[bytes] = []
+
+    def __iter__(self) -> '_Lines':
+        return self
+
+    def __next__(self) -> str:
+        line = self.__f.readline()
+        if not line:
+            raise StopIteration
+        self.__end += len(line)
+        self.__raw.append(line)
+        return line.decode('utf-8')
+
+    def take(self) -> Tuple[int, int, bytes]:
+        record = (self.__start, self.__end, b''.join(self.__raw))
+        self.__start, self.__raw = self.__end, []
+        return record
+
+
+def _csv_rows(lines: _Lines) -> Iterator[Tuple[int, int, bytes, Any]]:
+    reader = csv.reader(lines, strict=True)
+    while True:
+        try:
+            row: Any = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            row = e
+        yield (*lines.take(), row)
+
+
+def _records(f: BinaryIO, input_format: str,
+             offset: int) -> Iterator[Tuple[int, int, bytes, Any]]:
+    if input_format != 'csv':
+        lines = _Lines(f, offset)
+        for _ in lines:
+            start, end, line = lines.take()
+            if not line.strip():
+                yield start, end, line, None
+                continue
+            try:
+                yield start, end, line, json.loads(line.decode('utf-8'))
+            except ValueError as e:
+                yield start, end, line, e
+        return
+    _, header_end, _, header = next(_csv_rows(_Lines(f, 0)), (0, 0, b'', []))
+    if isinstance(header, csv.Error):
+        raise IncogniaError(f'invalid CSV header: {header}')
+    if header:
+        header[0] = header[0].lstrip('\ufeff')
+    for start, end, line, row in _csv_rows(_Lines(f, max(header_end, offset))):
+        if not row:
+            row = None
+        elif not isinstance(row, csv.Error):
+            row = dict(zip(header, row))
+        yield start, end, line, row
+
+
+class _DeadLetter:
+    def __init__(self, path: str):
+        self.__file: Any = open(path, 'ab')
+        self.__mutex: threading.Lock = threading.Lock()
+
+    def write(self, start: int, line: bytes, error: BaseException) -> None:
+        entry = json.dumps({'offset': start,
+                            'line': line.decode('utf-8', 'replace').rstrip('\r\n'),
+                            'error': f'{type(error).__name__}: {error}'})
+        with self.__mutex:
+            self.__file.write(entry.encode('utf-8') + b'\n')
+
+    def sync(self) -> None:
+        with self.__mutex:
+            self.__file.flush()
+            os.fsync(self.__file.fileno())
+
+    def close(self) -> None:
+        self.sync()
+        self.__file.close()
+
+
+def run(api: Any, input_path: str, input_format: Optional[str] = None,
+        columns: Optional[Mapping[str, str]] = None, events: Optional[Mapping[str, str]] = None,
+        checkpoint_path: Optional[str] = None, dead_letter_path: Optional[str] = None,
+        concurrency: int = _DEFAULT_CONCURRENCY,
+        checkpoint_interval: float = _DEFAULT_CHECKPOINT_INTERVAL) -> Checkpoint:
+    input_format = input_format or ('csv' if input_path.endswith('.csv') else 'jsonl')
+    columns = columns or {field: field for field in FIELDS}
+    events = events or {}
+    checkpoint = Checkpoint(checkpoint_path or f'{input_path}.checkpoint', input_path)
+    if checkpoint.load():
+        _logger.info('resuming %s from byte %d', input_path, checkpoint.offset)
+    resumed_done = set(checkpoint.done)
+    progress = _Progress(checkpoint)
+    f = open(input_path, 'rb')
+    dead_letter = _DeadLetter(dead_letter_path or f'{input_path}.dead-letter.jsonl')
+    outstanding = threading.BoundedSemaphore(concurrency * 2)
+
+    def on_done(start: int, line: bytes, future: Future) -> None:
+        error = future.exception()
+        if error is not None:
+            dead_letter.write(start, line, error)
+        progress.complete(start, error is None)
+        outstanding.release()
+
+    def submit(dispatcher: FeedbackDispatcher, record: Any) -> Future:
+        future: Future = Future()
+        try:
+            if isinstance(record, Exception):
+                raise record
+            feedback = feedback_from_record(record, columns, events)
+        except Exception as e:
+            future.set_exception(e)
+            return future
+        return dispatcher.submit(**feedback)
+
+    saved_at = time.monotonic()
+    try:
+        with f, FeedbackDispatcher(api, workers=concurrency) as dispatcher:
+            for start, end, line, record in _records(f, input_format, checkpoint.offset):
+                progress.add(start, end)
+                if start in resumed_done or record is None:
+                    progress.complete(start, None)
+                    continue
+                outstanding.acquire()
+                submit(dispatcher, record).add_done_callback(
+                    lambda done, start=start, line=line: on_done(start, line, done))
+                if time.monotonic() - saved_at >= checkpoint_interval:
+                    progress.save(dead_letter.sync)
+                    saved_at = time.monotonic()
+    finally:
+        progress.save(dead_letter.close)
+    return checkpoint
+
+
+def _pairs(values: List[str], option: str) -> Dict[str, str]:
+    pairs = {}
+    for value in values:
+        key, separator, mapped = value.partition('=')
+        if not separator:
+            raise SystemExit(f'{option} expects KEY=VALUE, got {value!r}')
+        pairs[key] = mapped
+    return pairs
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m incognia.backfill',
+        description='Sends historical feedbacks from a CSV or JSONL file to Incognia.')
+    parser.add_argument('input', help='CSV file with a header line, or JSONL file')
+    parser.add_argument('--format', choices=('csv', 'jsonl'), dest='input_format',
+                        help='input format, guessed from the file extension by default')
+    parser.add_argument('--column', action='append', default=[], metavar='FIELD=COLUMN',
+                        help='reads a feedback field from another column, can be repeated')
+    parser.add_argument('--event', action='append', default=[], metavar='VALUE=EVENT',
+                        help='maps an input value to a FeedbackEvents value, can be repeated')
+    parser.add_argument('--checkpoint', help='checkpoint file, INPUT.checkpoint by default')
+    parser.add_argument('--dead-letter',
+                        help='file for failed rows, INPUT.dead-letter.jsonl by default')
+    parser.add_argument('--concurrency', type=int, default=_DEFAULT_CONCURRENCY)
+    parser.add_argument('--rate', type=float, help='maximum feedbacks per second')
+    parser.add_argument('--checkpoint-interval', type=float,
+                        default=_DEFAULT_CHECKPOINT_INTERVAL, help='seconds between checkpoints')
+    parser.add_argument('--client-id', default=os.environ.get('INCOGNIA_CLIENT_ID'))
+    parser.add_argument('--client-secret', default=os.environ.get('INCOGNIA_CLIENT_SECRET'))
+    args = parser.parse_args(argv)
+    if not args.client_id or not args.client_secret:
+        parser.error('--client-id and --client-secret (or INCOGNIA_CLIENT_ID and '
+                     'INCOGNIA_CLIENT_SECRET) are required')
+
+    columns = {field: field for field in FIELDS}
+    columns.update(_pairs(args.column, '--column'))
+    unknown = columns.keys() - set(FIELDS)
+    if unknown:
+        parser.error(f'unknown feedback fields: {", ".join(sorted(unknown))}')
+    rate_limiter = RateLimiter(args.rate) if args.rate else None
+    api = IncogniaAPI(args.client_id, args.client_secret,
+                      base_request=BaseRequest(rate_limiter=rate_limiter))
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    checkpoint = run(api, args.input, args.input_format, columns,
+                     _pairs(args.event, '--event'), args.checkpoint, args.dead_letter,
+                     args.concurrency, args.checkpoint_interval)
+    _logger.info('sent %d feedbacks, %d failed', checkpoint.sent, checkpoint.failed)
+    return 1 if checkpoint.failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,23 +1,40 @@
+import functools
 import json
-import platform
-import sys
-from typing import Final, Any, Union, Optional
+import time
+from types import MappingProxyType
+from typing import Callable, Final, Any, Mapping, Tuple, Union, Optional
 
-import requests
+from incognia import exceptions
+from incognia.adaptive_timeout import AdaptiveTimeout
+from incognia.compression import RequestCompression
+from incognia.concurrency_limiter import AdaptiveConcurrencyLimiter, default_priority
+from incognia.endpoint_pool import EndpointPool
+from incognia.fair_share import FairShareScheduler, current_key
+from incognia.flight_recorder import FlightRecorder, payload_size
+from incognia.load_shedder import LoadShedder
+from incognia.rate_limiter import RateLimiter
+from incognia.shared_metrics import SharedMetrics
+from incognia.transport import Timeout, Transport, RequestsTransport
 
-from incognia.exceptions import IncogniaHTTPError
 
-_LIBRARY_VERSION: Final[str] = sys.modules['incognia'].__version__
-_OS_NAME: Final[str] = platform.system()
-_OS_VERSION: Final[str] = platform.release()
-_OS_ARCH: Final[str] = platform.architecture()[0]
-_LANGUAGE_VERSION: Final[str] = platform.python_version()
+@functools.lru_cache(maxsize=None)
+def user_agent_header() -> dict:
+    import platform
+
+    from incognia import __version__
+
+    return {
+        'User-Agent': f'incognia-python/{__version__}'
+                      f' ({platform.system()} {platform.release()} {platform.architecture()[0]})'
+                      f' Python/{platform.python_version()}'
+    }
+
+
+def __getattr__(name: str) -> Any:
+    if name == 'USER_AGENT_HEADER':
+        return user_agent_header()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
-USER_AGENT_HEADER: Final[dict] = {
-    'User-Agent': f'incognia-python/{_LIBRARY_VERSION}'
-                  f' ({_OS_NAME} {_OS_VERSION} {_OS_ARCH})'
-                  f' Python/{_LANGUAGE_VERSION}'
-}
 
 JSON_CONTENT_HEADER: Final[dict] = {
     'Content-Type': 'application/json'
@@ -25,26 +42,173 @@ JSON_CONTENT_HEADER: Final[dict] = {
 
 
 class BaseRequest:
-    def __init__(self, timeout: float = 5.0):
+    def __init__(self, timeout: float = 5.0, rate_limiter: Optional[RateLimiter] = None,
+                 concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+                 transport: Optional[Transport] = None,
+                 compression: Optional[RequestCompression] = None,
+                 priority: Callable[[Union[str, bytes]], int] = default_priority,
+                 load_shedder: Optional[LoadShedder] = None,
+                 endpoint_pool: Optional[EndpointPool] = None,
+                 adaptive_timeout: Optional[AdaptiveTimeout] = None,
+                 flight_recorder: Optional[FlightRecorder] = None,
+                 metrics: Optional[SharedMetrics] = None,
+                 fair_share: Optional[FairShareScheduler] = None):
         self.__timeout: float = timeout
+        self.__fair_share: Optional[FairShareScheduler] = fair_share
+        self.__metrics: Optional[SharedMetrics] = metrics
+        self.__flight_recorder: Optional[FlightRecorder] = flight_recorder
+        self.__adaptive_timeout: Optional[AdaptiveTimeout] = adaptive_timeout
+        self.__endpoint_pool: Optional[EndpointPool] = endpoint_pool
+        self.__load_shedder: Optional[LoadShedder] = load_shedder
+        self.__priority: Callable[[Union[str, bytes]], int] = priority
+        self.__compression: Optional[RequestCompression] = compression
+        self.__transport: Transport = transport or RequestsTransport()
+        self.__rate_limiter: Optional[RateLimiter] = rate_limiter
+        self.__concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = concurrency_limiter
+        self.__headers: Optional[Tuple[Mapping[str, str], Mapping[str, str]]] = None
 
     def timeout(self) -> float:
         return self.__timeout
 
-    def post(self, url: Union[str, bytes], headers: Any = None, data: Any = None,
-             params: Any = None,
+    def transport(self) -> Transport:
+        return self.__transport
+
+    def flight_recorder(self) -> Optional[FlightRecorder]:
+        return self.__flight_recorder
+
+    def fair_share(self) -> Optional[FairShareScheduler]:
+        return self.__fair_share
+
+    def endpoint_pool(self) -> Optional[EndpointPool]:
+        return self.__endpoint_pool
+
+    def warmup(self, url: Union[str, bytes], connections: int = 1) -> int:
+        if self.__endpoint_pool is not None:
+            _, url = self.__endpoint_pool.route(url)
+        return self.__transport.warmup(url, connections, self.__timeout)
+
+    def __with_user_agent(self, headers: Optional[Mapping[str, str]]) -> Mapping[str, str]:
+        if not isinstance(headers, MappingProxyType):
+            return {**headers, **user_agent_header()} if headers else user_agent_header()
+        cached = self.__headers
+        if cached is None or cached[0] is not headers:
+            cached = (headers, MappingProxyType({**headers, **user_agent_header()}))
+            self.__headers = cached
+        return cached[1]
+
+    def post(self, url: Union[str, bytes], headers: Optional[Mapping[str, str]] = None,
+             data: Any = None, params: Any = None,
              auth: Optional[Any] = None) -> Optional[dict]:
-        headers = headers or {}
-        headers.update(USER_AGENT_HEADER)
+        headers = self.__with_user_agent(headers)
+        if self.__compression is not None:
+            headers, data = self.__compression.apply(headers, data)
+
+        if self.__flight_recorder is None and self.__metrics is None:
+            return self.__admit(url, headers, data, params, auth, 0.0)
+
+        received_at = time.perf_counter()
+        try:
+            return self.__admit(url, headers, data, params, auth, received_at)
+        except exceptions.IncogniaError as e:
+            rejected_at = time.perf_counter()
+            if self.__flight_recorder is not None:
+                self.__flight_recorder.record(url, None, received_at, rejected_at, rejected_at,
+                                              payload_size(data), 0, type(e).__name__)
+            if self.__metrics is not None:
+                self.__metrics.observe(url, None, rejected_at - received_at, rejected=True)
+            raise
+
+    def __admit(self, url: Union[str, bytes], headers: Any, data: Any, params: Any,
+                auth: Optional[Any], received_at: float) -> Optional[dict]:
+        if self.__load_shedder is None:
+            return self.__dispatch(url, headers, data, params, auth, received_at)
 
+        self.__load_shedder.acquire(url)
         try:
-            response = requests.post(url=url, headers=headers, data=data, params=params,
-                                     timeout=self.__timeout,
-                                     auth=auth)
-            response.raise_for_status()
-            if len(response.content) == 0:
-                return None
-            return json.loads(response.content.decode('utf-8')) or None
-
-        except requests.HTTPError as e:
-            raise IncogniaHTTPError(e) from None
+            return self.__dispatch(url, headers, data, params, auth, received_at)
+        finally:
+            self.__load_shedder.release(url)
+
+    def __dispatch(self, url: Union[str, bytes], headers: Any, data: Any, params: Any,
+                   auth: Optional[Any], received_at: float) -> Optional[dict]:
+        if self.__rate_limiter is not None:
+            self.__rate_limiter.acquire(url)
+
+        if self.__fair_share is None:
+            return self.__limit(url, headers, data, params, auth, received_at)
+
+        key = current_key()
+        self.__fair_share.acquire(key)
+        try:
+            return self.__limit(url, headers, data, params, auth, received_at)
+        finally:
+            self.__fair_share.release(key)
+
+    def __limit(self, url: Union[str, bytes], headers: Any, data: Any, params: Any,
+                auth: Optional[Any], received_at: float) -> Optional[dict]:
+        if self.__concurrency_limiter is None:
+            return self.__send(url, headers, data, params, auth, received_at)
+
+        priority = self.__priority(url)
+        started_at = self.__concurrency_limiter.acquire(priority)
+        success = False
+        try:
+            result = self.__send(url, headers, data, params, auth, received_at)
+            success = True
+            return result
+        except exceptions.IncogniaHTTPError as e:
+            success = e.response is not None and e.response.status_code < 500 \
+                and e.response.status_code != 429
+            raise
+        finally:
+            self.__concurrency_limiter.release(started_at, success, priority)
+
+    def __send(self, url: Union[str, bytes], headers: Any, data: Any, params: Any,
+               auth: Optional[Any], received_at: float) -> Optional[dict]:
+        if self.__endpoint_pool is None and self.__adaptive_timeout is None \
+                and self.__flight_recorder is None and self.__metrics is None:
+            response = self.__transport.post(url, headers, data, params, self.__timeout, auth)
+            return self.__receive(url, response)
+
+        base, target_url = (None, url) if self.__endpoint_pool is None \
+            else self.__endpoint_pool.route(url)
+        timeout: Timeout = self.__timeout if self.__adaptive_timeout is None \
+            else (self.__timeout, self.__adaptive_timeout.timeout(url))
+        response, error = None, None
+        sent_at = time.perf_counter()
+        try:
+            response = self.__transport.post(target_url, headers, data, params, timeout, auth)
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            finished_at = time.perf_counter()
+            status_code = response.status_code if response is not None else None
+            if self.__endpoint_pool is not None:
+                self.__endpoint_pool.record(base, finished_at - sent_at,
+                                            status_code is not None and status_code < 500)
+            if self.__adaptive_timeout is not None:
+                self.__adaptive_timeout.observe(url, finished_at - sent_at)
+            if self.__flight_recorder is not None:
+                self.__flight_recorder.record(
+                    url, status_code, received_at, sent_at, finished_at, payload_size(data),
+                    len(response.content) if response is not None else 0, error)
+            if self.__metrics is not None:
+                self.__metrics.observe(url, status_code, finished_at - sent_at)
+        return self.__receive(url, response)
+
+    def __receive(self, url: Union[str, bytes], response: Any) -> Optional[dict]:
+        status_code = response.status_code
+        if self.__rate_limiter is not None:
+            self.__rate_limiter.on_response(url, status_code,
+                                            response.headers.get('Retry-After'))
+        if status_code >= 400:
+            kind = 'Client' if status_code < 500 else 'Server'
+            reason = response.reason
+            if isinstance(reason, bytes):
+                reason = reason.decode('utf-8', 'replace')
+            raise exceptions.IncogniaHTTPError(
+                f'{status_code} {kind} Error: {reason} for url: {url}', response=response)
+        if len(response.content) == 0:
+            return None
+        return json.loads(response.content.decode('utf-8')) or None
@@ -0,0 +1,259 @@
+import itertools
+from json.encoder import encode_basestring
+from typing import Any, Callable, Dict, Final, FrozenSet, Iterator, List, Mapping, Optional, Tuple
+
+from .exceptions import IncogniaError
+from .json_util import RawJSON
+from .streaming import stream_calls
+
+_REQUIRED: Final[tuple] = ('request_token', 'account_id')
+_STRINGS: Final[tuple] = ('external_id', 'policy_id', 'device_os', 'app_version')
+_LOCATION: Final[FrozenSet[str]] = frozenset({'latitude', 'longitude', 'collected_at'})
+_PAYMENT_VALUE: Final[FrozenSet[str]] = frozenset({'amount', 'currency'})
+_COLUMNS: Final[Mapping[str, FrozenSet[str]]] = {
+    'login': frozenset(_REQUIRED + _STRINGS) | _LOCATION,
+    'payment': frozenset(_REQUIRED + _STRINGS) | _LOCATION | _PAYMENT_VALUE,
+}
+_BODY_FIELDS: Final[Mapping[str, tuple]] = {
+    'login': ('location', 'external_id', 'policy_id', 'device_os', 'app_version'),
+    'payment': ('external_id', 'location', 'payment_value', 'policy_id', 'device_os',
+                'app_version'),
+}
+_DAYS_IN_MONTH: Final[tuple] = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+_TIMESTAMP_WIDTH: Final[int] = 32
+
+PostTransaction = Callable[[str, Optional[dict], bytes], Optional[dict]]
+
+
+def _import_numpy() -> Any:
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError('columnar batches require numpy, '
+                          'install incognia-python[numpy]') from None
+    return numpy
+
+
+def _iso8601_valid(np: Any, text: Any) -> Any:
+    size = len(text)
+    codes = np.zeros((size, _TIMESTAMP_WIDTH), dtype=np.int64)
+    if size:
+        width = text.dtype.itemsize // 4
+        characters = np.ascontiguousarray(text).view(np.uint32).reshape(size, width)
+        codes[:, :min(width, _TIMESTAMP_WIDTH)] = characters[:, :_TIMESTAMP_WIDTH]
+    length = np.char.str_len(text)
+
+    def column(position: Any) -> Any:
+        if isinstance(position, int):
+            return codes[:, position]
+        position = np.clip(position, 0, _TIMESTAMP_WIDTH - 1)
+        return np.take_along_axis(codes, position[:, None], axis=1)[:, 0]
+
+    def char(position: Any, characters: str) -> Any:
+        return np.isin(column(position), [ord(c) for c in characters])
+
+    def number(*positions: Any) -> Any:
+        value = np.zeros(size, dtype=np.int64)
+        digits = np.ones(size, dtype=bool)
+        for position in positions:
+            code = column(position)
+            digits &= (code >= 48) & (code <= 57)
+            value = value * 10 + code - 48
+        return np.where(digits, value, -1)
+
+    year, month, day = number(0, 1, 2, 3), number(5, 6), number(8, 9)
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    days = np.asarray(_DAYS_IN_MONTH)[np.clip(month, 0, 12)] + ((month == 2) & leap)
+    date = (year >= 1) & char(4, '-') & char(7, '-') & (month >= 1) & (month <= 12) \
+        & (day >= 1) & (day <= days)
+
+    hour, minute, second = number(11, 12), number(14, 15), number(17, 18)
+    minutes = char(10, 'T ') & (hour >= 0) & (hour < 24) & char(13, ':') & (minute >= 0) \
+        & (minute < 60)
+    seconds = minutes & char(16, ':') & (second >= 0) & (second < 60)
+    milliseconds = seconds & char(19, '.') & (number(20, 21, 22) >= 0)
+    microseconds = milliseconds & (number(23, 24, 25) >= 0)
+
+    valid = date & (length == 10)
+    for offset in (0, 1, 6):
+        end = length - offset
+        time = ((end == 16) & minutes) | ((end == 19) & seconds) \
+            | ((end == 23) & milliseconds) | ((end == 26) & microseconds)
+        if offset == 1:
+            time &= char(end, 'Z')
+        elif offset == 6:
+            offset_hour, offset_minute = number(end + 1, end + 2), number(end + 4, end + 5)
+            time &= char(end, '+-') & (offset_hour >= 0) & (offset_hour < 24) \
+                & char(end + 3, ':') & (offset_minute >= 0) & (offset_minute < 60)
+        valid |= date & time
+    return valid
+
+
+class ColumnarBatch:
+    def __init__(self, columns: Mapping[str, Any], transaction_type: str = 'payment'):
+        np = _import_numpy()
+        if transaction_type not in _COLUMNS:
+            raise IncogniaError(f'transaction_type must be one of {", ".join(_COLUMNS)}.')
+        unknown = columns.keys() - _COLUMNS[transaction_type]
+        if unknown:
+            raise TypeError(f'ColumnarBatch got unexpected columns: {", ".join(sorted(unknown))}')
+        sizes = {len(column) for column in columns.values()}
+        if len(sizes) > 1:
+            raise IncogniaError('columns must have the same length.')
+
+        self.__np: Any = np
+        self.__type: str = transaction_type
+        self.__size: int = sizes.pop() if sizes else 0
+        self.__errors: Any = np.full(self.__size, None, dtype=object)
+        self.__invalid: Any = np.zeros(self.__size, dtype=bool)
+        self.__columns: Dict[str, Any] = {
+            name: np.asarray(columns[name], dtype=object) if name in columns
+            else np.full(self.__size, None, dtype=object)
+            for name in _REQUIRED + _STRINGS + ('collected_at', 'currency')}
+        for name in ('latitude', 'longitude', 'amount'):
+            self.__columns[name] = np.asarray(columns[name], dtype=float) if name in columns \
+                else np.full(self.__size, np.nan)
+        self.__validate()
+
+    def __reject(self, mask: Any, message: str) -> None:
+        fresh = mask & ~self.__invalid
+        if fresh.any():
+            self.__errors[fresh] = IncogniaError(message)
+            self.__invalid |= mask
+
+    def __missing(self, name: str) -> Any:
+        column = self.__columns[name]
+        if column.dtype == object:
+            # pandas marks missing values in object columns with NaN
+            return self.__np.equal(column, None) | (column != column)
+        return self.__np.isnan(column)
+
+    def __present(self, name: str) -> Any:
+        return ~self.__missing(name)
+
+    def __validate(self) -> None:
+        np, columns = self.__np, self.__columns
+        for name in _REQUIRED:
+            self.__reject(self.__missing(name) | np.equal(columns[name], ''),
+                          f'{name} is required.')
+
+        has_latitude, has_longitude = self.__present('latitude'), self.__present('longitude')
+        has_collected_at = self.__present('collected_at')
+        self.__reject(~has_latitude & (has_longitude | has_collected_at),
+                      'location argument requires "latitude" field')
+        self.__reject(~has_longitude & (has_latitude | has_collected_at),
+                      'location argument requires "longitude" field')
+        with np.errstate(invalid='ignore'):
+            self.__reject(np.abs(columns['latitude']) > 90,
+                          'location["latitude"] must be between -90 and 90')
+            self.__reject(np.abs(columns['longitude']) > 180,
+                          'location["longitude"] must be between -180 and 180')
+        collected_at = np.where(has_collected_at, columns['collected_at'], '').astype(str)
+        self.__reject(has_collected_at & ~_iso8601_valid(np, collected_at),
+                      'location["collected_at"] must conform to ISO-8601 format')
+        self.__has_location: Any = has_latitude
+
+        has_amount, has_currency = self.__present('amount'), self.__present('currency')
+        self.__reject(has_amount != has_currency,
+                      'payment_value requires "amount" and "currency" fields')
+        with np.errstate(invalid='ignore'):
+            self.__reject((has_amount & ~np.isfinite(columns['amount']))
+                          | (columns['amount'] < 0),
+                          'payment_value["amount"] must be a non-negative number')
+        self.__has_payment_value: Any = has_amount
+
+    def __len__(self) -> int:
+        return self.__size
+
+    @property
+    def valid(self) -> Any:
+        return ~self.__invalid
+
+    @property
+    def errors(self) -> Any:
+        return self.__errors.copy()
+
+    def __encoded(self, name: str, rows: Any, present: Any) -> Any:
+        np = self.__np
+        column = self.__columns[name][rows]
+        encoded = np.full(len(rows), '', dtype=object)
+        if column.dtype == object:
+            values = map(str, column[present].tolist())
+            if name == 'device_os':
+                values = map(str.lower, values)
+            encoded[present] = list(map(encode_basestring, values))
+        else:
+            encoded[present] = list(map(float.__repr__, column[present].tolist()))
+        return encoded
+
+    def __fragments(self, rows: Any) -> Dict[str, Any]:
+        np = self.__np
+        fragments = {}
+        for name in _REQUIRED + _STRINGS:
+            fragments[name] = self.__encoded(name, rows, self.__present(name)[rows])
+        has_location = self.__has_location[rows]
+        has_collected_at = self.__present('collected_at')[rows] & has_location
+        collected_at = ', "collected_at": ' \
+            + self.__encoded('collected_at', rows, has_collected_at)
+        fragments['location'] = np.where(
+            has_location, '{"latitude": ' + self.__encoded('latitude', rows, has_location)
+            + ', "longitude": ' + self.__encoded('longitude', rows, has_location)
+            + np.where(has_collected_at, collected_at, '') + '}', '')
+        if self.__type == 'payment':
+            has_payment_value = self.__has_payment_value[rows]
+            fragments['payment_value'] = np.where(
+                has_payment_value,
+                '{"amount": ' + self.__encoded('amount', rows, has_payment_value)
+                + ', "currency": ' + self.__encoded('currency', rows, has_payment_value) + '}',
+                '')
+        return fragments
+
+    def bodies(self) -> Tuple[Any, List[str], List[bytes]]:
+        np = self.__np
+        rows = np.flatnonzero(~self.__invalid)
+        fragments = self.__fragments(rows)
+        bodies = f'{{"type": "{self.__type}", "request_token": ' + fragments['request_token'] \
+            + ', "account_id": ' + fragments['account_id']
+        for name in _BODY_FIELDS[self.__type]:
+            fragment = fragments[name]
+            bodies = bodies + np.where(fragment != '', f', "{name}": ' + fragment, '')
+        bodies = bodies + '}'
+        account_ids = list(map(str, self.__columns['account_id'][rows].tolist()))
+        return rows, account_ids, list(map(str.encode, bodies.tolist()))
+
+    def transactions(self, evaluate: Optional[bool] = None) -> Iterator[Dict[str, Any]]:
+        rows = self.__np.flatnonzero(~self.__invalid)
+        names = _REQUIRED + _STRINGS
+        fragments = self.__fragments(rows)
+        values = zip(*(self.__columns[name][rows].tolist() for name in names))
+        payment_values = fragments['payment_value'].tolist() if self.__type == 'payment' \
+            else itertools.repeat(None)
+        for row, location, payment_value in zip(values, fragments['location'].tolist(),
+                                                payment_values):
+            transaction = {'type': self.__type}
+            for name, value in zip(names, row):
+                if value is not None and value == value:
+                    transaction[name] = value
+            if location:
+                transaction['location'] = RawJSON(location)
+            if payment_value:
+                transaction['payment_value'] = RawJSON(payment_value)
+            if evaluate is not None:
+                transaction['evaluate'] = evaluate
+            yield transaction
+
+
+def register_batch(post: PostTransaction, batch: ColumnarBatch, window: int = 16,
+                   evaluate: Optional[bool] = None) -> Dict[str, Any]:
+    np = _import_numpy()
+    assessments = np.full(len(batch), None, dtype=object)
+    errors = batch.errors
+    rows, account_ids, bodies = batch.bodies()
+    params = None if evaluate is None else {'eval': evaluate}
+    for result in stream_calls(post, zip(account_ids, itertools.repeat(params), bodies), window,
+                               ordered=False):
+        row = rows[result.index]
+        assessments[row], errors[row] = result.assessment, result.error
+    risk_assessments = np.array([assessment.get('risk_assessment') if assessment else None
+                                 for assessment in assessments.tolist()], dtype=object)
+    return {'assessment': assessments, 'risk_assessment': risk_assessments, 'error': errors}
@@ -0,0 +1,167 @@
+from typing import Any, Dict, Final, NoReturn, Optional, Tuple, Type
+
+from .exceptions import IncogniaError
+from .json_util import encode_fragment
+
+
+class _FrozenDict(dict):
+    __slots__ = ()
+
+    def __immutable(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError(f'{type(self).__name__} is immutable')
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = __immutable
+    __ior__ = __immutable
+
+    def __hash__(self) -> int:
+        return hash(frozenset(self.items()))
+
+
+def _freeze(value: Any, model: Optional[Type['CompactModel']] = None) -> Any:
+    if isinstance(value, list):
+        return tuple(_freeze(v, model) for v in value)
+    if isinstance(value, dict):
+        if model is not None:
+            return model(**value)
+        return _FrozenDict((k, _freeze(v)) for (k, v) in value.items())
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, CompactModel):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    if isinstance(value, _FrozenDict):
+        return {k: _thaw(v) for (k, v) in value.items()}
+    return value
+
+
+class CompactModel:
+    __slots__ = ('_json_fragment',)
+
+    _FIELDS: Tuple[str, ...] = ()
+    _REQUIRED: Tuple[str, ...] = ()
+    _NESTED: Dict[str, Type['CompactModel']] = {}
+
+    def __init__(self, **fields: Any):
+        unknown = fields.keys() - set(self._FIELDS)
+        if unknown:
+            raise TypeError(f'{type(self).__name__} got unexpected fields: '
+                            f'{", ".join(sorted(unknown))}')
+        for name in self._FIELDS:
+            value = fields.get(name)
+            if value is None and name in self._REQUIRED:
+                raise IncogniaError(f'{name} is required.')
+            object.__setattr__(self, name, _freeze(value, self._NESTED.get(name)))
+        object.__setattr__(self, '_json_fragment', None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, None) if key in self._FIELDS else None
+        return default if value is None else value
+
+    def _values(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self._FIELDS)
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __hash__(self) -> int:
+        return hash((type(self), self._values()))
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self._FIELDS
+                           if getattr(self, name) is not None)
+        return f'{type(self).__name__}({fields})'
+
+    def to_dict(self) -> dict:
+        return {name: _thaw(value) for (name, value) in zip(self._FIELDS, self._values())
+                if value is not None}
+
+    @property
+    def json_fragment(self) -> str:
+        fragment: Optional[str] = self._json_fragment
+        if fragment is None:
+            fragment = encode_fragment({name: value for (name, value)
+                                        in zip(self._FIELDS, self._values())
+                                        if value is not None})
+            object.__setattr__(self, '_json_fragment', fragment)
+        return fragment
+
+
+class Coordinates(CompactModel):
+    _FIELDS: Final = ('lat', 'lng')
+    _REQUIRED: Final = ('lat', 'lng')
+    __slots__ = _FIELDS
+
+
+class StructuredAddress(CompactModel):
+    _FIELDS: Final = ('locale', 'country_name', 'country_code', 'state', 'city', 'borough',
+                      'neighborhood', 'street', 'number', 'complements', 'postal_code')
+    __slots__ = _FIELDS
+
+
+class Coupon(CompactModel):
+    _FIELDS: Final = ('type', 'value', 'max_discount', 'id', 'name')
+    __slots__ = _FIELDS
+
+
+class TransactionAddress(CompactModel):
+    _FIELDS: Final = ('type', 'structured_address', 'address_coordinates')
+    _NESTED: Final = {'structured_address': StructuredAddress,
+                      'address_coordinates': Coordinates}
+    __slots__ = _FIELDS
+
+
+class PaymentValue(CompactModel):
+    _FIELDS: Final = ('amount', 'currency')
+    _REQUIRED: Final = ('amount', 'currency')
+    __slots__ = _FIELDS
+
+
+class CardInfo(CompactModel):
+    _FIELDS: Final = ('bin', 'last_four_digits', 'expiry_year', 'expiry_month')
+    __slots__ = _FIELDS
+
+
+class PaymentMethod(CompactModel):
+    _FIELDS: Final = ('type', 'credit_card_info', 'debit_card_info')
+    _NESTED: Final = {'credit_card_info': CardInfo, 'debit_card_info': CardInfo}
+    __slots__ = _FIELDS
+
+
+class Location(CompactModel):
+    _FIELDS: Final = ('latitude', 'longitude', 'collected_at')
+    __slots__ = _FIELDS
+
+
+class PersonID(CompactModel):
+    _FIELDS: Final = ('type', 'value')
+    __slots__ = _FIELDS
+
+
+class PixKey(CompactModel):
+    _FIELDS: Final = ('type', 'value')
+    _REQUIRED: Final = ('type', 'value')
+    __slots__ = _FIELDS
+
+
+class BankAccountInfo(CompactModel):
+    _FIELDS: Final = ('account_type', 'account_purpose', 'holder_type', 'holder_tax_id',
+                      'country', 'ispb_code', 'branch_code', 'account_number',
+                      'account_check_digit', 'pix_keys')
+    _NESTED: Final = {'holder_tax_id': PersonID, 'pix_keys': PixKey}
+    __slots__ = _FIELDS
@@ -0,0 +1,76 @@
+import gzip
+from abc import ABC, abstractmethod
+from typing import Any, Final, Mapping, Optional, Tuple, Union
+
+_DEFAULT_THRESHOLD: Final[int] = 1024
+
+
+class Compressor(ABC):
+    encoding: str = 'identity'
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+
+class GzipCompressor(Compressor):
+    encoding: str = 'gzip'
+
+    def __init__(self, level: int = 6):
+        self.__level: int = level
+
+    def compress(self, data: bytes) -> bytes:
+        return gzip.compress(data, compresslevel=self.__level, mtime=0)
+
+
+class ZstdCompressor(Compressor):
+    encoding: str = 'zstd'
+
+    def __init__(self, level: int = 3):
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError('ZstdCompressor requires zstandard, '
+                              'install incognia-python[zstd]') from None
+        self.__compressor: Any = zstandard.ZstdCompressor(level=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self.__compressor.compress(data)
+
+
+_COMPRESSORS: Final[dict] = {
+    'gzip': GzipCompressor,
+    'zstd': ZstdCompressor,
+}
+
+
+class RequestCompression:
+    def __init__(self, compressor: Union[str, Compressor] = 'gzip',
+                 threshold: int = _DEFAULT_THRESHOLD,
+                 accept_encoding: Optional[str] = None):
+        if isinstance(compressor, str):
+            if compressor not in _COMPRESSORS:
+                raise ValueError(f'unsupported compression: {compressor}')
+            compressor = _COMPRESSORS[compressor]()
+        self.__compressor: Compressor = compressor
+        self.__threshold: int = threshold
+        if accept_encoding is None:
+            from urllib3.util.request import ACCEPT_ENCODING
+
+            accept_encoding = ACCEPT_ENCODING
+        self.__accept_encoding: str = accept_encoding
+
+    @property
+    def threshold(self) -> int:
+        return self.__threshold
+
+    def apply(self, headers: Mapping[str, str], data: Any) -> Tuple[dict, Any]:
+        headers = dict(headers)
+        if self.__accept_encoding:
+            headers['Accept-Encoding'] = self.__accept_encoding
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        if isinstance(data, bytes) and len(data) >= self.__threshold:
+            data = self.__compressor.compress(data)
+            headers['Content-Encoding'] = self.__compressor.encoding
+        return headers, data
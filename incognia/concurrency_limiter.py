@@ -0,0 +1,204 @@
+import itertools
+import time
+from collections import deque
+from threading import Condition, Lock
+from typing import Any, Callable, Deque, Final, Optional, Union
+
+from .exceptions import IncogniaConcurrencyLimitError
+
+_DEFAULT_BACKOFF_RATIO: Final[float] = 0.9
+_DEFAULT_LATENCY_TOLERANCE: Final[float] = 2.0
+_DEFAULT_MAX_LOW_PRIORITY_WAIT: Final[float] = 1.0
+_MIN_LATENCY_WINDOW: Final[int] = 500
+_LOW_PRIORITY_PATHS: Final[tuple] = ('/feedbacks',)
+
+
+class Priority:
+    HIGH: Final[int] = 0
+    LOW: Final[int] = 1
+
+
+def default_priority(url: Union[str, bytes]) -> int:
+    if isinstance(url, bytes):
+        url = url.decode('utf-8')
+    path = url.split('?', 1)[0].rstrip('/')
+    return Priority.LOW if path.endswith(_LOW_PRIORITY_PATHS) else Priority.HIGH
+
+
+class _Waiter:
+    __slots__ = ('priority', 'sequence', 'enqueued_at', 'condition')
+
+    def __init__(self, priority: int, sequence: int, enqueued_at: float, lock: Lock):
+        self.priority: int = priority
+        self.sequence: int = sequence
+        self.enqueued_at: float = enqueued_at
+        self.condition: Condition = Condition(lock)
+
+
+class AdaptiveConcurrencyLimiter:
+    def __init__(self, initial_limit: int = 20, min_limit: int = 1, max_limit: int = 200,
+                 latency_threshold: Optional[float] = None,
+                 latency_tolerance: float = _DEFAULT_LATENCY_TOLERANCE,
+                 backoff_ratio: float = _DEFAULT_BACKOFF_RATIO,
+                 block: bool = True, queue_timeout: Optional[float] = None,
+                 reserved_capacity: float = 0.0,
+                 max_low_priority_wait: Optional[float] = _DEFAULT_MAX_LOW_PRIORITY_WAIT,
+                 clock: Callable[[], float] = time.monotonic):
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError('limits must satisfy 1 <= min_limit <= initial_limit <= max_limit')
+        if not 0.0 <= reserved_capacity < 1.0:
+            raise ValueError('reserved_capacity must be in [0, 1)')
+        self.__limit: float = float(initial_limit)
+        self.__min_limit: int = min_limit
+        self.__max_limit: int = max_limit
+        self.__latency_threshold: Optional[float] = latency_threshold
+        self.__latency_tolerance: float = latency_tolerance
+        self.__backoff_ratio: float = backoff_ratio
+        self.__block: bool = block
+        self.__queue_timeout: Optional[float] = queue_timeout
+        self.__reserved_capacity: float = reserved_capacity
+        self.__max_low_priority_wait: Optional[float] = max_low_priority_wait
+        self.__clock: Callable[[], float] = clock
+        self.__in_flight: int = 0
+        self.__low_priority_in_flight: int = 0
+        self.__queued: int = 0
+        self.__promoted: int = 0
+        self.__waiters: Deque[_Waiter] = deque()
+        self.__low_priority_waiters: Deque[_Waiter] = deque()
+        self.__sequence: Any = itertools.count()
+        self.__rejected: int = 0
+        self.__min_latency: Optional[float] = None
+        self.__window_min_latency: Optional[float] = None
+        self.__window_samples: int = 0
+        self.__lock: Lock = Lock()
+
+    @property
+    def limit(self) -> int:
+        return int(self.__limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self.__in_flight
+
+    @property
+    def queued(self) -> int:
+        return self.__queued
+
+    @property
+    def rejected(self) -> int:
+        return self.__rejected
+
+    @property
+    def low_priority_limit(self) -> int:
+        return max(1, int(self.__limit * (1.0 - self.__reserved_capacity)))
+
+    def metrics(self) -> dict:
+        with self.__lock:
+            queued_low = len(self.__low_priority_waiters)
+            return {'limit': self.limit, 'in_flight': self.__in_flight,
+                    'queued': self.__queued, 'rejected': self.__rejected,
+                    'low_priority_limit': self.low_priority_limit,
+                    'low_priority_in_flight': self.__low_priority_in_flight,
+                    'low_priority_queued': queued_low,
+                    'low_priority_promoted': self.__promoted}
+
+    def __reject(self, reason: str) -> None:
+        self.__rejected += 1
+        raise IncogniaConcurrencyLimitError(reason)
+
+    def __is_aged(self, waiter: _Waiter, now: float) -> bool:
+        return self.__max_low_priority_wait is not None \
+            and now - waiter.enqueued_at >= self.__max_low_priority_wait
+
+    def __head(self) -> Optional[_Waiter]:
+        if self.__in_flight >= self.limit:
+            return None
+        now = self.__clock()
+        high = self.__waiters[0] if self.__waiters else None
+        low = self.__low_priority_waiters[0] if self.__low_priority_waiters else None
+        if low is not None and self.__is_aged(low, now):
+            return low if high is None or low.sequence < high.sequence else high
+        if high is not None:
+            return high
+        if low is not None and self.__low_priority_in_flight < self.low_priority_limit:
+            return low
+        return None
+
+    def __notify_head(self) -> None:
+        head = self.__head()
+        if head is not None:
+            head.condition.notify()
+
+    def __queue(self, waiter: _Waiter) -> Deque[_Waiter]:
+        return self.__low_priority_waiters if waiter.priority == Priority.LOW else self.__waiters
+
+    def __wait_timeout(self, waiter: _Waiter, deadline: Optional[float]) -> Optional[float]:
+        now = self.__clock()
+        timeouts = [] if deadline is None else [deadline - now]
+        if waiter.priority == Priority.LOW and self.__max_low_priority_wait is not None:
+            aged_at = waiter.enqueued_at + self.__max_low_priority_wait
+            if aged_at > now:
+                timeouts.append(aged_at - now)
+        return min(timeouts) if timeouts else None
+
+    def __wait(self, waiter: _Waiter) -> None:
+        deadline = None if self.__queue_timeout is None \
+            else waiter.enqueued_at + self.__queue_timeout
+        self.__queued += 1
+        try:
+            while self.__head() is not waiter:
+                timeout = self.__wait_timeout(waiter, deadline)
+                if timeout is not None and timeout <= 0:
+                    self.__reject(f'timed out waiting for one of {self.limit} slots')
+                waiter.condition.wait(timeout)
+        finally:
+            self.__queued -= 1
+
+    def acquire(self, priority: int = Priority.HIGH) -> float:
+        with self.__lock:
+            waiter = _Waiter(priority, next(self.__sequence), self.__clock(), self.__lock)
+            queue = self.__queue(waiter)
+            queue.append(waiter)
+            try:
+                if self.__head() is not waiter:
+                    if not self.__block:
+                        self.__reject(f'concurrency limit of {self.limit} reached')
+                    self.__wait(waiter)
+                if priority == Priority.LOW:
+                    if self.__low_priority_in_flight >= self.low_priority_limit:
+                        self.__promoted += 1
+                    self.__low_priority_in_flight += 1
+                self.__in_flight += 1
+            finally:
+                queue.remove(waiter)
+                self.__notify_head()
+        return self.__clock()
+
+    def __is_congested(self, latency: float) -> bool:
+        if self.__latency_threshold is not None:
+            return latency > self.__latency_threshold
+        if self.__window_min_latency is None or latency < self.__window_min_latency:
+            self.__window_min_latency = latency
+        if self.__min_latency is None or latency < self.__min_latency:
+            self.__min_latency = latency
+        congested = latency > self.__min_latency * self.__latency_tolerance
+        self.__window_samples += 1
+        if self.__window_samples >= _MIN_LATENCY_WINDOW:
+            # forget minimums older than a window so a slower baseline is picked up again
+            self.__min_latency = self.__window_min_latency
+            self.__window_min_latency, self.__window_samples = None, 0
+        return congested
+
+    def release(self, started_at: float, success: bool = True,
+                priority: int = Priority.HIGH) -> None:
+        latency = self.__clock() - started_at
+        with self.__lock:
+            was_saturated = self.__in_flight >= self.limit
+            self.__in_flight -= 1
+            if priority == Priority.LOW:
+                self.__low_priority_in_flight -= 1
+            if not success or self.__is_congested(latency):
+                self.__limit = max(float(self.__min_limit), self.__limit * self.__backoff_ratio)
+            elif was_saturated:
+                self.__limit = min(float(self.__max_limit), self.__limit + 1 / self.__limit)
+            self.__notify_head()
@@ -0,0 +1,144 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from threading import BoundedSemaphore, Lock
+from typing import Any, Callable, Final, Optional, Tuple
+
+from . import exceptions
+
+_DEGRADED_KEY: Final[str] = 'degraded'
+_DEGRADATION_REASON_KEY: Final[str] = 'degradation_reason'
+
+LateResponseCallback = Callable[[str, Optional[dict], Optional[BaseException]], None]
+
+
+def is_degraded(assessment: Optional[dict]) -> bool:
+    return bool(assessment and assessment.get(_DEGRADED_KEY))
+
+
+def _is_server_failure(e: BaseException) -> bool:
+    import requests
+
+    if isinstance(e, exceptions.IncogniaHTTPError):
+        return e.response is None or e.response.status_code >= 500 \
+            or e.response.status_code == 429
+    return isinstance(e, (requests.ConnectionError, requests.Timeout))
+
+
+class FallbackProvider(ABC):
+    @abstractmethod
+    def get(self, account_id: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def record(self, account_id: str, assessment: Optional[dict]) -> None:
+        pass
+
+
+class StaticFallback(FallbackProvider):
+    def __init__(self, assessment: dict):
+        self.__assessment: dict = dict(assessment)
+
+    def get(self, account_id: str) -> Optional[dict]:
+        return dict(self.__assessment)
+
+
+class StaleAssessmentCache(FallbackProvider):
+    def __init__(self, maxsize: int = 10_000, max_age: Optional[float] = None,
+                 fallback: Optional[FallbackProvider] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.__maxsize: int = maxsize
+        self.__max_age: Optional[float] = max_age
+        self.__fallback: Optional[FallbackProvider] = fallback
+        self.__clock: Callable[[], float] = clock
+        self.__assessments: 'OrderedDict[str, Tuple[float, dict]]' = OrderedDict()
+        self.__mutex: Lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self.__assessments)
+
+    def get(self, account_id: str) -> Optional[dict]:
+        with self.__mutex:
+            entry = self.__assessments.get(account_id)
+            if entry is not None and (self.__max_age is None
+                                      or self.__clock() - entry[0] <= self.__max_age):
+                self.__assessments.move_to_end(account_id)
+                return dict(entry[1])
+        return self.__fallback.get(account_id) if self.__fallback is not None else None
+
+    def record(self, account_id: str, assessment: Optional[dict]) -> None:
+        if not account_id or not assessment:
+            return
+        with self.__mutex:
+            self.__assessments[account_id] = (self.__clock(), dict(assessment))
+            self.__assessments.move_to_end(account_id)
+            if len(self.__assessments) > self.__maxsize:
+                self.__assessments.popitem(last=False)
+
+
+class DegradationPolicy:
+    def __init__(self, budget: float, fallback: FallbackProvider,
+                 on_late_response: Optional[LateResponseCallback] = None,
+                 max_workers: int = 32):
+        self.__budget: float = budget
+        self.__fallback: FallbackProvider = fallback
+        self.__on_late_response: Optional[LateResponseCallback] = on_late_response
+        self.__executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers, thread_name_prefix='incognia-degradation')
+        self.__idle_workers: BoundedSemaphore = BoundedSemaphore(max_workers)
+
+    def __degraded(self, account_id: str, reason: str) -> Optional[dict]:
+        fallback = self.__fallback.get(account_id)
+        if fallback is None:
+            return None
+        return {**fallback, _DEGRADED_KEY: True, _DEGRADATION_REASON_KEY: reason}
+
+    def __late_response(self, account_id: str, future: Future) -> None:
+        error = future.exception()
+        assessment = None if error is not None else future.result()
+        if error is None:
+            self.__fallback.record(account_id, assessment)
+        if self.__on_late_response is not None:
+            self.__on_late_response(account_id, assessment, error)
+
+    def __submit(self, call: Callable[[], Any]) -> Optional[Future]:
+        if not self.__idle_workers.acquire(blocking=False):
+            return None
+        try:
+            future = self.__executor.submit(call)
+        except BaseException:
+            self.__idle_workers.release()
+            raise
+        future.add_done_callback(lambda _: self.__idle_workers.release())
+        return future
+
+    def run(self, account_id: str, call: Callable[[], Any]) -> Optional[dict]:
+        future = self.__submit(call)
+        if future is None:
+            degraded = self.__degraded(account_id, 'workers_saturated')
+            if degraded is not None:
+                return degraded
+            assessment = call()
+            self.__fallback.record(account_id, assessment)
+            return assessment
+        try:
+            assessment = future.result(timeout=self.__budget)
+        except FutureTimeoutError:
+            degraded = self.__degraded(account_id, 'latency_budget_exceeded')
+            if degraded is None:
+                assessment = future.result()
+            else:
+                if not future.cancel():
+                    future.add_done_callback(lambda f: self.__late_response(account_id, f))
+                return degraded
+        except Exception as e:
+            degraded = self.__degraded(account_id, 'server_failure') \
+                if _is_server_failure(e) else None
+            if degraded is None:
+                raise
+            return degraded
+        self.__fallback.record(account_id, assessment)
+        return assessment
+
+    def shutdown(self, wait: bool = True) -> None:
+        self.__executor.shutdown(wait=wait)
@@ -0,0 +1,185 @@
+import socket
+import threading
+import time
+from collections import deque
+from threading import Lock
+from typing import Callable, Deque, Dict, Final, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urlsplit, urlunsplit
+
+from .endpoints import Endpoints
+
+_DEFAULT_PROBE_INTERVAL: Final[float] = 30.0
+_DEFAULT_PROBE_TIMEOUT: Final[float] = 1.0
+_DEFAULT_MAX_ERROR_RATE: Final[float] = 0.5
+_DEFAULT_WINDOW: Final[int] = 50
+_MIN_ERROR_RATE_SAMPLES: Final[int] = 5
+_LATENCY_SMOOTHING: Final[float] = 0.2
+_SWITCH_LATENCY_RATIO: Final[float] = 0.8
+
+Probe = Callable[[str, float], float]
+_Base = Tuple[str, str, str]
+
+
+def probe_connect_latency(base: str, timeout: float) -> float:
+    parts = urlsplit(base)
+    port = parts.port or (443 if parts.scheme == 'https' else 80)
+    started_at = time.perf_counter()
+    with socket.create_connection((parts.hostname, port), timeout):
+        return time.perf_counter() - started_at
+
+
+def _split_base(base: str) -> _Base:
+    parts = urlsplit(base)
+    return parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/')
+
+
+def _smooth(average: Optional[float], latency: float) -> float:
+    return latency if average is None else average + _LATENCY_SMOOTHING * (latency - average)
+
+
+class _Candidate:
+    def __init__(self, base: str, window: int):
+        self.base: str = base
+        self.probe_latency: Optional[float] = None
+        self.request_latency: Optional[float] = None
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def speed(self) -> Tuple[bool, float, bool, float]:
+        return (self.probe_latency is None, self.probe_latency or 0.0,
+                self.request_latency is None, self.request_latency or 0.0)
+
+    def observe_probe(self, latency: Optional[float]) -> None:
+        self.outcomes.append(latency is not None)
+        if latency is not None:
+            self.probe_latency = _smooth(self.probe_latency, latency)
+
+    def observe_request(self, latency: float, success: bool) -> None:
+        self.outcomes.append(success)
+        if success:
+            self.request_latency = _smooth(self.request_latency, latency)
+
+
+class EndpointPool:
+    def __init__(self, candidates: Sequence[str], canonical: str = Endpoints.BASE,
+                 max_error_rate: float = _DEFAULT_MAX_ERROR_RATE,
+                 max_latency: Optional[float] = None, window: int = _DEFAULT_WINDOW,
+                 probe_interval: Optional[float] = _DEFAULT_PROBE_INTERVAL,
+                 probe_timeout: float = _DEFAULT_PROBE_TIMEOUT,
+                 probe: Probe = probe_connect_latency):
+        if not candidates:
+            raise ValueError('at least one candidate base URL is required')
+        self.__canonicals: Tuple[_Base, ...] = (_split_base(canonical),)
+        self.__max_error_rate: float = max_error_rate
+        self.__max_latency: Optional[float] = max_latency
+        self.__probe_timeout: float = probe_timeout
+        self.__probe: Probe = probe
+        self.__candidates: List[_Candidate] = [_Candidate(base.rstrip('/'), window)
+                                               for base in candidates]
+        self.__by_base: Dict[str, _Candidate] = {c.base: c for c in self.__candidates}
+        self.__current: _Candidate = self.__candidates[0]
+        self.__mutex: Lock = Lock()
+        self.__stop: threading.Event = threading.Event()
+        self.__probe_interval: Optional[float] = probe_interval
+        self.__started: bool = probe_interval is None
+
+    @property
+    def current(self) -> str:
+        return self.__current.base
+
+    def start(self) -> None:
+        with self.__mutex:
+            if self.__started or self.__stop.is_set():
+                return
+            self.__started = True
+        threading.Thread(target=self.__probe_periodically, args=(self.__probe_interval,),
+                         name='incognia-endpoint-probe', daemon=True).start()
+
+    def add_canonical(self, canonical: str) -> None:
+        canonical_base = _split_base(canonical)
+        with self.__mutex:
+            if canonical_base not in self.__canonicals:
+                self.__canonicals += (canonical_base,)
+
+    def route(self, url: Union[str, bytes]) -> Tuple[Optional[str], Union[str, bytes]]:
+        if not self.__started:
+            self.start()
+        if isinstance(url, str):
+            parts = urlsplit(url)
+            scheme, netloc = parts.scheme.lower(), parts.netloc.lower()
+            for canonical_scheme, canonical_netloc, canonical_path in self.__canonicals:
+                if scheme != canonical_scheme or netloc != canonical_netloc:
+                    continue
+                if parts.path == canonical_path or parts.path.startswith(f'{canonical_path}/'):
+                    base = self.__current.base
+                    path = parts.path[len(canonical_path):]
+                    return base, f'{base}{urlunsplit(("", "", path, parts.query, ""))}'
+        return None, url
+
+    def __is_healthy(self, candidate: _Candidate) -> bool:
+        if len(candidate.outcomes) >= _MIN_ERROR_RATE_SAMPLES \
+                and candidate.error_rate > self.__max_error_rate:
+            return False
+        return self.__max_latency is None or candidate.request_latency is None \
+            or candidate.request_latency <= self.__max_latency
+
+    @staticmethod
+    def __is_faster(candidate: _Candidate, current: _Candidate) -> bool:
+        for latency, current_latency in ((candidate.probe_latency, current.probe_latency),
+                                         (candidate.request_latency, current.request_latency)):
+            if current_latency is None:
+                if latency is not None:
+                    return True
+            elif latency is not None:
+                return latency < current_latency * _SWITCH_LATENCY_RATIO
+        return False
+
+    def __select(self) -> None:
+        healthy = [c for c in self.__candidates if self.__is_healthy(c)]
+        if not healthy:
+            self.__current = min(self.__candidates, key=lambda c: (c.error_rate, c.speed()))
+            return
+        fastest = min(healthy, key=_Candidate.speed)
+        current = self.__current
+        if current not in healthy or self.__is_faster(fastest, current):
+            self.__current = fastest
+
+    def record(self, base: Optional[str], latency: float, success: bool) -> None:
+        candidate = self.__by_base.get(base) if base is not None else None
+        if candidate is None:
+            return
+        with self.__mutex:
+            candidate.observe_request(latency, success)
+            self.__select()
+
+    def probe(self) -> None:
+        for candidate in self.__candidates:
+            try:
+                latency: Optional[float] = self.__probe(candidate.base, self.__probe_timeout)
+            except OSError:
+                latency = None
+            with self.__mutex:
+                candidate.observe_probe(latency)
+        with self.__mutex:
+            self.__select()
+
+    def __probe_periodically(self, interval: float) -> None:
+        while True:
+            self.probe()
+            if self.__stop.wait(interval):
+                return
+
+    def metrics(self) -> Dict[str, dict]:
+        with self.__mutex:
+            return {c.base: {'probe_latency': c.probe_latency,
+                             'request_latency': c.request_latency, 'error_rate': c.error_rate,
+                             'healthy': self.__is_healthy(c), 'current': c is self.__current}
+                    for c in self.__candidates}
+
+    def close(self) -> None:
+        self.__stop.set()
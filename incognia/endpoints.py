@@ -8,3 +8,14 @@ class Endpoints:
     SIGNUPS: Final[str] = f'{BASE}/api/v2/onboarding/signups'
     FEEDBACKS: Final[str] = f'{BASE}/api/v2/feedbacks'
     TRANSACTIONS: Final[str] = f'{BASE}/api/v2/authentication/transactions'
+
+    def __init__(self, base: str = BASE):
+        base = base.rstrip('/')
+        self.BASE = base
+        self.TOKEN = f'{base}/api/v2/token'
+        self.SIGNUPS = f'{base}/api/v2/onboarding/signups'
+        self.FEEDBACKS = f'{base}/api/v2/feedbacks'
+        self.TRANSACTIONS = f'{base}/api/v2/authentication/transactions'
+
+    def __repr__(self) -> str:
+        return f'Endpoints({self.BASE!r})'
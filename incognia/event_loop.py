@@ -0,0 +1,116 @@
+import atexit
+import os
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Final, Optional, TypeVar
+
+from .exceptions import IncogniaError
+
+_SHUTDOWN_TIMEOUT: Final[float] = 5.0
+
+T = TypeVar('T')
+
+
+class EventLoopThread:
+    def __init__(self, name: str = 'incognia-event-loop'):
+        import asyncio
+
+        self.__asyncio: Any = asyncio
+        self.__name: str = name
+        self.__pid: int = os.getpid()
+        self.__loop: Optional[Any] = None
+        self.__thread: Optional[threading.Thread] = None
+        self.__closed: bool = False
+        self.__mutex: threading.Lock = threading.Lock()
+
+    @property
+    def pid(self) -> int:
+        return self.__pid
+
+    def __start(self) -> Any:
+        with self.__mutex:
+            if self.__closed:
+                raise IncogniaError('event loop is closed')
+            if self.__loop is None:
+                self.__loop = self.__asyncio.new_event_loop()
+                self.__thread = threading.Thread(target=self.__loop.run_forever,
+                                                 name=self.__name, daemon=True)
+                self.__thread.start()
+            return self.__loop
+
+    def in_loop_thread(self) -> bool:
+        return self.__thread is not None and self.__thread.ident == threading.get_ident()
+
+    def submit(self, coroutine_function: Callable[..., Awaitable[T]], *args: Any) -> Future:
+        if os.getpid() != self.__pid:
+            raise IncogniaError('event loop belongs to the parent process')
+        if self.in_loop_thread():
+            raise IncogniaError('cannot wait on the event loop from its own thread')
+        loop = self.__loop
+        if loop is None or self.__closed:
+            loop = self.__start()
+        return self.__asyncio.run_coroutine_threadsafe(coroutine_function(*args), loop)
+
+    def run(self, coroutine_function: Callable[..., Awaitable[T]], *args: Any) -> T:
+        return self.submit(coroutine_function, *args).result()
+
+    async def __cancel_tasks(self) -> None:
+        current = self.__asyncio.current_task()
+        tasks = [task for task in self.__asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        await self.__asyncio.gather(*tasks, return_exceptions=True)
+        await self.__loop.shutdown_asyncgens()
+
+    def close(self, timeout: float = _SHUTDOWN_TIMEOUT) -> None:
+        with self.__mutex:
+            if self.__closed:
+                return
+            self.__closed = True
+            loop, thread = self.__loop, self.__thread
+        if loop is None or os.getpid() != self.__pid:
+            return
+        try:
+            self.__asyncio.run_coroutine_threadsafe(self.__cancel_tasks(), loop).result(timeout)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if not thread.is_alive():
+            loop.close()
+
+
+_shared: Optional[EventLoopThread] = None
+_shared_mutex: threading.Lock = threading.Lock()
+_exiting: bool = False
+
+
+def shared_event_loop() -> EventLoopThread:
+    global _shared
+    shared = _shared
+    if shared is not None:
+        return shared
+    with _shared_mutex:
+        if _shared is None:
+            _shared = EventLoopThread()
+            if _exiting:
+                _shared.close()
+        return _shared
+
+
+def _close_shared_event_loop() -> None:
+    global _exiting
+    _exiting = True
+    if _shared is not None:
+        _shared.close()
+
+
+def _reset_after_fork() -> None:
+    global _shared, _shared_mutex
+    _shared_mutex = threading.Lock()
+    _shared = None
+
+
+atexit.register(_close_shared_event_loop)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -1,9 +1,31 @@
-from requests import HTTPError
+from typing import Any
 
 
 class IncogniaError(Exception):
     pass
 
 
-class IncogniaHTTPError(HTTPError):
+class IncogniaRateLimitError(IncogniaError):
     pass
+
+
+class IncogniaConcurrencyLimitError(IncogniaError):
+    pass
+
+
+class IncogniaLoadSheddingError(IncogniaError):
+    pass
+
+
+class IncogniaFairShareError(IncogniaError):
+    pass
+
+
+def __getattr__(name: str) -> Any:
+    if name != 'IncogniaHTTPError':
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    # lives in its own module so that requests is only imported when it is first needed
+    from .http_error import IncogniaHTTPError
+
+    globals()[name] = IncogniaHTTPError
+    return IncogniaHTTPError
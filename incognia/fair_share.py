@@ -0,0 +1,210 @@
+import contextlib
+import itertools
+import time
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from threading import Condition, Lock
+from typing import Any, Callable, Deque, Dict, Final, Hashable, Iterator, Optional, Tuple
+
+from .exceptions import IncogniaFairShareError
+
+_DEFAULT_CAPACITY: Final[int] = 64
+_DEFAULT_MAX_KEYS: Final[int] = 1024
+
+_tenant: Final[ContextVar] = ContextVar('incognia_tenant', default=None)
+_account_id: Final[ContextVar] = ContextVar('incognia_account_id', default=None)
+
+
+@contextlib.contextmanager
+def tenant(key: Hashable) -> Iterator[None]:
+    token = _tenant.set(key)
+    try:
+        yield
+    finally:
+        _tenant.reset(token)
+
+
+@contextlib.contextmanager
+def account(account_id: str) -> Iterator[None]:
+    token = _account_id.set(account_id)
+    try:
+        yield
+    finally:
+        _account_id.reset(token)
+
+
+def current_key() -> Optional[Hashable]:
+    key = _tenant.get()
+    return key if key is not None else _account_id.get()
+
+
+class _Waiter:
+    __slots__ = ('sequence', 'enqueued_at', 'condition')
+
+    def __init__(self, sequence: int, enqueued_at: float, lock: Lock):
+        self.sequence: int = sequence
+        self.enqueued_at: float = enqueued_at
+        self.condition: Condition = Condition(lock)
+
+
+class _KeyState:
+    __slots__ = ('weight', 'in_flight', 'waiters', 'admitted', 'rejected', 'total_wait',
+                 'max_wait')
+
+    def __init__(self, weight: float):
+        self.weight: float = weight
+        self.in_flight: int = 0
+        self.waiters: Deque[_Waiter] = deque()
+        self.admitted: int = 0
+        self.rejected: int = 0
+        self.total_wait: float = 0.0
+        self.max_wait: float = 0.0
+
+    @property
+    def active(self) -> bool:
+        return self.in_flight > 0 or bool(self.waiters)
+
+    def usage(self) -> float:
+        return self.in_flight / self.weight
+
+    def rank(self) -> Tuple[float, int]:
+        return self.usage(), self.waiters[0].sequence
+
+
+class FairShareScheduler:
+    def __init__(self, capacity: int = _DEFAULT_CAPACITY,
+                 weights: Optional[Dict[Hashable, float]] = None,
+                 default_weight: float = 1.0, block: bool = True,
+                 queue_timeout: Optional[float] = None,
+                 max_keys: int = _DEFAULT_MAX_KEYS,
+                 clock: Callable[[], float] = time.monotonic):
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1')
+        if default_weight <= 0 or any(weight <= 0 for weight in (weights or {}).values()):
+            raise ValueError('weights must be positive')
+        self.__capacity: int = capacity
+        self.__weights: Dict[Hashable, float] = dict(weights or {})
+        self.__default_weight: float = default_weight
+        self.__block: bool = block
+        self.__queue_timeout: Optional[float] = queue_timeout
+        self.__max_keys: int = max_keys
+        self.__clock: Callable[[], float] = clock
+        self.__in_flight: int = 0
+        self.__keys: 'OrderedDict[Hashable, _KeyState]' = OrderedDict()
+        self.__waiting: Dict[Hashable, _KeyState] = {}
+        self.__active_weight: float = 0.0
+        self.__sequence: Any = itertools.count()
+        self.__lock: Lock = Lock()
+
+    @property
+    def capacity(self) -> int:
+        return self.__capacity
+
+    @property
+    def in_flight(self) -> int:
+        return self.__in_flight
+
+    def __state(self, key: Hashable) -> _KeyState:
+        state = self.__keys.get(key)
+        if state is None:
+            state = _KeyState(self.__weights.get(key, self.__default_weight))
+            self.__keys[key] = state
+        self.__keys.move_to_end(key)
+        return state
+
+    def __activate(self, state: _KeyState) -> None:
+        if not state.active:
+            self.__active_weight += state.weight
+
+    def __deactivate(self, state: _KeyState) -> None:
+        if state.active:
+            return
+        self.__active_weight -= state.weight
+        excess = len(self.__keys) - self.__max_keys
+        if excess > 0:
+            for key in [key for key, other in self.__keys.items() if not other.active][:excess]:
+                del self.__keys[key]
+
+    def __share(self, state: _KeyState) -> float:
+        active_weight = self.__active_weight if state.active \
+            else self.__active_weight + state.weight
+        return self.__capacity * state.weight / active_weight
+
+    def share(self, key: Hashable = None) -> float:
+        with self.__lock:
+            state = self.__keys.get(key) or _KeyState(
+                self.__weights.get(key, self.__default_weight))
+            return self.__share(state)
+
+    def __head(self) -> Optional[_Waiter]:
+        if self.__in_flight >= self.__capacity or not self.__waiting:
+            return None
+        return min(self.__waiting.values(), key=_KeyState.rank).waiters[0]
+
+    def __notify_head(self) -> None:
+        head = self.__head()
+        if head is not None:
+            head.condition.notify()
+
+    def __dequeue(self, key: Hashable, state: _KeyState, waiter: _Waiter) -> None:
+        state.waiters.remove(waiter)
+        if not state.waiters:
+            del self.__waiting[key]
+
+    def __reject(self, state: _KeyState, reason: str) -> None:
+        state.rejected += 1
+        raise IncogniaFairShareError(reason)
+
+    def acquire(self, key: Hashable = None) -> None:
+        with self.__lock:
+            state = self.__state(key)
+            self.__activate(state)
+            waiter = _Waiter(next(self.__sequence), self.__clock(), self.__lock)
+            state.waiters.append(waiter)
+            self.__waiting[key] = state
+            deadline = None if self.__queue_timeout is None \
+                else waiter.enqueued_at + self.__queue_timeout
+            try:
+                while self.__head() is not waiter:
+                    if not self.__block:
+                        self.__reject(state, f'fair share capacity of {self.__capacity} '
+                                             'reached')
+                    timeout = None if deadline is None else deadline - self.__clock()
+                    if timeout is not None and timeout <= 0:
+                        self.__reject(state, f'timed out waiting for one of '
+                                             f'{self.__capacity} slots')
+                    waiter.condition.wait(timeout)
+            except BaseException:
+                self.__dequeue(key, state, waiter)
+                self.__deactivate(state)
+                self.__notify_head()
+                raise
+            self.__dequeue(key, state, waiter)
+            state.in_flight += 1
+            self.__in_flight += 1
+            waited = self.__clock() - waiter.enqueued_at
+            state.admitted += 1
+            state.total_wait += waited
+            state.max_wait = max(state.max_wait, waited)
+            self.__notify_head()
+
+    def release(self, key: Hashable = None) -> None:
+        with self.__lock:
+            state = self.__keys[key]
+            state.in_flight -= 1
+            self.__in_flight -= 1
+            self.__deactivate(state)
+            self.__notify_head()
+
+    def metrics(self) -> dict:
+        with self.__lock:
+            return {'capacity': self.__capacity, 'in_flight': self.__in_flight,
+                    'queued': sum(len(state.waiters) for state in self.__keys.values()),
+                    'keys': {key: {'weight': state.weight, 'share': self.__share(state),
+                                   'in_flight': state.in_flight,
+                                   'queued': len(state.waiters),
+                                   'admitted': state.admitted, 'rejected': state.rejected,
+                                   'mean_wait': state.total_wait / state.admitted
+                                   if state.admitted else 0.0,
+                                   'max_wait': state.max_wait}
+                             for key, state in self.__keys.items()}}
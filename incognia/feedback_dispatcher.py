@@ -0,0 +1,112 @@
+import contextvars
+import itertools
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Final, Hashable, List, Optional, Tuple, Union
+
+from .api import IncogniaAPI
+from .exceptions import IncogniaError
+
+_PARTITION_KEYS: Final[Tuple[str, ...]] = ('account_id', 'installation_id', 'person_id')
+_STOP: Final[object] = object()
+
+PartitionKey = Union[str, Callable[[dict], Optional[Hashable]]]
+
+
+def _hashable(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return tuple(sorted(value.items()))
+    return value
+
+
+class FeedbackDispatcher:
+    def __init__(self, api: IncogniaAPI, workers: int = 8, queue_size: int = 1000,
+                 key: Optional[PartitionKey] = None, block: bool = True,
+                 timeout: Optional[float] = None):
+        if workers < 1:
+            raise ValueError('workers must be at least 1')
+        self.__api: IncogniaAPI = api
+        self.__key: Optional[PartitionKey] = key
+        self.__block: bool = block
+        self.__timeout: Optional[float] = timeout
+        self.__round_robin: Any = itertools.count()
+        self.__closed: bool = False
+        self.__submitting: int = 0
+        self.__lock: threading.Condition = threading.Condition()
+        self.__queues: List[queue.Queue] = [queue.Queue(queue_size) for _ in range(workers)]
+        self.__threads: List[threading.Thread] = [
+            threading.Thread(target=self.__work, args=(partition,),
+                             name=f'incognia-feedback-{index}', daemon=True)
+            for index, partition in enumerate(self.__queues)]
+        for thread in self.__threads:
+            thread.start()
+
+    def __enter__(self) -> 'FeedbackDispatcher':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def pending(self) -> List[int]:
+        return [partition.qsize() for partition in self.__queues]
+
+    def __partition_key(self, feedback: dict) -> Optional[Hashable]:
+        if callable(self.__key):
+            return self.__key(feedback)
+        names = (self.__key,) if self.__key is not None else _PARTITION_KEYS
+        for name in names:
+            value = feedback.get(name)
+            if value:
+                return _hashable(value)
+        return None
+
+    def __partition(self, feedback: dict) -> queue.Queue:
+        key = self.__partition_key(feedback)
+        index = next(self.__round_robin) if key is None else hash(key)
+        return self.__queues[index % len(self.__queues)]
+
+    def submit(self, event: str, **feedback: Any) -> Future:
+        with self.__lock:
+            if self.__closed:
+                raise IncogniaError('feedback dispatcher is closed')
+            self.__submitting += 1
+        future: Future = Future()
+        try:
+            self.__partition(feedback).put(
+                (future, contextvars.copy_context(), event, feedback), self.__block,
+                self.__timeout)
+        except queue.Full:
+            raise IncogniaError('feedback partition queue is full') from None
+        finally:
+            with self.__lock:
+                self.__submitting -= 1
+                self.__lock.notify_all()
+        return future
+
+    def __work(self, partition: queue.Queue) -> None:
+        while True:
+            item = partition.get()
+            if item is _STOP:
+                return
+            future, context, event, feedback = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(context.run(self.__api.register_feedback, event, **feedback))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def close(self, wait: bool = True) -> None:
+        with self.__lock:
+            if self.__closed:
+                return
+            self.__closed = True
+            # submissions that passed the closed check must be queued ahead of the stop marker
+            self.__lock.wait_for(lambda: self.__submitting == 0)
+        for partition in self.__queues:
+            partition.put(_STOP)
+        if wait:
+            for thread in self.__threads:
+                thread.join()
@@ -0,0 +1,84 @@
+import itertools
+import json
+import logging
+import sys
+import threading
+import time
+from typing import Any, Callable, Final, List, Optional, TextIO, Tuple, Union
+
+_DEFAULT_CAPACITY: Final[int] = 256
+_DEFAULT_DUMP_INTERVAL: Final[float] = 60.0
+_FIELDS: Final[Tuple[str, ...]] = ('sequence', 'timestamp', 'endpoint', 'status', 'queue_time',
+                                   'duration', 'request_bytes', 'response_bytes', 'token_age',
+                                   'error')
+
+_logger = logging.getLogger(__name__)
+
+TokenAgeProvider = Callable[[], Optional[float]]
+
+
+def payload_size(data: Any) -> int:
+    return len(data) if isinstance(data, (bytes, bytearray, str)) else 0
+
+
+class FlightRecorder:
+    def __init__(self, capacity: int = _DEFAULT_CAPACITY, dump_on_error: bool = False,
+                 dump_signal: Optional[int] = None, output: Optional[TextIO] = None,
+                 dump_interval: float = _DEFAULT_DUMP_INTERVAL):
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1')
+        self.__slots: List[Optional[tuple]] = [None] * capacity
+        self.__sequence: Any = itertools.count()
+        self.__dump_on_error: bool = dump_on_error
+        self.__output: Optional[TextIO] = output
+        self.__dump_interval: float = dump_interval
+        self.__last_dump_at: float = float('-inf')
+        self.__token_age: Optional[TokenAgeProvider] = None
+        if dump_signal is not None:
+            if threading.current_thread() is threading.main_thread():
+                self.dump_on_signal(dump_signal)
+            else:
+                _logger.warning('dump_signal is ignored outside the main thread, call '
+                                'dump_on_signal from the main thread instead')
+
+    def dump_on_signal(self, signum: int) -> None:
+        import signal
+
+        signal.signal(signum, lambda signum, frame: self.dump())
+
+    @property
+    def capacity(self) -> int:
+        return len(self.__slots)
+
+    def track_token_age(self, token_age: TokenAgeProvider) -> None:
+        self.__token_age = token_age
+
+    def record(self, endpoint: Union[str, bytes], status: Optional[int], received_at: float,
+               sent_at: float, finished_at: float, request_bytes: int = 0,
+               response_bytes: int = 0, error: Optional[str] = None) -> None:
+        sequence = next(self.__sequence)
+        self.__slots[sequence % len(self.__slots)] = (
+            sequence, time.time() - (time.perf_counter() - received_at),
+            endpoint.decode('utf-8') if isinstance(endpoint, bytes) else endpoint, status,
+            sent_at - received_at, finished_at - sent_at, request_bytes, response_bytes,
+            self.__token_age() if self.__token_age is not None else None, error)
+        if self.__dump_on_error and (error is not None or (status or 0) >= 500):
+            self.__dump_throttled()
+
+    def records(self) -> List[dict]:
+        records = [dict(zip(_FIELDS, slot)) for slot in list(self.__slots) if slot is not None]
+        records.sort(key=lambda record: record['sequence'])
+        return records
+
+    def __dump_throttled(self) -> None:
+        now = time.monotonic()
+        if now - self.__last_dump_at < self.__dump_interval:
+            return
+        self.__last_dump_at = now
+        self.dump()
+
+    def dump(self, output: Optional[TextIO] = None) -> None:
+        output = output or self.__output or sys.stderr
+        lines = [json.dumps(record) for record in self.records()]
+        output.write(''.join(f'{line}\n' for line in lines))
+        output.flush()
@@ -0,0 +1,90 @@
+import logging
+import sys
+import threading
+from typing import Any, Callable, Final, Optional
+
+from .token_manager import TokenManager
+from .transport import Urllib3Transport
+
+_logger = logging.getLogger(__name__)
+
+_DEFAULT_MAX_CONNECTIONS: Final[int] = 100
+_MIN_REFRESH_INTERVAL: Final[float] = 1.0
+
+
+def green_library() -> Optional[str]:
+    if 'gevent' in sys.modules:
+        from gevent import monkey
+
+        if monkey.is_module_patched('socket'):
+            return 'gevent'
+    if 'eventlet' in sys.modules:
+        from eventlet import patcher
+
+        if patcher.is_monkey_patched('socket'):
+            return 'eventlet'
+    return None
+
+
+def cooperative_lock() -> Any:
+    library = green_library()
+    if library == 'gevent':
+        from gevent.lock import Semaphore
+
+        return Semaphore(1)
+    if library == 'eventlet':
+        from eventlet.semaphore import Semaphore
+
+        return Semaphore(1)
+    return threading.Lock()
+
+
+class GreenTransport(Urllib3Transport):
+    def __init__(self, max_connections: int = _DEFAULT_MAX_CONNECTIONS):
+        import urllib3
+
+        super().__init__(pool_manager=urllib3.PoolManager(maxsize=max_connections, block=True,
+                                                          retries=False))
+        if green_library() is None:
+            _logger.warning('GreenTransport is used without a monkey-patched socket module, '
+                            'so requests block the thread instead of yielding')
+
+
+class TokenRefresher:
+    def __init__(self, token_manager: TokenManager,
+                 min_interval: float = _MIN_REFRESH_INTERVAL):
+        self.__token_manager: TokenManager = token_manager
+        self.__min_interval: float = min_interval
+        self.__stop: Optional[Callable[[], Any]] = None
+
+    def __run(self, wait: Callable[[float], Any]) -> None:
+        while True:
+            try:
+                self.__token_manager.get()
+            except Exception:
+                _logger.warning('background refresh of the Incognia token failed',
+                                exc_info=True)
+            if wait(max(self.__min_interval, self.__token_manager.refresh_due_in())):
+                return
+
+    def start(self) -> None:
+        self.stop()
+        library = green_library()
+        if library == 'gevent':
+            import gevent
+
+            self.__stop = gevent.spawn(self.__run, gevent.sleep).kill
+        elif library == 'eventlet':
+            import eventlet
+
+            self.__stop = eventlet.spawn(self.__run, eventlet.sleep).kill
+        else:
+            stopped = threading.Event()
+            threading.Thread(target=self.__run, args=(stopped.wait,),
+                             name='incognia-token-refresher', daemon=True).start()
+            self.__stop = stopped.set
+
+    def stop(self) -> None:
+        if self.__stop is not None:
+            self.__stop()
+            self.__stop = None
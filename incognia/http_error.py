@@ -0,0 +1,5 @@
+from requests import HTTPError
+
+
+class IncogniaHTTPError(HTTPError):
+    pass
@@ -1,6 +1,99 @@
 import json
+import os
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Final, Hashable, List, Optional, Union
+
+_FRAGMENT_MARKER: Final[str] = f'\x00{os.urandom(16).hex()}'
+_ENCODED_FRAGMENT_MARKER: Final[str] = json.dumps(_FRAGMENT_MARKER)
+
+
+def encode_fragment(o: Any) -> str:
+    fragment = getattr(o, 'json_fragment', None)
+    if fragment is not None:
+        return fragment
+
+    fragments: List[str] = []
+
+    def splice(value: Any) -> str:
+        value_fragment = getattr(value, 'json_fragment', None)
+        if value_fragment is None:
+            raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+        fragments.append(value_fragment)
+        return _FRAGMENT_MARKER
+
+    text = json.dumps(o, ensure_ascii=False, default=splice)
+    if not fragments:
+        return text
+    parts = text.split(_ENCODED_FRAGMENT_MARKER)
+    spliced = [parts[0]]
+    for (value_fragment, part) in zip(fragments, parts[1:]):
+        spliced.append(value_fragment)
+        spliced.append(part)
+    return ''.join(spliced)
 
 
 def encode(d: dict) -> bytes:
-    return json.dumps({k: v for (k, v) in d.items() if v is not None},
-                      ensure_ascii=False).encode('utf-8')
+    for v in d.values():
+        if v is None:
+            d = {k: v for (k, v) in d.items() if v is not None}
+            break
+    return encode_fragment(d).encode('utf-8')
+
+
+class RawJSON:
+    __slots__ = ('json_fragment',)
+
+    def __init__(self, fragment: Union[str, bytes]):
+        self.json_fragment: str = fragment.decode('utf-8') if isinstance(fragment, bytes) \
+            else fragment
+
+    @classmethod
+    def of(cls, o: Any) -> 'RawJSON':
+        return cls(encode_fragment(o))
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, RawJSON):
+            return NotImplemented
+        return self.json_fragment == other.json_fragment
+
+    def __hash__(self) -> int:
+        return hash(self.json_fragment)
+
+    def __repr__(self) -> str:
+        return f'RawJSON({self.json_fragment!r})'
+
+
+class FragmentCache:
+    def __init__(self, maxsize: int = 1024):
+        if maxsize <= 0:
+            raise ValueError('maxsize must be positive')
+        self.__maxsize: int = maxsize
+        self.__fragments: 'OrderedDict[Hashable, RawJSON]' = OrderedDict()
+        self.__mutex: Lock = Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        return len(self.__fragments)
+
+    def get(self, value: Any, key: Optional[Hashable] = None) -> RawJSON:
+        key = value if key is None else key
+        with self.__mutex:
+            fragment = self.__fragments.get(key)
+            if fragment is not None:
+                self.__fragments.move_to_end(key)
+                self.hits += 1
+                return fragment
+            self.misses += 1
+
+        fragment = RawJSON.of(value)
+        with self.__mutex:
+            self.__fragments[key] = fragment
+            if len(self.__fragments) > self.__maxsize:
+                self.__fragments.popitem(last=False)
+        return fragment
+
+    def clear(self) -> None:
+        with self.__mutex:
+            self.__fragments.clear()
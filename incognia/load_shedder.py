@@ -0,0 +1,103 @@
+import time
+from threading import Condition, Lock
+from typing import Callable, Dict, Final, Optional, Tuple
+
+from .exceptions import IncogniaLoadSheddingError
+
+_DEFAULT_MAX_IN_FLIGHT: Final[int] = 64
+_DEFAULT_MAX_QUEUED: Final[int] = 64
+
+AdmissionLimits = Tuple[int, int, Optional[float]]
+
+
+class _EndpointAdmission:
+    def __init__(self, max_in_flight: int, max_queued: int, queue_deadline: Optional[float],
+                 clock: Callable[[], float]):
+        if max_in_flight < 1 or max_queued < 0:
+            raise ValueError('max_in_flight must be at least 1 and max_queued not negative')
+        self.max_in_flight: int = max_in_flight
+        self.max_queued: int = max_queued
+        self.queue_deadline: Optional[float] = queue_deadline
+        self.in_flight: int = 0
+        self.queued: int = 0
+        self.admitted: int = 0
+        self.shed_queue_full: int = 0
+        self.shed_deadline: int = 0
+        self.__clock: Callable[[], float] = clock
+        self.condition: Condition = Condition()
+
+    def acquire(self, endpoint: str) -> None:
+        with self.condition:
+            if self.in_flight >= self.max_in_flight:
+                if self.queued >= self.max_queued:
+                    self.shed_queue_full += 1
+                    raise IncogniaLoadSheddingError(
+                        f'{self.in_flight} in-flight and {self.queued} queued requests'
+                        f' for {endpoint}')
+                self.__wait(endpoint)
+            self.in_flight += 1
+            self.admitted += 1
+
+    def __wait(self, endpoint: str) -> None:
+        deadline = None if self.queue_deadline is None \
+            else self.__clock() + self.queue_deadline
+        self.queued += 1
+        try:
+            while self.in_flight >= self.max_in_flight:
+                timeout = None if deadline is None else deadline - self.__clock()
+                if timeout is not None and timeout <= 0:
+                    self.shed_deadline += 1
+                    raise IncogniaLoadSheddingError(
+                        f'queued longer than {self.queue_deadline}s for {endpoint}')
+                self.condition.wait(timeout)
+        finally:
+            self.queued -= 1
+
+    def release(self) -> None:
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify()
+
+    def metrics(self) -> dict:
+        with self.condition:
+            return {'in_flight': self.in_flight, 'queued': self.queued,
+                    'admitted': self.admitted, 'shed_queue_full': self.shed_queue_full,
+                    'shed_deadline': self.shed_deadline}
+
+
+class LoadShedder:
+    def __init__(self, max_in_flight: int = _DEFAULT_MAX_IN_FLIGHT,
+                 max_queued: int = _DEFAULT_MAX_QUEUED, queue_deadline: Optional[float] = None,
+                 endpoint_limits: Optional[Dict[str, AdmissionLimits]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.__limits: AdmissionLimits = (max_in_flight, max_queued, queue_deadline)
+        self.__endpoint_limits: Dict[str, AdmissionLimits] = dict(endpoint_limits or {})
+        self.__clock: Callable[[], float] = clock
+        self.__endpoints: Dict[str, _EndpointAdmission] = {}
+        self.__mutex: Lock = Lock()
+
+    def __admission(self, endpoint: str) -> _EndpointAdmission:
+        admission = self.__endpoints.get(endpoint)
+        if admission is None:
+            with self.__mutex:
+                admission = self.__endpoints.get(endpoint)
+                if admission is None:
+                    limits = self.__endpoint_limits.get(endpoint, self.__limits)
+                    admission = _EndpointAdmission(*limits, clock=self.__clock)
+                    self.__endpoints[endpoint] = admission
+        return admission
+
+    def acquire(self, endpoint: str) -> None:
+        self.__admission(endpoint).acquire(endpoint)
+
+    def release(self, endpoint: str) -> None:
+        self.__admission(endpoint).release()
+
+    @property
+    def shed(self) -> int:
+        return sum(admission.shed_queue_full + admission.shed_deadline
+                   for admission in list(self.__endpoints.values()))
+
+    def metrics(self) -> Dict[str, dict]:
+        return {endpoint: admission.metrics()
+                for endpoint, admission in list(self.__endpoints.items())}
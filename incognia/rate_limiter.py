@@ -0,0 +1,146 @@
+import datetime as dt
+import time
+from threading import Lock
+from typing import Callable, Dict, Final, Optional, Tuple
+
+from .exceptions import IncogniaRateLimitError
+
+_DEFAULT_BACKOFF_FACTOR: Final[float] = 0.5
+_DEFAULT_RECOVERY_SECONDS: Final[float] = 30.0
+_MIN_RATE_FRACTION: Final[float] = 0.05
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    import email.utils
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=dt.timezone.utc)
+    return max(0.0, (retry_at - dt.datetime.now(dt.timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float,
+                 backoff_factor: float = _DEFAULT_BACKOFF_FACTOR,
+                 recovery_seconds: float = _DEFAULT_RECOVERY_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        if rate <= 0 or burst < 1:
+            raise ValueError('rate must be positive and burst at least 1')
+        self.__max_rate: float = rate
+        self.__min_rate: float = rate * _MIN_RATE_FRACTION
+        self.__rate: float = rate
+        self.__burst: float = burst
+        self.__backoff_factor: float = backoff_factor
+        self.__recovery_seconds: float = recovery_seconds
+        self.__clock: Callable[[], float] = clock
+        self.__tokens: float = burst
+        self.__updated_at: float = clock()
+        self.__blocked_until: float = 0.0
+        self.__mutex: Lock = Lock()
+
+    @property
+    def rate(self) -> float:
+        return self.__rate
+
+    def __refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self.__updated_at)
+        self.__updated_at = now
+        if self.__rate < self.__max_rate and self.__recovery_seconds > 0:
+            self.__rate = min(self.__max_rate,
+                              self.__rate + self.__max_rate * elapsed / self.__recovery_seconds)
+        self.__tokens = min(self.__burst, self.__tokens + elapsed * self.__rate)
+
+    def try_acquire(self) -> float:
+        with self.__mutex:
+            now = self.__clock()
+            self.__refill(now)
+            if now < self.__blocked_until:
+                return self.__blocked_until - now
+            if self.__tokens >= 1:
+                self.__tokens -= 1
+                return 0.0
+            return (1 - self.__tokens) / self.__rate
+
+    def throttle(self, retry_after: Optional[float] = None) -> None:
+        with self.__mutex:
+            now = self.__clock()
+            self.__refill(now)
+            self.__rate = max(self.__min_rate, self.__rate * self.__backoff_factor)
+            self.__tokens = 0.0
+            if retry_after:
+                self.__blocked_until = max(self.__blocked_until, now + retry_after)
+
+
+class RateLimiter:
+    def __init__(self, rate: float, burst: Optional[float] = None, block: bool = True,
+                 timeout: Optional[float] = None,
+                 endpoint_limits: Optional[Dict[str, Tuple[float, float]]] = None,
+                 backoff_factor: float = _DEFAULT_BACKOFF_FACTOR,
+                 recovery_seconds: float = _DEFAULT_RECOVERY_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.__rate: float = rate
+        self.__burst: float = burst if burst is not None else max(1.0, rate)
+        self.__block: bool = block
+        self.__timeout: Optional[float] = timeout
+        self.__endpoint_limits: Dict[str, Tuple[float, float]] = dict(endpoint_limits or {})
+        self.__backoff_factor: float = backoff_factor
+        self.__recovery_seconds: float = recovery_seconds
+        self.__clock: Callable[[], float] = clock
+        self.__buckets: Dict[str, TokenBucket] = {}
+        self.__mutex: Lock = Lock()
+
+    def bucket(self, endpoint: str) -> TokenBucket:
+        bucket = self.__buckets.get(endpoint)
+        if bucket is None:
+            with self.__mutex:
+                bucket = self.__buckets.get(endpoint)
+                if bucket is None:
+                    rate, burst = self.__endpoint_limits.get(endpoint,
+                                                             (self.__rate, self.__burst))
+                    bucket = TokenBucket(rate, burst, self.__backoff_factor,
+                                         self.__recovery_seconds, self.__clock)
+                    self.__buckets[endpoint] = bucket
+        return bucket
+
+    def __next_wait(self, endpoint: str, deadline: Optional[float]) -> float:
+        wait = self.bucket(endpoint).try_acquire()
+        if wait == 0:
+            return 0.0
+        if not self.__block or (deadline is not None and self.__clock() + wait > deadline):
+            raise IncogniaRateLimitError(f'rate limit exceeded for {endpoint}')
+        return wait
+
+    def __deadline(self) -> Optional[float]:
+        return None if self.__timeout is None else self.__clock() + self.__timeout
+
+    def acquire(self, endpoint: str) -> None:
+        deadline = self.__deadline()
+        while True:
+            wait = self.__next_wait(endpoint, deadline)
+            if wait == 0:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self, endpoint: str) -> None:
+        import asyncio
+
+        deadline = self.__deadline()
+        while True:
+            wait = self.__next_wait(endpoint, deadline)
+            if wait == 0:
+                return
+            await asyncio.sleep(wait)
+
+    def on_response(self, endpoint: str, status_code: int,
+                    retry_after: Optional[str] = None) -> None:
+        if status_code == 429:
+            self.bucket(endpoint).throttle(parse_retry_after(retry_after))
@@ -0,0 +1,278 @@
+import contextlib
+import functools
+import logging
+import mmap
+import os
+import threading
+import time
+import weakref
+from typing import Any, Dict, Final, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .endpoints import Endpoints
+
+_logger = logging.getLogger(__name__)
+
+_MAGIC: Final[int] = 0x494E434D
+_VERSION: Final[int] = 1
+_HEADER_WORDS: Final[int] = 8
+_DROPPED_WORD: Final[int] = 6
+_CLAIM_RETRY_INTERVAL: Final[float] = 1.0
+_SLOT_HEADER_WORDS: Final[int] = 2
+_RETIRED_SLOT: Final[int] = 0
+_RETIRED_PID: Final[int] = -1
+_DEFAULT_SLOTS: Final[int] = 1024
+_DEFAULT_BUCKETS: Final[Tuple[float, ...]] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+                                              2.5, 5.0, 10.0)
+ENDPOINT_LABELS: Final[Tuple[str, ...]] = ('token', 'signups', 'feedbacks', 'transactions',
+                                           'other')
+OUTCOMES: Final[Tuple[str, ...]] = ('success', 'client_error', 'server_error',
+                                    'transport_error', 'rejected')
+_SUCCESS, _CLIENT_ERROR, _SERVER_ERROR, _TRANSPORT_ERROR, _REJECTED = range(len(OUTCOMES))
+_ENDPOINT_PATHS: Final[Tuple[Tuple[str, int], ...]] = tuple(
+    (url[len(Endpoints.BASE):], index) for (index, url) in enumerate(
+        (Endpoints.TOKEN, Endpoints.SIGNUPS, Endpoints.FEEDBACKS, Endpoints.TRANSACTIONS)))
+
+
+@functools.lru_cache(maxsize=256)
+def _endpoint_index(url: Union[str, bytes]) -> int:
+    if isinstance(url, bytes):
+        url = url.decode('utf-8')
+    path = url.split('?', 1)[0].rstrip('/')
+    for (suffix, index) in _ENDPOINT_PATHS:
+        if path.endswith(suffix):
+            return index
+    return len(ENDPOINT_LABELS) - 1
+
+
+def _outcome_index(status_code: Optional[int], rejected: bool) -> int:
+    if rejected:
+        return _REJECTED
+    if status_code is None:
+        return _TRANSPORT_ERROR
+    if status_code >= 500:
+        return _SERVER_ERROR
+    if status_code >= 400:
+        return _CLIENT_ERROR
+    return _SUCCESS
+
+
+def _call_if_alive(method_ref: 'weakref.WeakMethod') -> None:
+    method = method_ref()
+    if method is not None:
+        method()
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class SharedMetrics:
+    def __init__(self, path: Optional[str] = None, slots: int = _DEFAULT_SLOTS,
+                 buckets: Sequence[float] = _DEFAULT_BUCKETS):
+        import fcntl
+
+        if slots < 2:
+            raise ValueError('slots must be at least 2')
+        self.__fcntl: Any = fcntl
+        self.__buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        self.__endpoint_words: int = len(OUTCOMES) + len(self.__buckets) + 2
+        self.__slot_words: int = _SLOT_HEADER_WORDS + \
+            len(ENDPOINT_LABELS) * self.__endpoint_words
+        self.__slots: int = slots
+        size = 8 * (_HEADER_WORDS + slots * self.__slot_words)
+        if path is None:
+            import tempfile
+
+            self.__fd: int
+            self.__fd, path = tempfile.mkstemp(prefix='incognia-metrics-')
+            os.unlink(path)
+        else:
+            self.__fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        self.__path: Optional[str] = path
+        self.__mutex: threading.Lock = threading.Lock()
+        with self.__claim_lock():
+            if os.fstat(self.__fd).st_size < size:
+                os.ftruncate(self.__fd, size)
+            self.__mmap: mmap.mmap = mmap.mmap(self.__fd, size)
+            self.__words: memoryview = memoryview(self.__mmap).cast('q')
+            self.__floats: memoryview = memoryview(self.__mmap).cast('d')
+            self.__initialize_header()
+        self.__local: threading.local = threading.local()
+        os.register_at_fork(after_in_child=functools.partial(
+            _call_if_alive, weakref.WeakMethod(self.__after_fork)))
+
+    def __initialize_header(self) -> None:
+        header = (_MAGIC, _VERSION, self.__slots, len(ENDPOINT_LABELS), len(OUTCOMES),
+                  len(self.__buckets))
+        words = self.__words
+        if words[0] == 0:
+            for (index, value) in enumerate(header[1:], start=1):
+                words[index] = value
+            words[_HEADER_WORDS] = _RETIRED_PID
+            words[0] = _MAGIC
+        elif tuple(words[:len(header)]) != header:
+            raise ValueError(f'metrics file {self.__path} has an incompatible layout')
+
+    def __after_fork(self) -> None:
+        self.__mutex = threading.Lock()
+        self.__local = threading.local()
+
+    @contextlib.contextmanager
+    def __claim_lock(self) -> Iterator[None]:
+        with self.__mutex:
+            self.__fcntl.lockf(self.__fd, self.__fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                self.__fcntl.lockf(self.__fd, self.__fcntl.LOCK_UN)
+
+    def __slot_offset(self, slot: int) -> int:
+        return _HEADER_WORDS + slot * self.__slot_words
+
+    def __retire(self, slot: int) -> None:
+        words, floats = self.__words, self.__floats
+        offset = self.__slot_offset(slot) + _SLOT_HEADER_WORDS
+        retired = self.__slot_offset(_RETIRED_SLOT) + _SLOT_HEADER_WORDS
+        for endpoint in range(len(ENDPOINT_LABELS)):
+            base = endpoint * self.__endpoint_words
+            for word in range(self.__endpoint_words - 1):
+                words[retired + base + word] += words[offset + base + word]
+                words[offset + base + word] = 0
+            sum_word = base + self.__endpoint_words - 1
+            floats[retired + sum_word] += floats[offset + sum_word]
+            floats[offset + sum_word] = 0.0
+        words[self.__slot_offset(slot)] = 0
+        words[self.__slot_offset(slot) + 1] = 0
+
+    def __collect(self) -> int:
+        pid, live_threads = os.getpid(), {t.native_id for t in threading.enumerate()}
+        retired = 0
+        for slot in range(1, self.__slots):
+            offset = self.__slot_offset(slot)
+            slot_pid, slot_tid = self.__words[offset], self.__words[offset + 1]
+            if slot_pid == 0:
+                continue
+            if (slot_pid == pid and slot_tid not in live_threads) \
+                    or (slot_pid != pid and not _is_alive(slot_pid)):
+                self.__retire(slot)
+                retired += 1
+        return retired
+
+    def __claim(self) -> Optional[int]:
+        if time.monotonic() < getattr(self.__local, 'retry_at', 0.0):
+            return None
+        pid, tid = os.getpid(), threading.get_native_id()
+        with self.__claim_lock():
+            for attempt in range(2):
+                for slot in range(1, self.__slots):
+                    offset = self.__slot_offset(slot)
+                    if self.__words[offset] == 0:
+                        self.__words[offset + 1] = tid
+                        self.__words[offset] = pid
+                        self.__local.slot = slot
+                        return slot
+                if attempt == 0:
+                    self.__collect()
+        self.__local.retry_at = time.monotonic() + _CLAIM_RETRY_INTERVAL
+        _logger.warning('all %d metrics slots are in use, dropping samples of thread %d',
+                        self.__slots - 1, tid)
+        return None
+
+    def __drop(self) -> None:
+        with self.__claim_lock():
+            self.__words[_DROPPED_WORD] += 1
+
+    @property
+    def dropped(self) -> int:
+        return self.__words[_DROPPED_WORD]
+
+    def observe(self, url: Union[str, bytes], status_code: Optional[int], duration: float,
+                rejected: bool = False) -> None:
+        slot = getattr(self.__local, 'slot', None)
+        if slot is None:
+            slot = self.__claim()
+            if slot is None:
+                self.__drop()
+                return
+        base = self.__slot_offset(slot) + _SLOT_HEADER_WORDS \
+            + _endpoint_index(url) * self.__endpoint_words
+        words = self.__words
+        words[base + _outcome_index(status_code, rejected)] += 1
+        if rejected:
+            return
+        buckets = base + len(OUTCOMES)
+        for (index, bound) in enumerate(self.__buckets):
+            if duration <= bound:
+                words[buckets + index] += 1
+                break
+        else:
+            words[buckets + len(self.__buckets)] += 1
+        self.__floats[buckets + len(self.__buckets) + 1] += duration
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self.__claim_lock():
+            self.__collect()
+        words, floats = self.__words, self.__floats
+        snapshot: Dict[str, dict] = {}
+        for (endpoint, label) in enumerate(ENDPOINT_LABELS):
+            outcomes = [0] * len(OUTCOMES)
+            buckets = [0] * (len(self.__buckets) + 1)
+            duration_sum = 0.0
+            for slot in range(self.__slots):
+                offset = self.__slot_offset(slot)
+                if words[offset] == 0:
+                    continue
+                base = offset + _SLOT_HEADER_WORDS + endpoint * self.__endpoint_words
+                for index in range(len(OUTCOMES)):
+                    outcomes[index] += words[base + index]
+                for index in range(len(buckets)):
+                    buckets[index] += words[base + len(OUTCOMES) + index]
+                duration_sum += floats[base + len(OUTCOMES) + len(buckets)]
+            snapshot[label] = {'requests': dict(zip(OUTCOMES, outcomes)),
+                               'duration_buckets': dict(zip(self.__buckets + (float('inf'),),
+                                                            buckets)),
+                               'duration_sum': duration_sum}
+        return snapshot
+
+    def workers(self) -> List[int]:
+        return sorted({self.__words[self.__slot_offset(slot)]
+                       for slot in range(1, self.__slots)} - {0})
+
+    def close(self) -> None:
+        self.__words.release()
+        self.__floats.release()
+        self.__mmap.close()
+        os.close(self.__fd)
+
+    def exposition(self) -> str:
+        lines = ['# HELP incognia_requests_total Requests made by the Incognia client.',
+                 '# TYPE incognia_requests_total counter']
+        snapshot = self.snapshot()
+        for (label, metrics) in snapshot.items():
+            for (outcome, count) in metrics['requests'].items():
+                lines.append(f'incognia_requests_total{{endpoint="{label}",outcome="{outcome}"}}'
+                             f' {count}')
+        lines += ['# HELP incognia_request_duration_seconds Duration of Incognia API calls.',
+                  '# TYPE incognia_request_duration_seconds histogram']
+        for (label, metrics) in snapshot.items():
+            cumulative = 0
+            for (bound, count) in metrics['duration_buckets'].items():
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'incognia_request_duration_seconds_bucket'
+                             f'{{endpoint="{label}",le="{le}"}} {cumulative}')
+            lines.append(f'incognia_request_duration_seconds_sum{{endpoint="{label}"}}'
+                         f' {metrics["duration_sum"]}')
+            lines.append(f'incognia_request_duration_seconds_count{{endpoint="{label}"}}'
+                         f' {cumulative}')
+        lines += ['# HELP incognia_metrics_dropped_total Samples dropped because every metrics '
+                  'slot was in use.',
+                  '# TYPE incognia_metrics_dropped_total counter',
+                  f'incognia_metrics_dropped_total {self.dropped}']
+        return '\n'.join(lines) + '\n'
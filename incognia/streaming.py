@@ -0,0 +1,88 @@
+import contextvars
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import (Any, Callable, Deque, Final, Iterable, Iterator, Mapping, NamedTuple, Optional,
+                    Tuple)
+
+from .exceptions import IncogniaError
+
+_METHODS: Final[Mapping[str, str]] = {
+    'login': 'register_login',
+    'payment': 'register_payment',
+}
+
+_Pending = Tuple[int, Mapping[str, Any], Future]
+
+
+class StreamResult(NamedTuple):
+    index: int
+    transaction: Mapping[str, Any]
+    assessment: Optional[dict]
+    error: Optional[BaseException]
+
+
+def _submit_in_context(executor: ThreadPoolExecutor, function: Callable[..., Any], *args: Any,
+                       **kwargs: Any) -> Future:
+    # carries context variables such as the fair share tenant into the worker thread
+    return executor.submit(contextvars.copy_context().run, function, *args, **kwargs)
+
+
+def _submit(executor: ThreadPoolExecutor, api: Any, transaction: Mapping[str, Any]) -> Future:
+    arguments = dict(transaction)
+    method = _METHODS.get(arguments.pop('type', None))
+    if method is None:
+        future: Future = Future()
+        future.set_exception(IncogniaError(
+            f'transaction type must be one of {", ".join(_METHODS)}.'))
+        return future
+    return _submit_in_context(executor, getattr(api, method), **arguments)
+
+
+def _result(pending: _Pending) -> StreamResult:
+    index, transaction, future = pending
+    error = future.exception()
+    return StreamResult(index, transaction, future.result() if error is None else None, error)
+
+
+def _next(pending: Deque[_Pending], ordered: bool) -> StreamResult:
+    if ordered:
+        return _result(pending.popleft())
+    wait([future for _, _, future in pending], return_when=FIRST_COMPLETED)
+    for position, entry in enumerate(pending):
+        if entry[2].done():
+            del pending[position]
+            return _result(entry)
+    raise AssertionError('no transaction completed')
+
+
+def _stream(submit: Callable[[ThreadPoolExecutor, Any], Future], items: Iterable[Any],
+            window: int, ordered: bool) -> Iterator[StreamResult]:
+    executor = ThreadPoolExecutor(window, thread_name_prefix='incognia-stream')
+    pending: Deque[_Pending] = deque()
+    try:
+        for index, item in enumerate(items):
+            if len(pending) >= window:
+                yield _next(pending, ordered)
+            pending.append((index, item, submit(executor, item)))
+        while pending:
+            yield _next(pending, ordered)
+    finally:
+        for _, _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def stream_transactions(api: Any, transactions: Iterable[Mapping[str, Any]], window: int = 16,
+                        ordered: bool = True) -> Iterator[StreamResult]:
+    if window < 1:
+        raise ValueError('window must be at least 1')
+    return _stream(lambda executor, transaction: _submit(executor, api, transaction),
+                   transactions, window, ordered)
+
+
+def stream_calls(call: Callable[..., Any], arguments: Iterable[Tuple[Any, ...]], window: int = 16,
+                 ordered: bool = True) -> Iterator[StreamResult]:
+    if window < 1:
+        raise ValueError('window must be at least 1')
+    return _stream(lambda executor, args: _submit_in_context(executor, call, *args), arguments,
+                   window, ordered)
@@ -1,13 +1,16 @@
 import base64
-import datetime as dt
+import time
 from threading import Lock
-from typing import Final, Optional, NamedTuple
+from typing import Any, Callable, Final, Optional, NamedTuple, Tuple
 
 from .base_request import BaseRequest
 from .endpoints import Endpoints
-from .exceptions import IncogniaHTTPError
+from . import exceptions
 
-_TOKEN_REFRESH_BEFORE_SECONDS: Final[int] = 10
+_TOKEN_REFRESH_BEFORE_SECONDS: Final[float] = 10.0
+_TOKEN_EXPIRATION_SAFETY_SECONDS: Final[float] = 1.0
+_REFRESH_FAILURE_BACKOFF_SECONDS: Final[float] = 0.5
+_MAX_REFRESH_FAILURE_BACKOFF_SECONDS: Final[float] = 30.0
 
 
 class TokenValues(NamedTuple):
@@ -16,13 +19,27 @@ class TokenValues(NamedTuple):
 
 
 class TokenManager:
-    def __init__(self, client_id: str, client_secret: str):
+    def __init__(self, client_id: str, client_secret: str,
+                 base_request: Optional[BaseRequest] = None,
+                 refresh_before_seconds: Optional[float] = None,
+                 failure_backoff_seconds: float = _REFRESH_FAILURE_BACKOFF_SECONDS,
+                 max_failure_backoff_seconds: float = _MAX_REFRESH_FAILURE_BACKOFF_SECONDS,
+                 clock: Callable[[], float] = time.monotonic,
+                 endpoints: Optional[Endpoints] = None, lock: Optional[Any] = None):
         self.__client_id: str = client_id
         self.__client_secret: str = client_secret
-        self.__token_values: Optional[TokenValues] = None
-        self.__expiration_time: Optional[dt.datetime] = None
-        self.__request: BaseRequest = BaseRequest()
-        self.__mutex: Lock = Lock()
+        self.__token: Optional[Tuple[TokenValues, float, float]] = None
+        self.__refresh_before_seconds: float = _TOKEN_REFRESH_BEFORE_SECONDS \
+            if refresh_before_seconds is None else refresh_before_seconds
+        self.__failure_backoff_seconds: float = failure_backoff_seconds
+        self.__max_failure_backoff_seconds: float = max_failure_backoff_seconds
+        self.__clock: Callable[[], float] = clock
+        self.__failures: int = 0
+        self.__retry_at: float = 0.0
+        self.__last_error: Optional[BaseException] = None
+        self.__request: BaseRequest = base_request or BaseRequest()
+        self.__endpoints: Endpoints = endpoints or Endpoints()
+        self.__mutex: Any = lock if lock is not None else Lock()
 
     def __refresh_token(self) -> None:
         client_id, client_secret = self.__client_id, self.__client_secret
@@ -31,24 +48,80 @@ class TokenManager:
         headers = {'Authorization': f'Basic {client_id_and_secret_encoded}'}
 
         try:
-            response = self.__request.post(url=Endpoints.TOKEN, headers=headers,
+            requested_at = self.__clock()
+            response = self.__request.post(url=self.__endpoints.TOKEN, headers=headers,
                                            auth=(client_id, client_secret))
             token_values = TokenValues(response['access_token'], response['token_type'])
-            expiration_time = dt.datetime.now() + dt.timedelta(seconds=int(response['expires_in']))
+            expires_at = requested_at + int(response['expires_in'])
 
-            self.__token_values, self.__expiration_time = token_values, expiration_time
+            self.__token = (token_values, expires_at, requested_at)
 
-        except IncogniaHTTPError as e:
-            raise IncogniaHTTPError(e) from None
+        except exceptions.IncogniaHTTPError as e:
+            raise exceptions.IncogniaHTTPError(e) from None
 
-    def __is_expired(self) -> bool:
-        return (self.__expiration_time - dt.datetime.now()) \
-                   .total_seconds() <= _TOKEN_REFRESH_BEFORE_SECONDS
+    def token_age(self) -> Optional[float]:
+        token = self.__token
+        return None if token is None else self.__clock() - token[2]
+
+    def refresh_due_in(self) -> float:
+        token = self.__token
+        if token is None:
+            refresh_at = self.__retry_at
+        else:
+            refresh_at = max(token[1] - self.__refresh_before_seconds, self.__retry_at)
+        return max(0.0, refresh_at - self.__clock())
+
+    def __needs_refresh(self, token: Optional[Tuple[TokenValues, float, float]],
+                        now: float) -> bool:
+        return token is None or token[1] - now <= self.__refresh_before_seconds
+
+    def __usable_token(self, now: float) -> Optional[TokenValues]:
+        token = self.__token
+        if token is not None and token[1] - now > _TOKEN_EXPIRATION_SAFETY_SECONDS:
+            return token[0]
+        return None
+
+    def __on_failure(self, e: BaseException, now: float) -> None:
+        backoff = self.__failure_backoff_seconds * 2 ** self.__failures
+        self.__failures += 1
+        self.__retry_at = now + min(backoff, self.__max_failure_backoff_seconds)
+        self.__last_error = e
+
+    def __recent_failure(self, now: float) -> BaseException:
+        return exceptions.IncogniaHTTPError(
+            f'token refresh failed, retrying in {self.__retry_at - now:.2f}s: '
+            f'{self.__last_error}', response=getattr(self.__last_error, 'response', None))
 
     def get(self) -> TokenValues:
-        self.__mutex.acquire()
-        if not self.__expiration_time or self.__is_expired():
+        token = self.__token
+        now = self.__clock()
+        if not self.__needs_refresh(token, now):
+            return token[0]
+        usable_token = self.__usable_token(now)
+        if usable_token is None:
+            self.__mutex.acquire()
+        elif not self.__mutex.acquire(blocking=False):
+            return usable_token
+        try:
+            return self.__refresh_if_needed()
+        finally:
+            self.__mutex.release()
+
+    def __refresh_if_needed(self) -> TokenValues:
+        now = self.__clock()
+        if not self.__needs_refresh(self.__token, now):
+            return self.__token[0]
+        usable_token = self.__usable_token(now)
+        if now < self.__retry_at:
+            if usable_token is not None:
+                return usable_token
+            raise self.__recent_failure(now) from self.__last_error
+        try:
             self.__refresh_token()
-        token_values = self.__token_values
-        self.__mutex.release()
-        return token_values
+        except Exception as e:
+            self.__on_failure(e, now)
+            if usable_token is not None:
+                return usable_token
+            raise
+        self.__failures, self.__retry_at, self.__last_error = 0, 0.0, None
+        return self.__token[0]
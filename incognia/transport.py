@@ -0,0 +1,240 @@
+import base64
+import importlib.util
+import os
+import socket
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Final, Mapping, NamedTuple, Optional, Tuple, Union
+from urllib.parse import urlencode
+
+_STREAM_CHUNK_SIZE: Final[int] = 64 * 1024
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class TransportResponse(NamedTuple):
+    status_code: int
+    headers: Mapping[str, str]
+    content: bytes
+    reason: str = ''
+
+
+def _resolve(url: Union[str, bytes]) -> None:
+    from urllib.parse import urlsplit
+
+    parts = urlsplit(url.decode('utf-8') if isinstance(url, bytes) else url)
+    socket.getaddrinfo(parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80),
+                       type=socket.SOCK_STREAM)
+
+
+def _with_query(url: Union[str, bytes], params: Any) -> str:
+    if isinstance(url, bytes):
+        url = url.decode('utf-8')
+    return f'{url}?{urlencode(params)}' if params else url
+
+
+class Transport(ABC):
+    @abstractmethod
+    def post(self, url: Union[str, bytes], headers: Mapping[str, str], data: Any,
+             params: Any, timeout: Timeout, auth: Optional[Any]) -> Any:
+        raise NotImplementedError
+
+    def warmup(self, url: Union[str, bytes], connections: int, timeout: float) -> int:
+        _resolve(url)
+        return 0
+
+    def close(self) -> None:
+        pass
+
+
+class RequestsTransport(Transport):
+    def post(self, url: Union[str, bytes], headers: Mapping[str, str], data: Any,
+             params: Any, timeout: Timeout, auth: Optional[Any]) -> Any:
+        import requests
+
+        return requests.post(url=url, headers=headers, data=data, params=params,
+                             timeout=timeout,
+                             auth=auth)
+
+
+class Urllib3Transport(Transport):
+    def __init__(self, pool_manager: Optional[Any] = None, maxsize: int = 10):
+        import urllib3
+
+        self.__urllib3: Any = urllib3
+        self.__pool_manager: Any = pool_manager or urllib3.PoolManager(maxsize=maxsize,
+                                                                       retries=False)
+        self.__maxsize: int = self.__pool_manager.connection_pool_kw.get('maxsize', 1)
+
+    def post(self, url: Union[str, bytes], headers: Mapping[str, str], data: Any,
+             params: Any, timeout: Timeout, auth: Optional[Any]) -> TransportResponse:
+        url = _with_query(url, params)
+        if auth is not None:
+            credentials = base64.b64encode(f'{auth[0]}:{auth[1]}'.encode('utf-8'))
+            headers = {**headers, 'Authorization': f'Basic {credentials.decode("ascii")}'}
+
+        if isinstance(timeout, tuple):
+            timeout = self.__urllib3.Timeout(connect=timeout[0], read=timeout[1])
+        try:
+            response = self.__pool_manager.request('POST', url, body=data, headers=headers,
+                                                   timeout=timeout, retries=False,
+                                                   preload_content=False)
+            try:
+                content = b''.join(response.stream(_STREAM_CHUNK_SIZE, decode_content=True))
+            finally:
+                response.release_conn()
+        except self.__urllib3.exceptions.HTTPError as e:
+            raise _urllib3_error(self.__urllib3, e) from e
+        return TransportResponse(response.status, response.headers, content, response.reason)
+
+    def warmup(self, url: Union[str, bytes], connections: int, timeout: float) -> int:
+        _resolve(url)
+        url = url.decode('utf-8') if isinstance(url, bytes) else url
+        pool = self.__pool_manager.connection_from_url(url)
+        opened = pool.num_connections
+        responses = []
+
+        def head(_: int) -> None:
+            # holding the unread response keeps its connection checked out of the pool
+            responses.append(self.__pool_manager.request('HEAD', url, timeout=timeout,
+                                                         retries=False, preload_content=False))
+
+        count = min(connections, self.__maxsize)
+        try:
+            with ThreadPoolExecutor(max(1, count)) as executor:
+                list(executor.map(head, range(count)))
+        except self.__urllib3.exceptions.HTTPError as e:
+            raise _urllib3_error(self.__urllib3, e) from e
+        finally:
+            for response in responses:
+                response.release_conn()
+        return pool.num_connections - opened
+
+    def close(self) -> None:
+        self.__pool_manager.clear()
+
+
+def _urllib3_error(urllib3: Any, e: Exception) -> Exception:
+    import requests
+
+    if not isinstance(e, urllib3.exceptions.NewConnectionError) and isinstance(
+            e, (urllib3.exceptions.ConnectTimeoutError, urllib3.exceptions.ReadTimeoutError)):
+        return requests.Timeout(e)
+    return requests.ConnectionError(e)
+
+
+def _import_httpx() -> Any:
+    try:
+        import httpx
+    except ImportError:
+        return None
+    return httpx
+
+
+def _has_h2() -> bool:
+    return importlib.util.find_spec('h2') is not None
+
+
+def _http_error(httpx: Any, e: Exception) -> Exception:
+    import requests
+
+    if isinstance(e, httpx.TimeoutException):
+        return requests.Timeout(e)
+    return requests.ConnectionError(e)
+
+
+class Http2Transport(Transport):
+    def __init__(self, max_connections: int = 10, client: Optional[Any] = None,
+                 event_loop: Optional[Any] = None):
+        self.__fallback: Optional[Transport] = None
+        if _import_httpx() is None:
+            self.__fallback = Urllib3Transport(maxsize=max_connections)
+            return
+        from .event_loop import shared_event_loop
+
+        self.__event_loop: Any = event_loop or shared_event_loop()
+        self.__max_connections: int = max_connections
+        self.__client: Optional[Any] = client
+        self.__async_transport: Optional[AsyncHttp2Transport] = None
+        self.__pid: int = os.getpid()
+        self.__mutex: threading.Lock = threading.Lock()
+
+    def __transport(self) -> 'AsyncHttp2Transport':
+        transport = self.__async_transport
+        if transport is not None and self.__pid == os.getpid():
+            return transport
+        with self.__mutex:
+            if self.__pid != os.getpid():
+                from .event_loop import shared_event_loop
+
+                # connections inherited from the parent process must not be reused
+                self.__event_loop = shared_event_loop()
+                self.__client = None
+                self.__async_transport = None
+                self.__pid = os.getpid()
+            if self.__async_transport is None:
+                self.__async_transport = AsyncHttp2Transport(self.__max_connections,
+                                                             self.__client)
+            return self.__async_transport
+
+    def post(self, url: Union[str, bytes], headers: Mapping[str, str], data: Any,
+             params: Any, timeout: Timeout, auth: Optional[Any]) -> Any:
+        if self.__fallback is not None:
+            return self.__fallback.post(url, headers, data, params, timeout, auth)
+        return self.__event_loop.run(self.__transport().post, url, headers, data, params,
+                                     timeout, auth)
+
+    def warmup(self, url: Union[str, bytes], connections: int, timeout: float) -> int:
+        if self.__fallback is not None:
+            return self.__fallback.warmup(url, connections, timeout)
+        _resolve(url)
+        return self.__event_loop.run(self.__transport().warmup, url, connections, timeout)
+
+    def close(self) -> None:
+        if self.__fallback is not None:
+            self.__fallback.close()
+            return
+        with self.__mutex:
+            transport, self.__async_transport = self.__async_transport, None
+        if transport is not None and self.__pid == os.getpid():
+            self.__event_loop.run(transport.close)
+
+
+class AsyncHttp2Transport:
+    def __init__(self, max_connections: int = 10, client: Optional[Any] = None):
+        self.__httpx: Any = _import_httpx()
+        if self.__httpx is None:
+            raise ImportError('AsyncHttp2Transport requires httpx, '
+                              'install incognia-python[http2]')
+        self.__client: Any = client or self.__httpx.AsyncClient(
+            http2=_has_h2(), limits=self.__httpx.Limits(max_connections=max_connections))
+
+    async def post(self, url: Union[str, bytes], headers: Mapping[str, str], data: Any,
+                   params: Any, timeout: Timeout, auth: Optional[Any]) -> TransportResponse:
+        if isinstance(timeout, tuple):
+            timeout = self.__httpx.Timeout(timeout[1], connect=timeout[0])
+        try:
+            response = await self.__client.post(_with_query(url, params), content=data,
+                                                headers=headers, timeout=timeout, auth=auth)
+        except self.__httpx.TransportError as e:
+            raise _http_error(self.__httpx, e) from e
+        return TransportResponse(response.status_code, response.headers, response.content,
+                                 response.reason_phrase)
+
+    async def warmup(self, url: Union[str, bytes], connections: int, timeout: float) -> int:
+        import asyncio
+
+        url = url.decode('utf-8') if isinstance(url, bytes) else url
+        try:
+            responses = await asyncio.gather(*(self.__client.head(url, timeout=timeout)
+                                               for _ in range(connections)))
+        except self.__httpx.TransportError as e:
+            raise _http_error(self.__httpx, e) from e
+        # HTTP/2 multiplexes the requests over a single connection
+        if all(response.http_version == 'HTTP/2' for response in responses):
+            return min(1, len(responses))
+        return len(responses)
+
+    async def close(self) -> None:
+        await self.__client.aclose()
@@ -0,0 +1,47 @@
+from gevent import monkey
+
+monkey.patch_all()
+
+import json  # noqa: E402
+import sys  # noqa: E402
+import time  # noqa: E402
+
+import gevent  # noqa: E402
+from gevent.pywsgi import WSGIServer  # noqa: E402
+
+from incognia.api import IncogniaAPI  # noqa: E402
+from incognia.endpoints import Endpoints  # noqa: E402
+
+DELAY = 0.05
+RESPONSE = json.dumps({'access_token': 'ACCESS_TOKEN', 'token_type': 'Bearer',
+                       'expires_in': 900, 'risk_assessment': 'low_risk'}).encode('utf-8')
+
+
+def application(environ, start_response):
+    gevent.sleep(DELAY)
+    start_response('200 OK', [('Content-Type', 'application/json'),
+                              ('Content-Length', str(len(RESPONSE)))])
+    return [RESPONSE]
+
+
+def main(greenlets: int) -> None:
+    server = WSGIServer(('127.0.0.1', 0), application, log=None)
+    server.start()
+    api = IncogniaAPI('ANY_ID', 'ANY_SECRET', green=True,
+                      endpoints=Endpoints(f'http://127.0.0.1:{server.server_port}'))
+
+    started_at = time.monotonic()
+    jobs = [gevent.spawn(api.register_login, 'ANY_REQUEST_TOKEN', f'account-{index}')
+            for index in range(greenlets)]
+    gevent.joinall(jobs, raise_error=True)
+    elapsed = time.monotonic() - started_at
+
+    api.stop_token_refresher()
+    server.stop()
+    print(json.dumps({'elapsed': elapsed, 'serial': greenlets * DELAY,
+                      'low_risk': sum(job.value['risk_assessment'] == 'low_risk'
+                                      for job in jobs)}))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]))
@@ -0,0 +1,72 @@
+import random
+import threading
+import time
+from typing import Any, Final
+from unittest import TestCase
+
+from incognia.api import IncogniaAPI
+from incognia.exceptions import IncogniaError
+from incognia.singleton import Singleton
+
+FAILING_ACCOUNT_ID: Final[str] = 'fail'
+
+
+class FakeClock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class RecordingAPI:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+        self.threads = []
+        self.active = 0
+        self.max_active = 0
+        self.mutex = threading.Lock()
+
+    def __call(self, call: dict) -> None:
+        with self.mutex:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(random.uniform(0, self.delay))
+        with self.mutex:
+            self.active -= 1
+            if call.get('account_id') == FAILING_ACCOUNT_ID:
+                raise IncogniaError('failed')
+            self.calls.append(call)
+            self.threads.append(threading.current_thread().name)
+
+    def events(self, account_id: str) -> list:
+        with self.mutex:
+            return [call['event'] for call in self.calls if call.get('account_id') == account_id]
+
+    def register_feedback(self, event: str, **feedback: Any) -> None:
+        self.__call({'event': event, **feedback})
+
+    def register_login(self, request_token: str, account_id: str, **arguments: Any) -> dict:
+        self.__call({'type': 'login', 'account_id': account_id, **arguments})
+        return {'type': 'login', 'account_id': account_id}
+
+    def register_payment(self, request_token: str, account_id: str, **arguments: Any) -> dict:
+        self.__call({'type': 'payment', 'account_id': account_id, **arguments})
+        return {'type': 'payment', 'account_id': account_id}
+
+
+def close_shared_api() -> None:
+    api = Singleton._instances.get(IncogniaAPI)
+    if api is not None:
+        api.close()
+
+
+def new_api(test_case: TestCase, *args: Any, **kwargs: Any) -> IncogniaAPI:
+    close_shared_api()
+    api = IncogniaAPI(*args, **kwargs)
+    test_case.addCleanup(api.close)
+    return api
@@ -0,0 +1,73 @@
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+
+class StubRequest:
+    def __init__(self, path: str, headers: dict, body: bytes):
+        self.path = path
+        self.headers = headers
+        self.body = body
+
+
+class StubServer:
+    def __init__(self, status_code: int = 200, response: Optional[dict] = None,
+                 delay: float = 0.0, gzip_response: bool = False):
+        self.status_code = status_code
+        self.response = response if response is not None else {'risk_assessment': 'low_risk'}
+        self.delay = delay
+        self.gzip_response = gzip_response
+        self.requests: List[StubRequest] = []
+        self.connections = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                stub.connections += 1
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                stub.requests.append(StubRequest(self.path, dict(self.headers),
+                                                 self.rfile.read(length)))
+                if stub.delay:
+                    threading.Event().wait(stub.delay)
+                body = json.dumps(stub.response).encode('utf-8')
+                self.send_response(stub.status_code)
+                self.send_header('Content-Type', 'application/json')
+                if stub.gzip_response:
+                    body = gzip.compress(body)
+                    self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_HEAD(self):
+                self.send_response(stub.status_code)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self.__server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.__server.daemon_threads = True
+        self.__thread = threading.Thread(target=self.__server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.__server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def __enter__(self) -> 'StubServer':
+        self.__thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.__server.shutdown()
+        self.__server.server_close()
@@ -0,0 +1,67 @@
+import time
+from typing import Final
+from unittest import TestCase
+
+import requests
+
+from incognia.adaptive_timeout import AdaptiveTimeout
+from incognia.base_request import BaseRequest
+from incognia.endpoints import Endpoints
+from incognia.transport import Urllib3Transport, RequestsTransport
+from tests.stub_server import StubServer
+
+
+class TestAdaptiveTimeout(TestCase):
+    URL: Final[str] = Endpoints.TRANSACTIONS
+    PATH: Final[str] = '/api/v2/authentication/transactions'
+
+    def test_timeout_without_enough_samples_should_be_the_ceiling(self):
+        adaptive_timeout = AdaptiveTimeout(ceiling=2.0, min_samples=10)
+
+        for _ in range(9):
+            adaptive_timeout.observe(self.URL, 0.01)
+
+        self.assertEqual(adaptive_timeout.timeout(self.URL), 2.0)
+
+    def test_timeout_should_be_the_percentile_times_the_multiplier_within_bounds(self):
+        adaptive_timeout = AdaptiveTimeout(percentile=90, multiplier=3.0, floor=0.01,
+                                           ceiling=1.0, window=100, min_samples=10)
+
+        for latency in range(1, 101):
+            adaptive_timeout.observe(self.URL, latency / 1000)
+        self.assertAlmostEqual(adaptive_timeout.timeout(self.URL), 0.27)
+
+        for _ in range(100):
+            adaptive_timeout.observe(self.URL, 0.001)
+        self.assertEqual(adaptive_timeout.timeout(self.URL), 0.01)
+
+        for _ in range(100):
+            adaptive_timeout.observe(self.URL, 10.0)
+        self.assertEqual(adaptive_timeout.timeout(self.URL), 1.0)
+
+    def test_timeout_should_track_and_bound_each_endpoint_separately(self):
+        adaptive_timeout = AdaptiveTimeout(floor=0.01, ceiling=1.0, min_samples=1,
+                                           endpoint_bounds={Endpoints.FEEDBACKS: (0.5, 30.0)})
+
+        adaptive_timeout.observe(self.URL, 0.1)
+        adaptive_timeout.observe(Endpoints.FEEDBACKS, 0.1)
+
+        self.assertAlmostEqual(adaptive_timeout.timeout(self.URL), 0.2)
+        self.assertEqual(adaptive_timeout.timeout(Endpoints.FEEDBACKS), 0.5)
+        self.assertEqual(adaptive_timeout.metrics()[self.URL]['samples'], 1)
+
+    def test_post_should_cut_off_calls_slower_than_the_adaptive_timeout(self):
+        for transport in (RequestsTransport(), Urllib3Transport()):
+            with self.subTest(transport=type(transport).__name__), StubServer() as server:
+                adaptive_timeout = AdaptiveTimeout(floor=0.05, ceiling=5.0, min_samples=5)
+                base_request = BaseRequest(transport=transport,
+                                           adaptive_timeout=adaptive_timeout)
+                url = f'{server.url}{self.PATH}'
+                for _ in range(5):
+                    base_request.post(url)
+                server.delay = 1.0
+
+                started_at = time.monotonic()
+                self.assertRaises(requests.Timeout, base_request.post, url)
+
+                self.assertLess(time.monotonic() - started_at, 0.5)
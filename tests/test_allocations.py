@@ -0,0 +1,102 @@
+import gc
+import tracemalloc
+from typing import Final, Optional
+from unittest import TestCase
+from unittest.mock import patch
+
+from incognia.base_request import BaseRequest
+from incognia.token_manager import TokenValues, TokenManager
+from incognia.transport import Transport, TransportResponse
+from tests.helpers import new_api
+
+
+class SnapshotTransport(Transport):
+    RESPONSE: Final[TransportResponse] = TransportResponse(200, {}, b'{"id": "ANY_ID"}')
+
+    def __init__(self):
+        self.headers = []
+        self.capture = False
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+
+    def post(self, url, headers, data, params, timeout, auth):
+        if not tracemalloc.is_tracing():
+            self.headers.append(headers)
+        elif self.capture:
+            self.snapshot = tracemalloc.take_snapshot().filter_traces(
+                [tracemalloc.Filter(True, '*/incognia/*')])
+        return self.RESPONSE
+
+
+class TestAllocations(TestCase):
+    CLIENT_ID: Final[str] = 'ANY_ID'
+    CLIENT_SECRET: Final[str] = 'ANY_SECRET'
+    REQUEST_TOKEN: Final[str] = 'ANY_REQUEST_TOKEN'
+    ACCOUNT_ID: Final[str] = 'ANY_ACCOUNT_ID'
+    TOKEN_VALUES: Final[TokenValues] = TokenValues('ACCESS_TOKEN', 'TOKEN_TYPE')
+    MAX_LIVE_BLOCKS_AT_SEND: Final[int] = 6
+    MAX_LIVE_BYTES_AT_SEND: Final[int] = 640
+    MAX_PEAK_BYTES_PER_CALL: Final[int] = 4096
+    MAX_RETAINED_BYTES: Final[int] = 512
+
+    def setUp(self):
+        token_values = self.TOKEN_VALUES
+        patcher = patch.object(TokenManager, 'get', lambda _: token_values)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.transport = SnapshotTransport()
+        self.api = new_api(self, self.CLIENT_ID, self.CLIENT_SECRET,
+                           base_request=BaseRequest(transport=self.transport))
+
+    def register_login(self):
+        return self.api.register_login(self.REQUEST_TOKEN, self.ACCOUNT_ID, device_os='Android',
+                                       app_version='1.0.0')
+
+    def register_payment(self):
+        return self.api.register_payment(self.REQUEST_TOKEN, self.ACCOUNT_ID,
+                                         external_id='ANY_EXTERNAL_ID', device_os='IOS')
+
+    def assert_allocations(self, call):
+        for _ in range(10):
+            call()
+        gc.collect()
+        gc.disable()
+        tracemalloc.start()
+        try:
+            call()
+            _, peak = tracemalloc.get_traced_memory()
+            for _ in range(50):
+                call()
+            retained_before, _ = tracemalloc.get_traced_memory()
+            for _ in range(500):
+                call()
+            retained_after, _ = tracemalloc.get_traced_memory()
+            self.transport.capture = True
+            call()
+        finally:
+            tracemalloc.stop()
+            gc.enable()
+
+        statistics = self.transport.snapshot.statistics('filename')
+        self.assertLessEqual(sum(stat.count for stat in statistics), self.MAX_LIVE_BLOCKS_AT_SEND)
+        self.assertLessEqual(sum(stat.size for stat in statistics), self.MAX_LIVE_BYTES_AT_SEND)
+        self.assertLessEqual(peak, self.MAX_PEAK_BYTES_PER_CALL)
+        self.assertLessEqual(retained_after - retained_before, self.MAX_RETAINED_BYTES)
+
+    def test_register_login_should_pin_allocations_per_call(self):
+        self.assert_allocations(self.register_login)
+
+    def test_register_payment_should_pin_allocations_per_call(self):
+        self.assert_allocations(self.register_payment)
+
+    def test_register_calls_should_share_an_immutable_header_set_per_token(self):
+        self.register_login()
+        self.register_payment()
+        first, second = self.transport.headers
+
+        self.assertIs(first, second)
+        with self.assertRaises(TypeError):
+            first['Authorization'] = 'ANY'
+
+        self.assertEqual(first['Authorization'], 'TOKEN_TYPE ACCESS_TOKEN')
+        self.assertEqual(first['Content-Type'], 'application/json')
+        self.assertIn('User-Agent', first)
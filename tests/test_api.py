@@ -279,6 +279,17 @@ class TestIncogniaAPI(TestCase):
 
         self.assertEqual(api1, api2)
 
+    def test_close_should_release_the_singleton_instance(self):
+        api = IncogniaAPI(self.CLIENT_ID, self.CLIENT_SECRET)
+
+        api.close()
+        proxied = IncogniaAPI(self.CLIENT_ID, self.CLIENT_SECRET,
+                              endpoints=Endpoints('https://proxy.internal'))
+        self.addCleanup(proxied.close)
+
+        self.assertIsNot(proxied, api)
+        self.assertIs(IncogniaAPI(self.CLIENT_ID, self.CLIENT_SECRET), proxied)
+
     @patch.object(BaseRequest, 'post')
     @patch.object(TokenManager, 'get', return_value=TOKEN_VALUES)
     def test_register_new_signup_when_request_token_is_valid_should_return_a_valid_dict(
@@ -0,0 +1,125 @@
+import datetime as dt
+import json
+import os
+import tempfile
+from typing import Final, Optional
+from unittest import TestCase
+from unittest.mock import patch
+
+from incognia import backfill
+from incognia.feedback_events import FeedbackEvents
+from tests.helpers import RecordingAPI
+
+
+class TestBackfill(TestCase):
+    CSV: Final[str] = ('kind,account,occurred_at\n'
+                       'fraud,account-0,2024-01-01T10:00:00Z\n'
+                       'cb,account-1,\n'
+                       '\n'
+                       'unknown,account-2,\n'
+                       'fraud,fail,\n'
+                       'fraud,account-3,2024-01-01T10:00:00\n')
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write(self, name: str, content: str, mode: str = 'w',
+              newline: Optional[str] = None) -> str:
+        path = os.path.join(self.directory, name)
+        with open(path, mode, newline=newline) as f:
+            f.write(content)
+        return path
+
+    def read_jsonl(self, path: str) -> list:
+        with open(path) as f:
+            return [json.loads(line) for line in f]
+
+    def test_run_should_send_mapped_rows_and_dead_letter_failures(self):
+        path = self.write('feedbacks.csv', self.CSV)
+        api = RecordingAPI()
+
+        checkpoint = backfill.run(
+            api, path, columns={'event': 'kind', 'account_id': 'account',
+                                'occurred_at': 'occurred_at'},
+            events={'fraud': FeedbackEvents.IDENTITY_FRAUD, 'cb': FeedbackEvents.CHARGEBACK})
+
+        self.assertEqual(sorted(api.calls, key=lambda call: call['account_id']), [
+            {'event': FeedbackEvents.IDENTITY_FRAUD, 'account_id': 'account-0',
+             'occurred_at': dt.datetime(2024, 1, 1, 10, tzinfo=dt.timezone.utc)},
+            {'event': FeedbackEvents.CHARGEBACK, 'account_id': 'account-1'}])
+        self.assertEqual((checkpoint.sent, checkpoint.failed), (2, 3))
+        self.assertEqual(checkpoint.offset, len(self.CSV))
+        dead_letters = self.read_jsonl(f'{path}.dead-letter.jsonl')
+        self.assertEqual(sorted(entry['line'] for entry in dead_letters),
+                         ['fraud,account-3,2024-01-01T10:00:00', 'fraud,fail,',
+                          'unknown,account-2,'])
+        self.assertEqual(self.read_jsonl(f'{path}.checkpoint')[0]['offset'], len(self.CSV))
+
+    def test_run_should_keep_quoted_newlines_and_whitespace_of_csv_fields(self):
+        content = ('event,account_id,external_id\r\n'
+                   'reset,account-0,"first\r\nsecond "\r\n'
+                   'reset,account-1," spaced"\r\n'
+                   'reset,account-2,"unterminated\r\n'
+                   'reset,account-3,\r\n')
+        path = self.write('feedbacks.csv', content, mode='w', newline='')
+        api = RecordingAPI()
+
+        checkpoint = backfill.run(api, path)
+
+        self.assertEqual(sorted((call['account_id'], call['external_id']) for call in api.calls),
+                         [('account-0', 'first\r\nsecond '), ('account-1', ' spaced')])
+        self.assertEqual((checkpoint.sent, checkpoint.failed, checkpoint.offset),
+                         (2, 1, len(content)))
+        dead_letters = self.read_jsonl(f'{path}.dead-letter.jsonl')
+        self.assertEqual([entry['offset'] for entry in dead_letters],
+                         [content.index('reset,account-2')])
+        self.assertEqual(dead_letters[0]['line'],
+                         'reset,account-2,"unterminated\r\nreset,account-3,')
+
+    def test_run_should_resume_after_the_last_checkpoint(self):
+        first = ''.join(json.dumps({'event': FeedbackEvents.RESET, 'account_id': f'account-{i}'})
+                        + '\n' for i in range(5))
+        second = ''.join(json.dumps({'event': FeedbackEvents.RESET, 'account_id': f'account-{i}'})
+                         + '\n' for i in range(5, 8))
+        path = self.write('feedbacks.jsonl', first)
+        backfill.run(RecordingAPI(), path, concurrency=2)
+        self.write('feedbacks.jsonl', second, mode='a')
+        api = RecordingAPI()
+
+        checkpoint = backfill.run(api, path, concurrency=2)
+
+        self.assertEqual(sorted(call['account_id'] for call in api.calls),
+                         ['account-5', 'account-6', 'account-7'])
+        self.assertEqual(checkpoint.sent, 8)
+
+    def test_run_should_skip_rows_completed_past_the_checkpoint_offset(self):
+        lines = [json.dumps({'event': FeedbackEvents.RESET, 'account_id': f'account-{i}'}) + '\n'
+                 for i in range(4)]
+        path = self.write('feedbacks.jsonl', ''.join(lines))
+        offsets = [sum(len(line) for line in lines[:i]) for i in range(4)]
+        self.write('feedbacks.jsonl.checkpoint', json.dumps({
+            'input': os.path.abspath(path), 'offset': offsets[1], 'done': [offsets[2]],
+            'sent': 2, 'failed': 0}))
+        api = RecordingAPI()
+
+        checkpoint = backfill.run(api, path)
+
+        self.assertEqual(sorted(call['account_id'] for call in api.calls),
+                         ['account-1', 'account-3'])
+        self.assertEqual((checkpoint.offset, checkpoint.done, checkpoint.sent),
+                         (len(''.join(lines)), set(), 4))
+
+    def test_main_should_configure_the_client_and_report_failures(self):
+        path = self.write('feedbacks.jsonl', json.dumps(
+            {'event': FeedbackEvents.RESET, 'account_id': 'fail'}) + '\n')
+        api = RecordingAPI()
+
+        with patch.object(backfill, 'IncogniaAPI', return_value=api) as mock_api:
+            status = backfill.main([path, '--client-id', 'ANY_ID', '--client-secret',
+                                    'ANY_SECRET', '--rate', '10', '--concurrency', '2'])
+
+        self.assertEqual(status, 1)
+        self.assertEqual(mock_api.call_args.args, ('ANY_ID', 'ANY_SECRET'))
+        self.assertEqual(len(self.read_jsonl(f'{path}.dead-letter.jsonl')), 1)
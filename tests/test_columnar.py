@@ -0,0 +1,131 @@
+import importlib.util
+import json
+from typing import Final
+from unittest import TestCase, skipUnless
+from unittest.mock import patch, Mock
+
+from incognia.api import IncogniaAPI
+from incognia.base_request import BaseRequest
+from incognia.exceptions import IncogniaError
+from incognia.token_manager import TokenValues, TokenManager
+from tests.helpers import new_api
+
+HAS_NUMPY: Final[bool] = importlib.util.find_spec('numpy') is not None
+
+
+@skipUnless(HAS_NUMPY, 'numpy is not installed')
+class TestColumnar(TestCase):
+    CLIENT_ID: Final[str] = 'ANY_ID'
+    CLIENT_SECRET: Final[str] = 'ANY_SECRET'
+    TOKEN_VALUES: Final[TokenValues] = TokenValues('ACCESS_TOKEN', 'TOKEN_TYPE')
+    COLUMNS: Final[dict] = {
+        'request_token': ['token-0', 'token-1', '', 'token-3', 'token-4', 'token-5'],
+        'account_id': ['account-0', 'account-1', 'account-2', 'account-3', None, 'account-5'],
+        'latitude': [-23.5, None, 10.0, 91.0, 0.0, 1.5],
+        'longitude': [-46.6, None, 10.0, 0.0, 0.0, 2.5],
+        'collected_at': ['2024-01-01T10:00:00Z', None, None, None, None, 'yesterday'],
+        'amount': [10.5, 20.0, 1.0, 1.0, 1.0, 1.0],
+        'currency': ['BRL', 'USD', 'BRL', 'BRL', 'BRL', 'BRL'],
+    }
+
+    def test_batch_should_validate_every_row_at_once(self):
+        from incognia.columnar import ColumnarBatch
+
+        batch = ColumnarBatch(self.COLUMNS)
+        errors = [str(error) if error is not None else None for error in batch.errors]
+
+        self.assertEqual(batch.valid.tolist(), [True, True, False, False, False, False])
+        self.assertEqual(errors, [None, None, 'request_token is required.',
+                                  'location["latitude"] must be between -90 and 90',
+                                  'account_id is required.',
+                                  'location["collected_at"] must conform to ISO-8601 format'])
+
+    def test_batch_should_build_transactions_with_encoded_location_and_payment_value(self):
+        from incognia.columnar import ColumnarBatch
+
+        transactions = list(ColumnarBatch(self.COLUMNS).transactions(evaluate=False))
+
+        self.assertEqual(len(transactions), 2)
+        self.assertEqual(transactions[0]['type'], 'payment')
+        self.assertEqual(json.loads(transactions[0]['location'].json_fragment),
+                         {'latitude': -23.5, 'longitude': -46.6,
+                          'collected_at': '2024-01-01T10:00:00Z'})
+        self.assertEqual(json.loads(transactions[0]['payment_value'].json_fragment),
+                         {'amount': 10.5, 'currency': 'BRL'})
+        self.assertNotIn('location', transactions[1])
+        self.assertFalse(transactions[1]['evaluate'])
+
+    def test_batch_should_validate_collected_at_timestamps(self):
+        from incognia.columnar import ColumnarBatch
+
+        timestamps = ['2024-02-29', '2024-01-01 10:00', '2024-01-01T10:00:00.123Z',
+                      '2024-01-01T10:00:00.123456-03:00', '2023-02-29', '2024-01-01T24:00:00',
+                      '2024-01-01T10:00:00+25:00', '2024-01-01T10:00:00Zx']
+        batch = ColumnarBatch({'request_token': ['token'] * 8, 'account_id': ['account'] * 8,
+                               'latitude': [0.0] * 8, 'longitude': [0.0] * 8,
+                               'collected_at': timestamps}, 'login')
+
+        self.assertEqual(batch.valid.tolist(), [True] * 4 + [False] * 4)
+
+    @patch.object(BaseRequest, 'post')
+    @patch.object(TokenManager, 'get', return_value=TOKEN_VALUES)
+    def test_batch_bodies_should_match_the_bodies_of_register_payment(
+            self, mock_token_manager_get: Mock, mock_base_request_post: Mock):
+        from incognia.columnar import ColumnarBatch
+
+        rows, account_ids, bodies = ColumnarBatch(
+            {**self.COLUMNS, 'device_os': ['Android'] * 6, 'external_id': ['e"1', None] * 3},
+            'payment').bodies()
+        api = new_api(self, self.CLIENT_ID, self.CLIENT_SECRET)
+        api.register_payment('token-0', 'account-0', external_id='e"1', device_os='Android',
+                             location={'latitude': -23.5, 'longitude': -46.6,
+                                       'collected_at': '2024-01-01T10:00:00Z'},
+                             payment_value={'amount': 10.5, 'currency': 'BRL'})
+
+        self.assertEqual(rows.tolist(), [0, 1])
+        self.assertEqual(account_ids, ['account-0', 'account-1'])
+        self.assertEqual(bodies[0], mock_base_request_post.call_args.kwargs['data'])
+        self.assertEqual(json.loads(bodies[1]), {
+            'type': 'payment', 'request_token': 'token-1', 'account_id': 'account-1',
+            'payment_value': {'amount': 20.0, 'currency': 'USD'}, 'device_os': 'android'})
+
+    def test_batch_with_mismatched_or_unknown_columns_should_raise_an_error(self):
+        from incognia.columnar import ColumnarBatch
+
+        self.assertRaises(IncogniaError, ColumnarBatch,
+                          {'request_token': ['token'], 'account_id': []})
+        self.assertRaises(TypeError, ColumnarBatch,
+                          {'request_token': ['token'], 'amount': [1.0]}, 'login')
+        self.assertRaises(IncogniaError, ColumnarBatch, {}, 'signup')
+
+    def test_batch_should_require_amount_and_currency_together(self):
+        import numpy as np
+        from incognia.columnar import ColumnarBatch
+
+        batch = ColumnarBatch({'request_token': np.array(['token'] * 3),
+                               'account_id': np.array(['account'] * 3),
+                               'amount': np.array([1.0, np.nan, -1.0]),
+                               'currency': np.array(['BRL', 'BRL', 'BRL'], dtype=object)})
+
+        self.assertEqual(batch.valid.tolist(), [True, False, False])
+
+    @patch.object(BaseRequest, 'post')
+    @patch.object(TokenManager, 'get', return_value=TOKEN_VALUES)
+    def test_register_batch_should_return_results_as_columns(
+            self, mock_token_manager_get: Mock, mock_base_request_post: Mock):
+        mock_base_request_post.configure_mock(
+            side_effect=lambda *args, **kwargs: {
+                'risk_assessment': 'high_risk'
+                if json.loads(kwargs['data'])['account_id'] == 'account-1' else 'low_risk'})
+        api = IncogniaAPI(self.CLIENT_ID, self.CLIENT_SECRET)
+
+        results = api.register_batch(self.COLUMNS, window=4)
+
+        self.assertEqual(results['risk_assessment'].tolist(),
+                         ['low_risk', 'high_risk', None, None, None, None])
+        self.assertIsNone(results['error'][0])
+        self.assertIsInstance(results['error'][2], IncogniaError)
+        self.assertEqual(mock_base_request_post.call_count, 2)
+        body = json.loads(mock_base_request_post.call_args_list[0].kwargs['data'])
+        self.assertEqual(body['type'], 'payment')
+        self.assertIn('payment_value', body)
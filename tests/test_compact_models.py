@@ -0,0 +1,134 @@
+import sys
+from typing import Final
+from unittest import TestCase
+from unittest.mock import patch, Mock
+
+from incognia.api import IncogniaAPI
+from incognia.base_request import BaseRequest
+from incognia.compact_models import (
+    Coordinates,
+    Coupon,
+    StructuredAddress,
+    TransactionAddress,
+    PaymentValue,
+    PaymentMethod,
+    CardInfo,
+    Location,
+    BankAccountInfo,
+    PersonID,
+    PixKey,
+)
+from incognia.endpoints import Endpoints
+from incognia.exceptions import IncogniaError
+from incognia.json_util import encode
+from incognia.token_manager import TokenValues, TokenManager
+
+
+class TestCompactModels(TestCase):
+    CLIENT_ID: Final[str] = 'ANY_ID'
+    CLIENT_SECRET: Final[str] = 'ANY_SECRET'
+    REQUEST_TOKEN: Final[str] = 'ANY_REQUEST_TOKEN'
+    ACCOUNT_ID: Final[str] = 'ANY_ACCOUNT_ID'
+    TOKEN_VALUES: Final[TokenValues] = TokenValues('ACCESS_TOKEN', 'TOKEN_TYPE')
+    STRUCTURED_ADDRESS: Final[dict] = {
+        'locale': 'pt-BR',
+        'country_code': 'BR',
+        'city': 'São Paulo',
+        'street': 'Av. Paulista',
+        'number': '1578',
+        'postal_code': '01310-200'
+    }
+    COORDINATES: Final[dict] = {'lat': -23.561414, 'lng': -46.6558819}
+    CARD_INFO: Final[dict] = {'bin': '123456', 'last_four_digits': '1234'}
+    BANK_ACCOUNT_INFO: Final[dict] = {
+        'account_type': 'checking',
+        'holder_tax_id': {'type': 'cpf', 'value': '12345678900'},
+        'country': 'BR',
+        'pix_keys': [{'type': 'email', 'value': 'user@example.com'}],
+    }
+    LOCATION: Final[dict] = {'latitude': 1.5, 'longitude': 2.5,
+                             'collected_at': '2024-10-14T12:04:00+00:00'}
+
+    def test_json_fragment_should_match_the_dict_encoding(self):
+        address = TransactionAddress(type='shipping',
+                                     structured_address=StructuredAddress(
+                                         **self.STRUCTURED_ADDRESS),
+                                     address_coordinates=Coordinates(**self.COORDINATES))
+        expected = encode({'type': 'shipping',
+                           'structured_address': self.STRUCTURED_ADDRESS,
+                           'address_coordinates': self.COORDINATES})
+
+        self.assertEqual(address.json_fragment.encode('utf-8'), expected)
+
+    def test_json_fragment_should_be_computed_only_once(self):
+        address = StructuredAddress(**self.STRUCTURED_ADDRESS)
+
+        self.assertIs(address.json_fragment, address.json_fragment)
+
+    def test_models_should_be_immutable(self):
+        coordinates = Coordinates(**self.COORDINATES)
+
+        with self.assertRaises(AttributeError):
+            coordinates.lat = 0.0
+        with self.assertRaises(AttributeError):
+            coordinates.extra = 0.0
+
+    def test_models_should_support_mapping_reads_and_conversion_to_dict(self):
+        account = BankAccountInfo(
+            **{**self.BANK_ACCOUNT_INFO,
+               'pix_keys': [PixKey(**key) for key in self.BANK_ACCOUNT_INFO['pix_keys']]})
+
+        self.assertEqual(account['country'], 'BR')
+        self.assertIsNone(account['ispb_code'])
+        self.assertRaises(KeyError, account.__getitem__, 'unknown')
+        self.assertEqual(account.to_dict(), self.BANK_ACCOUNT_INFO)
+
+    def test_models_should_freeze_nested_dicts(self):
+        address = TransactionAddress(type='home', structured_address=self.STRUCTURED_ADDRESS,
+                                     address_coordinates=self.COORDINATES)
+        account = BankAccountInfo(**self.BANK_ACCOUNT_INFO)
+
+        self.assertEqual(address.structured_address, StructuredAddress(**self.STRUCTURED_ADDRESS))
+        self.assertEqual(address.address_coordinates, Coordinates(**self.COORDINATES))
+        self.assertEqual(account.holder_tax_id, PersonID(type='cpf', value='12345678900'))
+        self.assertEqual(account.pix_keys, (PixKey(type='email', value='user@example.com'),))
+        self.assertEqual(hash(address), hash(TransactionAddress(**address.to_dict())))
+        self.assertEqual(account.to_dict(), self.BANK_ACCOUNT_INFO)
+        self.assertEqual(len({account, BankAccountInfo(**self.BANK_ACCOUNT_INFO)}), 1)
+        coupon = Coupon(type='custom', value={'percent': 10})
+        self.assertRaises(TypeError, coupon.value.__setitem__, 'percent', 20)
+        self.assertEqual(hash(coupon), hash(Coupon(type='custom', value={'percent': 10})))
+
+    def test_models_when_required_fields_are_missing_should_raise_an_IncogniaError(self):
+        self.assertRaises(IncogniaError, PaymentValue, amount=1.0)
+        self.assertRaises(TypeError, PersonID, type='cpf', unknown='value')
+
+    def test_models_should_use_less_memory_than_dicts(self):
+        address = StructuredAddress(**self.STRUCTURED_ADDRESS)
+
+        self.assertLess(sys.getsizeof(address), sys.getsizeof(dict(self.STRUCTURED_ADDRESS)))
+
+    @patch.object(BaseRequest, 'post')
+    @patch.object(TokenManager, 'get', return_value=TOKEN_VALUES)
+    def test_register_payment_with_compact_models_should_send_the_same_body_as_dicts(
+            self, mock_token_manager_get: Mock, mock_base_request_post: Mock):
+        api = IncogniaAPI(self.CLIENT_ID, self.CLIENT_SECRET)
+        api.register_payment(self.REQUEST_TOKEN, self.ACCOUNT_ID,
+                             location=self.LOCATION,
+                             payment_value={'amount': 10.0, 'currency': 'BRL'},
+                             payment_methods=[{'type': 'credit_card',
+                                               'credit_card_info': self.CARD_INFO}],
+                             debtor_account=self.BANK_ACCOUNT_INFO)
+        dict_call = mock_base_request_post.call_args
+
+        api.register_payment(self.REQUEST_TOKEN, self.ACCOUNT_ID,
+                             location=Location(**self.LOCATION),
+                             payment_value=PaymentValue(amount=10.0, currency='BRL'),
+                             payment_methods=[PaymentMethod(
+                                 type='credit_card',
+                                 credit_card_info=CardInfo(**self.CARD_INFO))],
+                             debtor_account=BankAccountInfo(**self.BANK_ACCOUNT_INFO))
+
+        mock_token_manager_get.assert_called()
+        self.assertEqual(mock_base_request_post.call_args, dict_call)
+        self.assertEqual(mock_base_request_post.call_args.args, (Endpoints.TRANSACTIONS,))
@@ -0,0 +1,80 @@
+import gzip
+import importlib.util
+import json
+from typing import Final
+from unittest import TestCase, skipUnless
+
+from incognia.base_request import BaseRequest
+from incognia.compression import Compressor, RequestCompression, ZstdCompressor
+from incognia.transport import Urllib3Transport, RequestsTransport
+from tests.stub_server import StubServer
+
+HAS_ZSTANDARD: Final[bool] = importlib.util.find_spec('zstandard') is not None
+
+
+class TestCompression(TestCase):
+    PATH: Final[str] = '/api/v2/feedbacks'
+    JSON_RESPONSE: Final[dict] = {'risk_assessment': 'low_risk'}
+    LARGE_DATA: Final[bytes] = json.dumps(
+        {'custom_properties': {f'key_{i}': 'value' * 10 for i in range(100)}}).encode('utf-8')
+    SMALL_DATA: Final[bytes] = b'{"event": "verified"}'
+
+    def test_apply_when_data_is_below_threshold_should_not_compress(self):
+        headers, data = RequestCompression(threshold=1024).apply({}, self.SMALL_DATA)
+
+        self.assertEqual(data, self.SMALL_DATA)
+        self.assertNotIn('Content-Encoding', headers)
+        self.assertIn('gzip', headers['Accept-Encoding'])
+
+    def test_apply_with_a_custom_compressor_should_use_its_encoding(self):
+        class ReversingCompressor(Compressor):
+            encoding = 'reversed'
+
+            def compress(self, data: bytes) -> bytes:
+                return data[::-1]
+
+        headers, data = RequestCompression(ReversingCompressor(), threshold=1).apply(
+            {}, self.SMALL_DATA)
+
+        self.assertEqual(headers['Content-Encoding'], 'reversed')
+        self.assertEqual(data, self.SMALL_DATA[::-1])
+
+    def test_compressor_without_compress_should_not_be_instantiable(self):
+        class IncompleteCompressor(Compressor):
+            pass
+
+        self.assertRaises(TypeError, IncompleteCompressor)
+
+    def test_apply_when_data_is_above_threshold_should_gzip_it(self):
+        headers, data = RequestCompression(threshold=1024).apply({}, self.LARGE_DATA)
+
+        self.assertEqual(headers['Content-Encoding'], 'gzip')
+        self.assertLess(len(data), len(self.LARGE_DATA))
+        self.assertEqual(gzip.decompress(data), self.LARGE_DATA)
+
+    @skipUnless(HAS_ZSTANDARD, 'zstandard is not installed')
+    def test_apply_with_zstd_should_compress_with_zstd(self):
+        import zstandard
+
+        headers, data = RequestCompression('zstd', threshold=0).apply({}, self.LARGE_DATA)
+
+        self.assertEqual(headers['Content-Encoding'], 'zstd')
+        self.assertEqual(zstandard.ZstdDecompressor().decompress(data), self.LARGE_DATA)
+
+    def test_compression_when_algorithm_is_unknown_should_raise_a_ValueError(self):
+        self.assertRaises(ValueError, RequestCompression, 'lzma')
+        if not HAS_ZSTANDARD:
+            self.assertRaises(ImportError, ZstdCompressor)
+
+    def test_post_should_send_compressed_bodies_and_decompress_responses(self):
+        for transport in (RequestsTransport(), Urllib3Transport()):
+            with self.subTest(transport=type(transport).__name__), \
+                    StubServer(response=self.JSON_RESPONSE, gzip_response=True) as server:
+                base_request = BaseRequest(transport=transport,
+                                           compression=RequestCompression(threshold=1024))
+                result = base_request.post(f'{server.url}{self.PATH}', data=self.LARGE_DATA)
+
+                self.assertEqual(result, self.JSON_RESPONSE)
+                request = server.requests[0]
+                self.assertEqual(request.headers['Content-Encoding'], 'gzip')
+                self.assertEqual(gzip.decompress(request.body), self.LARGE_DATA)
@@ -0,0 +1,186 @@
+import threading
+import time
+from typing import Final
+from unittest import TestCase
+from unittest.mock import patch, Mock
+
+import requests
+
+from incognia.base_request import BaseRequest
+from incognia.concurrency_limiter import AdaptiveConcurrencyLimiter, Priority, default_priority
+from incognia.endpoints import Endpoints
+from incognia.exceptions import IncogniaConcurrencyLimitError, IncogniaHTTPError
+from tests.helpers import FakeClock
+
+
+class TestAdaptiveConcurrencyLimiter(TestCase):
+    URL: Final[str] = 'https://some-valid-link.com'
+
+    def test_acquire_when_limit_is_reached_and_not_blocking_should_raise_an_error(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, block=False)
+
+        limiter.acquire()
+        limiter.acquire()
+
+        self.assertRaises(IncogniaConcurrencyLimitError, limiter.acquire)
+        self.assertEqual(limiter.metrics(),
+                         {'limit': 2, 'in_flight': 2, 'queued': 0, 'rejected': 1,
+                          'low_priority_limit': 2, 'low_priority_in_flight': 0,
+                          'low_priority_queued': 0, 'low_priority_promoted': 0})
+
+    def test_acquire_when_queue_timeout_expires_should_raise_an_error(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, queue_timeout=0.01)
+
+        limiter.acquire()
+
+        self.assertRaises(IncogniaConcurrencyLimitError, limiter.acquire)
+        self.assertEqual(limiter.queued, 0)
+
+    def test_acquire_when_blocking_should_wait_for_a_released_slot(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, queue_timeout=5)
+        started_at = limiter.acquire()
+        acquired = threading.Event()
+
+        def acquire():
+            limiter.acquire()
+            acquired.set()
+
+        thread = threading.Thread(target=acquire)
+        thread.start()
+        self.assertFalse(acquired.wait(0.05))
+        limiter.release(started_at)
+        thread.join(5)
+
+        self.assertTrue(acquired.is_set())
+        self.assertEqual(limiter.in_flight, 1)
+
+    def test_default_priority_should_only_deprioritize_feedbacks(self):
+        self.assertEqual(default_priority(Endpoints.FEEDBACKS), Priority.LOW)
+        self.assertEqual(default_priority(f'{Endpoints.FEEDBACKS}?dry_run=true'.encode()),
+                         Priority.LOW)
+        self.assertEqual(default_priority(Endpoints.TRANSACTIONS), Priority.HIGH)
+        self.assertEqual(default_priority(Endpoints.TOKEN), Priority.HIGH)
+
+    def test_acquire_should_serve_queued_high_priority_requests_first(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, queue_timeout=5,
+                                             max_low_priority_wait=None)
+        started_at = limiter.acquire()
+        order = []
+
+        def acquire(priority):
+            acquired_at = limiter.acquire(priority)
+            order.append(priority)
+            limiter.release(acquired_at, priority=priority)
+
+        threads = [threading.Thread(target=acquire, args=(priority,))
+                   for priority in (Priority.LOW, Priority.LOW, Priority.HIGH)]
+        for queued, thread in enumerate(threads, start=1):
+            thread.start()
+            while limiter.queued < queued:
+                time.sleep(0.001)
+        limiter.release(started_at)
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(order, [Priority.HIGH, Priority.LOW, Priority.LOW])
+
+    def test_acquire_should_serve_queued_requests_in_arrival_order(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, queue_timeout=5)
+        started_at = limiter.acquire()
+        order = []
+
+        def acquire(index):
+            acquired_at = limiter.acquire()
+            order.append(index)
+            limiter.release(acquired_at)
+
+        threads = [threading.Thread(target=acquire, args=(index,)) for index in range(20)]
+        for queued, thread in enumerate(threads, start=1):
+            thread.start()
+            while limiter.queued < queued:
+                time.sleep(0.001)
+        limiter.release(started_at)
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(order, list(range(20)))
+        self.assertEqual(limiter.metrics()['in_flight'], 0)
+
+    def test_acquire_should_keep_reserved_capacity_for_high_priority_requests(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, reserved_capacity=0.5,
+                                             block=False)
+
+        limiter.acquire(Priority.LOW)
+        limiter.acquire(Priority.LOW)
+
+        self.assertRaises(IncogniaConcurrencyLimitError, limiter.acquire, Priority.LOW)
+        limiter.acquire(Priority.HIGH)
+        limiter.acquire(Priority.HIGH)
+        self.assertEqual(limiter.in_flight, 4)
+
+    def test_acquire_when_low_priority_waits_too_long_should_promote_it(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, reserved_capacity=0.5,
+                                             queue_timeout=5, max_low_priority_wait=0.05)
+        limiter.acquire(Priority.LOW)
+
+        started = time.monotonic()
+        limiter.acquire(Priority.LOW)
+
+        self.assertGreaterEqual(time.monotonic() - started, 0.05)
+        self.assertEqual(limiter.metrics()['low_priority_in_flight'], 2)
+        self.assertEqual(limiter.metrics()['low_priority_promoted'], 1)
+
+    def test_release_should_increase_additively_and_decrease_multiplicatively(self):
+        clock = FakeClock()
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, latency_threshold=1.0,
+                                             backoff_ratio=0.5, clock=clock)
+
+        for _ in range(4):
+            first, second = limiter.acquire(), limiter.acquire()
+            limiter.release(first)
+            limiter.release(second)
+        self.assertEqual(limiter.limit, 3)
+
+        started_at = limiter.acquire()
+        clock.now += 2.0
+        limiter.release(started_at)
+        self.assertEqual(limiter.limit, 1)
+
+        limiter.release(limiter.acquire(), success=False)
+        self.assertEqual(limiter.limit, 1)
+
+    def test_release_without_threshold_should_compare_with_the_minimum_latency(self):
+        clock = FakeClock()
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=10, backoff_ratio=0.5, clock=clock)
+
+        for latency in (0.1, 0.15, 0.5):
+            started_at = limiter.acquire()
+            clock.now += latency
+            limiter.release(started_at)
+
+        self.assertEqual(limiter.limit, 5)
+
+    def test_release_should_compare_with_a_minimum_latency_updated_on_every_sample(self):
+        clock = FakeClock()
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=10, backoff_ratio=0.5, clock=clock)
+
+        for latency in (1.0, 0.1, 0.5):
+            started_at = limiter.acquire()
+            clock.now += latency
+            limiter.release(started_at)
+
+        self.assertEqual(limiter.limit, 5)
+
+    @patch('requests.post')
+    def test_post_when_server_fails_should_release_the_slot_as_a_failure(
+            self, mock_requests_post: Mock):
+        response = requests.Response()
+        response._content, response.status_code = b'', 503
+        mock_requests_post.configure_mock(return_value=response)
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=10, backoff_ratio=0.5)
+
+        base_request = BaseRequest(concurrency_limiter=limiter)
+
+        self.assertRaises(IncogniaHTTPError, base_request.post, url=self.URL)
+        self.assertEqual(limiter.limit, 5)
+        self.assertEqual(limiter.in_flight, 0)
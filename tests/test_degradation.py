@@ -0,0 +1,144 @@
+import threading
+from typing import Final
+from unittest import TestCase
+from unittest.mock import patch, Mock
+
+import requests
+
+from incognia.base_request import BaseRequest
+from incognia.degradation import (
+    DegradationPolicy,
+    FallbackProvider,
+    StaleAssessmentCache,
+    StaticFallback,
+    is_degraded,
+)
+from incognia.exceptions import IncogniaHTTPError
+from incognia.token_manager import TokenValues, TokenManager
+from tests.helpers import new_api
+
+
+class TestDegradation(TestCase):
+    CLIENT_ID: Final[str] = 'ANY_ID'
+    CLIENT_SECRET: Final[str] = 'ANY_SECRET'
+    REQUEST_TOKEN: Final[str] = 'ANY_REQUEST_TOKEN'
+    ACCOUNT_ID: Final[str] = 'ANY_ACCOUNT_ID'
+    TOKEN_VALUES: Final[TokenValues] = TokenValues('ACCESS_TOKEN', 'TOKEN_TYPE')
+    ASSESSMENT: Final[dict] = {'id': 'login-id', 'risk_assessment': 'low_risk'}
+    STATIC_ASSESSMENT: Final[dict] = {'risk_assessment': 'unknown_risk'}
+
+    def test_run_when_call_is_fast_should_return_and_record_the_real_assessment(self):
+        cache = StaleAssessmentCache()
+        policy = DegradationPolicy(budget=1.0, fallback=cache)
+
+        self.assertEqual(policy.run(self.ACCOUNT_ID, lambda: self.ASSESSMENT), self.ASSESSMENT)
+        self.assertEqual(cache.get(self.ACCOUNT_ID), self.ASSESSMENT)
+
+    def test_run_when_budget_is_exceeded_should_return_the_fallback_and_report_late_response(
+            self):
+        release, late = threading.Event(), []
+        reported = threading.Event()
+        cache = StaleAssessmentCache(fallback=StaticFallback(self.STATIC_ASSESSMENT))
+
+        def on_late_response(*args):
+            late.append(args)
+            reported.set()
+
+        policy = DegradationPolicy(budget=0.01, fallback=cache,
+                                   on_late_response=on_late_response)
+
+        def slow_call():
+            release.wait(5)
+            return self.ASSESSMENT
+
+        assessment = policy.run(self.ACCOUNT_ID, slow_call)
+        release.set()
+        self.assertTrue(reported.wait(5))
+
+        self.assertTrue(is_degraded(assessment))
+        self.assertEqual(assessment['risk_assessment'], 'unknown_risk')
+        self.assertEqual(assessment['degradation_reason'], 'latency_budget_exceeded')
+        self.assertEqual(late, [(self.ACCOUNT_ID, self.ASSESSMENT, None)])
+        self.assertEqual(cache.get(self.ACCOUNT_ID), self.ASSESSMENT)
+
+    def test_run_when_every_worker_is_busy_should_degrade_without_submitting(self):
+        release, started = threading.Event(), []
+        policy = DegradationPolicy(budget=0.01, fallback=StaticFallback(self.STATIC_ASSESSMENT),
+                                   max_workers=2)
+        self.addCleanup(policy.shutdown)
+        self.addCleanup(release.set)
+
+        def slow_call():
+            started.append(None)
+            release.wait(5)
+            return self.ASSESSMENT
+
+        assessments = [policy.run(self.ACCOUNT_ID, slow_call) for _ in range(50)]
+
+        reasons = [assessment['degradation_reason'] for assessment in assessments]
+        self.assertGreaterEqual(reasons.count('workers_saturated'), 46)
+        release.set()
+        policy.shutdown()
+        self.assertLessEqual(len(started), 2)
+
+    def test_run_without_fallback_should_wait_for_the_real_assessment(self):
+        policy = DegradationPolicy(budget=0.01, fallback=StaleAssessmentCache())
+
+        def slow_call():
+            threading.Event().wait(0.05)
+            return self.ASSESSMENT
+
+        self.assertEqual(policy.run(self.ACCOUNT_ID, slow_call), self.ASSESSMENT)
+
+    def test_run_should_degrade_on_server_failures_only(self):
+        policy = DegradationPolicy(budget=1.0, fallback=StaticFallback(self.STATIC_ASSESSMENT))
+        server_error, client_error = requests.Response(), requests.Response()
+        server_error.status_code, client_error.status_code = 503, 400
+
+        def fail(error):
+            def call():
+                raise error
+            return call
+
+        self.assertTrue(is_degraded(policy.run(
+            self.ACCOUNT_ID, fail(IncogniaHTTPError(response=server_error)))))
+        self.assertTrue(is_degraded(policy.run(
+            self.ACCOUNT_ID, fail(requests.ConnectionError()))))
+        self.assertRaises(IncogniaHTTPError, policy.run, self.ACCOUNT_ID,
+                          fail(IncogniaHTTPError(response=client_error)))
+
+    def test_fallback_provider_without_get_should_not_be_instantiable(self):
+        class IncompleteFallback(FallbackProvider):
+            pass
+
+        self.assertRaises(TypeError, IncompleteFallback)
+
+    def test_stale_cache_should_evict_and_expire_entries(self):
+        now = [0.0]
+        cache = StaleAssessmentCache(maxsize=1, max_age=10, clock=lambda: now[0])
+
+        cache.record('first', self.ASSESSMENT)
+        cache.record('second', self.ASSESSMENT)
+        self.assertIsNone(cache.get('first'))
+        self.assertEqual(cache.get('second'), self.ASSESSMENT)
+
+        now[0] = 11
+        self.assertIsNone(cache.get('second'))
+
+    @patch.object(BaseRequest, 'post')
+    @patch.object(TokenManager, 'get', return_value=TOKEN_VALUES)
+    def test_register_login_when_budget_is_exceeded_should_return_a_degraded_assessment(
+            self, mock_token_manager_get: Mock, mock_base_request_post: Mock):
+        release = threading.Event()
+        mock_base_request_post.configure_mock(
+            side_effect=lambda *args, **kwargs: release.wait(5) and self.ASSESSMENT)
+        policy = DegradationPolicy(budget=0.01,
+                                   fallback=StaticFallback(self.STATIC_ASSESSMENT))
+
+        api = new_api(self, self.CLIENT_ID, self.CLIENT_SECRET, degradation_policy=policy)
+        assessment = api.register_login(self.REQUEST_TOKEN, self.ACCOUNT_ID)
+        release.set()
+        policy.shutdown()
+
+        mock_token_manager_get.assert_called()
+        self.assertTrue(is_degraded(assessment))
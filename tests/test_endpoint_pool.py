@@ -0,0 +1,151 @@
+import threading
+from typing import Final
+from unittest import TestCase
+from unittest.mock import patch, Mock
+
+import requests
+
+from incognia.base_request import BaseRequest
+from incognia.endpoint_pool import EndpointPool
+from incognia.endpoints import Endpoints
+from incognia.token_manager import TokenValues, TokenManager
+from tests.helpers import new_api
+from tests.stub_server import StubServer
+
+
+class FakeProbe:
+    def __init__(self, latencies: dict):
+        self.latencies = latencies
+
+    def __call__(self, base: str, timeout: float) -> float:
+        latency = self.latencies[base]
+        if latency is None:
+            raise ConnectionRefusedError(base)
+        return latency
+
+
+class TestEndpointPool(TestCase):
+    CLIENT_ID: Final[str] = 'ANY_ID'
+    CLIENT_SECRET: Final[str] = 'ANY_SECRET'
+    TOKEN_VALUES: Final[TokenValues] = TokenValues('ACCESS_TOKEN', 'TOKEN_TYPE')
+    US: Final[str] = 'https://us.incognia.example'
+    EU: Final[str] = 'https://eu.incognia.example'
+
+    def test_endpoints_instance_should_build_urls_from_its_base(self):
+        endpoints = Endpoints(f'{self.EU}/')
+
+        self.assertEqual(endpoints.TRANSACTIONS, f'{self.EU}/api/v2/authentication/transactions')
+        self.assertEqual(endpoints.TOKEN, f'{self.EU}/api/v2/token')
+        self.assertEqual(Endpoints().FEEDBACKS, Endpoints.FEEDBACKS)
+        self.assertEqual(Endpoints.BASE, 'https://api.incognia.com')
+
+    @patch.object(BaseRequest, 'post', return_value={'id': 'ANY_ID'})
+    @patch.object(TokenManager, 'get', return_value=TOKEN_VALUES)
+    def test_api_with_endpoints_should_post_to_the_configured_base(
+            self, mock_token_manager_get: Mock, mock_base_request_post: Mock):
+        api = new_api(self, self.CLIENT_ID, self.CLIENT_SECRET, endpoints=Endpoints(self.EU))
+
+        api.register_login('ANY_REQUEST_TOKEN', 'ANY_ACCOUNT_ID')
+
+        self.assertEqual(mock_base_request_post.call_args.args[0],
+                         Endpoints(self.EU).TRANSACTIONS)
+
+    def test_probe_should_route_to_the_fastest_healthy_candidate(self):
+        probe = FakeProbe({self.US: 0.05, self.EU: 0.01})
+        pool = EndpointPool([self.US, self.EU], probe_interval=None, probe=probe)
+
+        pool.probe()
+
+        self.assertEqual(pool.current, self.EU)
+        self.assertEqual(pool.route(Endpoints.TOKEN), (self.EU, f'{self.EU}/api/v2/token'))
+        self.assertEqual(pool.route('https://other.example/x'), (None, 'https://other.example/x'))
+
+    def test_route_should_only_rewrite_urls_on_the_canonical_scheme_and_host(self):
+        pool = EndpointPool([self.EU], probe_interval=None)
+
+        self.assertEqual(pool.route(f'{Endpoints.TOKEN}?eval=false'),
+                         (self.EU, f'{self.EU}/api/v2/token?eval=false'))
+        self.assertEqual(pool.route('HTTPS://API.incognia.com/api'), (self.EU, f'{self.EU}/api'))
+        for url in ('https://api.incognia.com.evil/api/v2/token',
+                    'https://api.incognia.com:8443/api/v2/token',
+                    'http://api.incognia.com/api/v2/token'):
+            self.assertEqual(pool.route(url), (None, url))
+
+    def test_route_should_start_probing_lazily(self):
+        probed = threading.Event()
+
+        def probe(base: str, timeout: float) -> float:
+            probed.set()
+            return 0.01
+
+        pool = EndpointPool([self.US], probe_interval=60, probe=probe)
+        try:
+            self.assertFalse(probed.wait(0.05))
+            pool.route(Endpoints.TOKEN)
+            self.assertTrue(probed.wait(5))
+        finally:
+            pool.close()
+
+    def test_record_when_error_rate_crosses_the_threshold_should_fail_over(self):
+        pool = EndpointPool([self.US, self.EU], max_error_rate=0.5, probe_interval=None,
+                            probe=FakeProbe({self.US: 0.01, self.EU: 0.02}))
+        pool.probe()
+
+        for _ in range(5):
+            pool.record(self.US, 0.01, False)
+
+        self.assertEqual(pool.current, self.EU)
+        self.assertFalse(pool.metrics()[self.US]['healthy'])
+
+    def test_record_when_latency_crosses_the_threshold_should_fail_over(self):
+        pool = EndpointPool([self.US, self.EU], max_latency=0.1, probe_interval=None,
+                            probe=FakeProbe({self.US: 0.01, self.EU: 0.05}))
+        pool.probe()
+
+        for _ in range(20):
+            pool.record(self.US, 1.0, True)
+
+        self.assertEqual(pool.current, self.EU)
+
+    def test_record_should_not_compare_request_latency_with_probe_latency(self):
+        pool = EndpointPool([self.US, self.EU], probe_interval=None,
+                            probe=FakeProbe({self.US: 0.02, self.EU: 0.03}))
+        pool.probe()
+
+        for _ in range(20):
+            pool.record(self.US, 0.2, True)
+        pool.probe()
+
+        self.assertEqual(pool.current, self.US)
+        self.assertEqual(pool.metrics()[self.US]['probe_latency'], 0.02)
+        self.assertAlmostEqual(pool.metrics()[self.US]['request_latency'], 0.2)
+
+    @patch.object(TokenManager, 'get', return_value=TOKEN_VALUES)
+    def test_api_with_endpoints_and_pool_should_route_its_base(self, mock_token_manager_get: Mock):
+        with StubServer() as server:
+            pool = EndpointPool([server.url], probe_interval=None)
+            api = new_api(self, self.CLIENT_ID, self.CLIENT_SECRET,
+                          base_request=BaseRequest(endpoint_pool=pool),
+                          endpoints=Endpoints('https://proxy.internal'))
+
+            self.assertEqual(api.register_login('ANY_REQUEST_TOKEN', 'ANY_ACCOUNT_ID'),
+                             {'risk_assessment': 'low_risk'})
+
+        self.assertEqual(server.requests[0].path, '/api/v2/authentication/transactions')
+
+    def test_post_should_send_to_the_routed_base_and_fail_over_when_it_is_down(self):
+        with StubServer() as server:
+            down = 'http://127.0.0.1:1'
+            pool = EndpointPool([down, server.url], probe_interval=None,
+                                probe=FakeProbe({down: 0.001, server.url: 0.01}))
+            pool.probe()
+            base_request = BaseRequest(timeout=1.0, endpoint_pool=pool)
+
+            for _ in range(4):
+                self.assertRaises(requests.ConnectionError, base_request.post,
+                                  Endpoints.TRANSACTIONS)
+            self.assertEqual(base_request.post(Endpoints.TRANSACTIONS),
+                             {'risk_assessment': 'low_risk'})
+
+        self.assertEqual(pool.current, server.url)
+        self.assertEqual(server.requests[0].path, '/api/v2/authentication/transactions')
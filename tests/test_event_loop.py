@@ -0,0 +1,111 @@
+import asyncio
+import importlib.util
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Final
+from unittest import TestCase, skipUnless
+from unittest.mock import patch, Mock
+
+from incognia.api import IncogniaAPI
+from incognia.base_request import BaseRequest
+from incognia.endpoints import Endpoints
+from incognia.event_loop import EventLoopThread, shared_event_loop
+from incognia.exceptions import IncogniaError
+from incognia.token_manager import TokenValues, TokenManager
+from incognia.transport import Http2Transport
+from tests.helpers import close_shared_api, new_api
+from tests.stub_server import StubServer
+
+HAS_HTTPX: Final[bool] = importlib.util.find_spec('httpx') is not None
+
+
+def _loop_threads() -> int:
+    return sum(thread.name == 'incognia-event-loop' for thread in threading.enumerate())
+
+
+class TestEventLoop(TestCase):
+    CLIENT_ID: Final[str] = 'ANY_ID'
+    CLIENT_SECRET: Final[str] = 'ANY_SECRET'
+    REQUEST_TOKEN: Final[str] = 'ANY_REQUEST_TOKEN'
+    ACCOUNT_ID: Final[str] = 'ANY_ACCOUNT_ID'
+    TOKEN_VALUES: Final[TokenValues] = TokenValues('ACCESS_TOKEN', 'TOKEN_TYPE')
+    PATH: Final[str] = '/api/v2/authentication/transactions'
+
+    def test_run_should_execute_coroutines_on_a_single_loop_thread(self):
+        event_loop = EventLoopThread(name='incognia-test-loop')
+        self.addCleanup(event_loop.close)
+
+        async def thread_name():
+            await asyncio.sleep(0)
+            return threading.current_thread().name
+
+        with ThreadPoolExecutor(8) as executor:
+            names = set(executor.map(lambda _: event_loop.run(thread_name), range(32)))
+
+        self.assertEqual(names, {'incognia-test-loop'})
+
+    def test_run_from_the_loop_thread_should_raise_an_error(self):
+        event_loop = EventLoopThread()
+        self.addCleanup(event_loop.close)
+
+        async def nested():
+            event_loop.run(asyncio.sleep, 0)
+
+        self.assertRaises(IncogniaError, event_loop.run, nested)
+
+    def test_close_should_cancel_pending_calls_and_reject_new_ones(self):
+        event_loop = EventLoopThread()
+        pending = event_loop.submit(asyncio.sleep, 60)
+
+        event_loop.close()
+
+        self.assertTrue(pending.cancelled())
+        self.assertRaises(IncogniaError, event_loop.run, asyncio.sleep, 0)
+
+    @skipUnless(hasattr(os, 'fork'), 'os.fork is not available')
+    def test_shared_event_loop_after_fork_should_be_replaced_in_the_child(self):
+        parent = shared_event_loop()
+        parent.run(asyncio.sleep, 0)
+        read_end, write_end = os.pipe()
+
+        pid = os.fork()
+        if pid == 0:
+            try:
+                child = shared_event_loop()
+                ok = child is not parent and child.run(asyncio.sleep, 0, 'ok') == 'ok'
+                os.write(write_end, b'ok' if ok else b'no')
+            finally:
+                os._exit(0)
+        os.close(write_end)
+        os.waitpid(pid, 0)
+
+        with os.fdopen(read_end, 'rb') as child_output:
+            self.assertEqual(child_output.read(), b'ok')
+        self.assertIs(shared_event_loop(), parent)
+
+    def test_multiplexed_with_green_should_raise_an_error(self):
+        close_shared_api()
+
+        self.assertRaises(IncogniaError, IncogniaAPI, self.CLIENT_ID, self.CLIENT_SECRET,
+                          green=True, multiplexed=True)
+
+    @skipUnless(HAS_HTTPX, 'httpx is not installed')
+    @patch.object(TokenManager, 'get', return_value=TOKEN_VALUES)
+    def test_multiplexed_api_should_share_one_loop_across_sync_callers(
+            self, mock_token_manager_get: Mock):
+        with StubServer(delay=0.05) as server:
+            transport = Http2Transport(max_connections=4)
+            self.addCleanup(transport.close)
+            api = new_api(self, self.CLIENT_ID, self.CLIENT_SECRET,
+                          base_request=BaseRequest(transport=transport),
+                          endpoints=Endpoints(server.url), multiplexed=True)
+
+            with ThreadPoolExecutor(32) as executor:
+                assessments = list(executor.map(
+                    lambda _: api.register_login(self.REQUEST_TOKEN, self.ACCOUNT_ID),
+                    range(64)))
+
+            self.assertEqual(assessments, [{'risk_assessment': 'low_risk'}] * 64)
+            self.assertEqual(_loop_threads(), 1)
+            self.assertLessEqual(server.connections, 4)
@@ -0,0 +1,165 @@
+import threading
+import time
+from typing import Final
+from unittest import TestCase
+from unittest.mock import patch
+
+from incognia.base_request import BaseRequest
+from incognia.exceptions import IncogniaFairShareError
+from incognia.fair_share import FairShareScheduler, current_key, tenant
+from incognia.feedback_dispatcher import FeedbackDispatcher
+from incognia.streaming import stream_transactions
+from incognia.token_manager import TokenValues, TokenManager
+from incognia.transport import Transport, TransportResponse
+from tests.helpers import new_api
+
+
+class KeyRecordingTransport(Transport):
+    def __init__(self, scheduler: FairShareScheduler):
+        self.scheduler = scheduler
+        self.keys = []
+
+    def post(self, url, headers, data, params, timeout, auth):
+        self.keys.extend(key for key, metrics in self.scheduler.metrics()['keys'].items()
+                         if metrics['in_flight'])
+        return TransportResponse(200, {}, b'{"risk_assessment": "low_risk"}')
+
+
+class TestFairShare(TestCase):
+    CLIENT_ID: Final[str] = 'ANY_ID'
+    CLIENT_SECRET: Final[str] = 'ANY_SECRET'
+    REQUEST_TOKEN: Final[str] = 'ANY_REQUEST_TOKEN'
+    ACCOUNT_ID: Final[str] = 'ANY_ACCOUNT_ID'
+    TOKEN_VALUES: Final[TokenValues] = TokenValues('ACCESS_TOKEN', 'TOKEN_TYPE')
+
+    def queue(self, scheduler: FairShareScheduler, keys: list, admitted: list) -> list:
+        threads = []
+        for key in keys:
+            queued = scheduler.metrics()['queued']
+
+            def acquire(key=key):
+                scheduler.acquire(key)
+                admitted.append(key)
+
+            thread = threading.Thread(target=acquire, daemon=True)
+            thread.start()
+            threads.append(thread)
+            while scheduler.metrics()['queued'] == queued:
+                time.sleep(0.001)
+        return threads
+
+    def wait_admitted(self, admitted: list, count: int) -> None:
+        deadline = time.monotonic() + 5
+        while len(admitted) < count and time.monotonic() < deadline:
+            time.sleep(0.001)
+        self.assertEqual(len(admitted), count)
+
+    def test_acquire_should_let_a_single_key_borrow_all_capacity(self):
+        scheduler = FairShareScheduler(capacity=4, block=False)
+
+        for _ in range(4):
+            scheduler.acquire('merchant-a')
+
+        self.assertRaises(IncogniaFairShareError, scheduler.acquire, 'merchant-b')
+        self.assertEqual(scheduler.metrics()['keys']['merchant-a']['in_flight'], 4)
+        self.assertEqual(scheduler.metrics()['keys']['merchant-b']['rejected'], 1)
+
+    def test_release_should_admit_the_key_furthest_below_its_share_first(self):
+        scheduler = FairShareScheduler(capacity=2)
+        scheduler.acquire('burst')
+        scheduler.acquire('burst')
+        admitted = []
+        threads = self.queue(scheduler, ['burst', 'burst', 'burst', 'quiet'], admitted)
+
+        scheduler.release('burst')
+        self.wait_admitted(admitted, 1)
+        scheduler.release('burst')
+        self.wait_admitted(admitted, 2)
+
+        self.assertEqual(admitted, ['quiet', 'burst'])
+        for _ in range(2):
+            scheduler.release('burst')
+        self.wait_admitted(admitted, 4)
+        for thread in threads:
+            thread.join(5)
+
+    def test_release_should_split_capacity_by_weight(self):
+        scheduler = FairShareScheduler(capacity=4, weights={'large': 3})
+        for _ in range(4):
+            scheduler.acquire('holder')
+        admitted = []
+        self.queue(scheduler, ['large'] * 5 + ['small'] * 5, admitted)
+
+        for count in range(1, 5):
+            scheduler.release('holder')
+            self.wait_admitted(admitted, count)
+
+        self.assertEqual(sorted(admitted), ['large', 'large', 'large', 'small'])
+        metrics = scheduler.metrics()['keys']
+        self.assertEqual((metrics['large']['share'], metrics['small']['share']), (3.0, 1.0))
+        self.assertEqual((metrics['large']['queued'], metrics['small']['queued']), (2, 4))
+        self.assertGreater(metrics['small']['mean_wait'], 0)
+        for count in range(5, 11):
+            scheduler.release(admitted[count - 5])
+            self.wait_admitted(admitted, count)
+
+    def test_acquire_when_queue_timeout_expires_should_raise_an_error(self):
+        scheduler = FairShareScheduler(capacity=1, queue_timeout=0.01)
+        scheduler.acquire('merchant-a')
+
+        self.assertRaises(IncogniaFairShareError, scheduler.acquire, 'merchant-b')
+        self.assertEqual(scheduler.metrics()['queued'], 0)
+
+    def test_release_should_forget_idle_keys_above_max_keys(self):
+        scheduler = FairShareScheduler(max_keys=2)
+
+        for key in ('first', 'second', 'third'):
+            scheduler.acquire(key)
+            scheduler.release(key)
+
+        self.assertEqual(list(scheduler.metrics()['keys']), ['second', 'third'])
+
+    def test_post_should_be_keyed_by_the_current_tenant(self):
+        scheduler = FairShareScheduler()
+        transport = KeyRecordingTransport(scheduler)
+        base_request = BaseRequest(transport=transport, fair_share=scheduler)
+
+        with tenant('merchant-a'):
+            base_request.post('https://api.incognia.com/api/v2/feedbacks')
+        base_request.post('https://api.incognia.com/api/v2/feedbacks')
+
+        self.assertEqual(transport.keys, ['merchant-a', None])
+        self.assertEqual(scheduler.in_flight, 0)
+
+    def test_register_login_should_be_keyed_by_account_id_unless_a_tenant_is_set(self):
+        scheduler = FairShareScheduler()
+        transport = KeyRecordingTransport(scheduler)
+
+        with patch.object(TokenManager, 'get', return_value=self.TOKEN_VALUES):
+            api = new_api(self, self.CLIENT_ID, self.CLIENT_SECRET,
+                          base_request=BaseRequest(transport=transport, fair_share=scheduler))
+            api.register_login(self.REQUEST_TOKEN, self.ACCOUNT_ID)
+            with tenant('merchant-a'):
+                api.register_login(self.REQUEST_TOKEN, self.ACCOUNT_ID)
+
+        self.assertEqual(transport.keys, [self.ACCOUNT_ID, 'merchant-a'])
+
+    def test_streaming_and_dispatcher_workers_should_see_the_current_tenant(self):
+        class KeyRecordingAPI:
+            def __init__(self):
+                self.keys = []
+
+            def register_login(self, request_token, account_id):
+                self.keys.append(current_key())
+
+            def register_feedback(self, event, **feedback):
+                self.keys.append(current_key())
+
+        api = KeyRecordingAPI()
+        with tenant('merchant-a'):
+            list(stream_transactions(api, [{'type': 'login', 'request_token': self.REQUEST_TOKEN,
+                                            'account_id': self.ACCOUNT_ID}] * 3, window=2))
+            with FeedbackDispatcher(api, workers=2) as dispatcher:
+                dispatcher.submit('reset', account_id=self.ACCOUNT_ID)
+
+        self.assertEqual(api.keys, ['merchant-a'] * 4)
@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import defaultdict
+from typing import Final
+from unittest import TestCase
+
+from incognia.exceptions import IncogniaError
+from incognia.feedback_dispatcher import FeedbackDispatcher
+from incognia.feedback_events import FeedbackEvents
+from tests.helpers import RecordingAPI
+
+
+class TestFeedbackDispatcher(TestCase):
+    EVENTS: Final[list] = [FeedbackEvents.CHARGEBACK_NOTIFICATION, FeedbackEvents.CHARGEBACK,
+                           FeedbackEvents.RESET]
+
+    def test_submit_should_keep_order_within_a_key_and_run_keys_in_parallel(self):
+        api = RecordingAPI(delay=0.005)
+
+        with FeedbackDispatcher(api, workers=4) as dispatcher:
+            futures = [dispatcher.submit(event, account_id=f'account-{account}')
+                       for event in self.EVENTS for account in range(20)]
+
+        self.assertTrue(all(future.done() for future in futures))
+        self.assertEqual(len(api.calls), 60)
+        for account in range(20):
+            self.assertEqual(api.events(f'account-{account}'), self.EVENTS)
+        self.assertGreater(api.max_active, 1)
+
+    def test_submit_should_report_failures_through_the_future_and_continue(self):
+        api = RecordingAPI()
+
+        with FeedbackDispatcher(api, workers=2, key='installation_id') as dispatcher:
+            failed = dispatcher.submit(FeedbackEvents.CHARGEBACK, account_id='fail',
+                                       installation_id='installation')
+            succeeded = dispatcher.submit(FeedbackEvents.RESET, account_id='account',
+                                          installation_id='installation')
+
+        self.assertRaises(IncogniaError, failed.result)
+        self.assertIsNone(succeeded.result())
+        self.assertEqual(api.events('account'), [FeedbackEvents.RESET])
+
+    def test_submit_with_custom_key_should_partition_by_it(self):
+        api = RecordingAPI()
+
+        with FeedbackDispatcher(api, workers=3, key='installation_id') as dispatcher:
+            for installation in range(10):
+                for event in self.EVENTS:
+                    dispatcher.submit(event, installation_id=f'installation-{installation}',
+                                      account_id=f'account-{installation}')
+
+        workers = defaultdict(set)
+        for call, thread in zip(api.calls, api.threads):
+            workers[call['installation_id']].add(thread)
+        self.assertEqual(len(workers), 10)
+        for installation in range(10):
+            self.assertEqual(len(workers[f'installation-{installation}']), 1)
+            self.assertEqual(api.events(f'account-{installation}'), self.EVENTS)
+        self.assertGreater(len(set(api.threads)), 1)
+
+    def test_submit_racing_with_close_should_resolve_the_accepted_future(self):
+        partitioning, proceed = threading.Event(), threading.Event()
+        futures = []
+
+        def key(feedback):
+            partitioning.set()
+            proceed.wait(5)
+            return feedback['account_id']
+
+        dispatcher = FeedbackDispatcher(RecordingAPI(), workers=1, key=key)
+        submitter = threading.Thread(target=lambda: futures.append(
+            dispatcher.submit(FeedbackEvents.RESET, account_id='account')))
+        submitter.start()
+        partitioning.wait(5)
+        closer = threading.Thread(target=dispatcher.close)
+        closer.start()
+        time.sleep(0.05)
+        proceed.set()
+        submitter.join(5)
+        closer.join(5)
+
+        self.assertIsNone(futures[0].result(timeout=1))
+        self.assertRaises(IncogniaError, dispatcher.submit, FeedbackEvents.RESET)
+
+    def test_submit_when_partition_is_full_and_not_blocking_should_raise_an_error(self):
+        release = threading.Event()
+
+        class BlockedAPI:
+            def register_feedback(self, event, **feedback):
+                release.wait(5)
+
+        dispatcher = FeedbackDispatcher(BlockedAPI(), workers=1, queue_size=1, block=False)
+        try:
+            dispatcher.submit(FeedbackEvents.RESET, account_id='account')
+            time.sleep(0.05)
+            dispatcher.submit(FeedbackEvents.RESET, account_id='account')
+            self.assertRaises(IncogniaError, dispatcher.submit, FeedbackEvents.RESET,
+                              account_id='account')
+        finally:
+            release.set()
+            dispatcher.close()
+
+        self.assertRaises(IncogniaError, dispatcher.submit, FeedbackEvents.RESET)
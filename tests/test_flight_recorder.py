@@ -0,0 +1,125 @@
+import io
+import json
+import os
+import signal
+import threading
+from typing import Final
+from unittest import TestCase, skipUnless
+
+from incognia.base_request import BaseRequest
+from incognia.endpoints import Endpoints
+from incognia.exceptions import IncogniaHTTPError, IncogniaLoadSheddingError
+from incognia.flight_recorder import FlightRecorder
+from incognia.load_shedder import LoadShedder
+from tests.helpers import new_api
+from tests.stub_server import StubServer
+
+
+class TestFlightRecorder(TestCase):
+    CLIENT_ID: Final[str] = 'ANY_ID'
+    CLIENT_SECRET: Final[str] = 'ANY_SECRET'
+    TOKEN_RESPONSE: Final[dict] = {'access_token': 'ACCESS_TOKEN', 'token_type': 'Bearer',
+                                   'expires_in': 900}
+
+    def test_records_should_keep_the_last_exchanges_in_order(self):
+        recorder = FlightRecorder(capacity=3)
+
+        for status in (200, 201, 202, 203, 204):
+            recorder.record(Endpoints.TRANSACTIONS, status, 0.0, 0.5, 1.5, 10, 20)
+
+        records = recorder.records()
+        self.assertEqual([record['status'] for record in records], [202, 203, 204])
+        self.assertEqual(records[0]['queue_time'], 0.5)
+        self.assertEqual(records[0]['duration'], 1.0)
+        self.assertEqual(records[0]['request_bytes'], 10)
+
+    def test_api_requests_should_be_recorded_without_secrets_or_bodies(self):
+        recorder = FlightRecorder()
+        with StubServer(response=self.TOKEN_RESPONSE) as server:
+            api = new_api(self, self.CLIENT_ID, self.CLIENT_SECRET,
+                          base_request=BaseRequest(flight_recorder=recorder),
+                          endpoints=Endpoints(server.url))
+            api.register_login('ANY_REQUEST_TOKEN', 'ANY_ACCOUNT_ID')
+
+        token, login = recorder.records()
+        output = io.StringIO()
+        recorder.dump(output)
+
+        self.assertEqual(token['endpoint'], Endpoints(server.url).TOKEN)
+        self.assertIsNone(token['token_age'])
+        self.assertEqual(login['endpoint'], Endpoints(server.url).TRANSACTIONS)
+        self.assertEqual(login['status'], 200)
+        self.assertEqual(login['request_bytes'], len(server.requests[1].body))
+        self.assertGreaterEqual(login['token_age'], 0)
+        self.assertEqual(len(output.getvalue().splitlines()), 2)
+        for secret in (self.CLIENT_SECRET, 'ACCESS_TOKEN', 'ANY_REQUEST_TOKEN'):
+            self.assertNotIn(secret, output.getvalue())
+
+    def test_dump_on_error_should_dump_once_per_interval(self):
+        output = io.StringIO()
+        recorder = FlightRecorder(dump_on_error=True, output=output)
+        base_request = BaseRequest(flight_recorder=recorder)
+
+        with StubServer(status_code=503) as server:
+            for _ in range(2):
+                self.assertRaises(IncogniaHTTPError, base_request.post,
+                                  f'{server.url}/api/v2/feedbacks')
+
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])['status'], 503)
+
+    def test_rejected_requests_should_be_recorded(self):
+        recorder = FlightRecorder()
+        shedder = LoadShedder(max_in_flight=1, max_queued=0)
+        shedder.acquire(Endpoints.TRANSACTIONS)
+
+        base_request = BaseRequest(load_shedder=shedder, flight_recorder=recorder)
+        self.assertRaises(IncogniaLoadSheddingError, base_request.post, Endpoints.TRANSACTIONS)
+
+        record, = recorder.records()
+        self.assertIsNone(record['status'])
+        self.assertEqual(record['error'], 'IncogniaLoadSheddingError')
+
+    @skipUnless(hasattr(signal, 'SIGUSR1'), 'requires SIGUSR1')
+    def test_dump_signal_should_dump_the_records(self):
+        previous = signal.getsignal(signal.SIGUSR1)
+        self.addCleanup(signal.signal, signal.SIGUSR1, previous)
+        output = io.StringIO()
+        recorder = FlightRecorder(dump_signal=signal.SIGUSR1, output=output)
+        recorder.record(Endpoints.FEEDBACKS, 200, 0.0, 0.0, 0.1)
+
+        os.kill(os.getpid(), signal.SIGUSR1)
+
+        self.assertEqual(json.loads(output.getvalue())['endpoint'], Endpoints.FEEDBACKS)
+
+    @skipUnless(hasattr(signal, 'SIGUSR1'), 'requires SIGUSR1')
+    def test_dump_signal_outside_the_main_thread_should_not_raise(self):
+        previous = signal.getsignal(signal.SIGUSR1)
+        recorders = []
+
+        with self.assertLogs('incognia.flight_recorder', 'WARNING'):
+            thread = threading.Thread(target=lambda: recorders.append(
+                FlightRecorder(dump_signal=signal.SIGUSR1)))
+            thread.start()
+            thread.join()
+
+        self.assertEqual(len(recorders), 1)
+        self.assertIs(signal.getsignal(signal.SIGUSR1), previous)
+
+    def test_concurrent_writers_should_never_produce_torn_records(self):
+        recorder = FlightRecorder(capacity=4)
+
+        def write(status):
+            for _ in range(500):
+                recorder.record(Endpoints.FEEDBACKS, status, 0.0, status, status * 2)
+
+        threads = [threading.Thread(target=write, args=(status,)) for status in range(1, 9)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for record in recorder.records():
+            self.assertEqual((record['queue_time'], record['duration']),
+                             (record['status'], record['status']))
@@ -0,0 +1,47 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import threading
+from typing import Final
+from unittest import TestCase, skipUnless
+from unittest.mock import Mock
+
+from incognia.green import TokenRefresher, cooperative_lock, green_library
+from incognia.token_manager import TokenValues
+
+ROOT: Final[str] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestGreen(TestCase):
+    TOKEN_VALUES: Final[TokenValues] = TokenValues('ACCESS_TOKEN', 'TOKEN_TYPE')
+
+    def test_without_monkey_patching_should_fall_back_to_threads(self):
+        self.assertIsNone(green_library())
+        self.assertIsInstance(cooperative_lock(), type(threading.Lock()))
+
+    def test_token_refresher_should_refresh_in_the_background_until_stopped(self):
+        refreshed = threading.Semaphore(0)
+        token_manager = Mock()
+        token_manager.get.side_effect = lambda: refreshed.release() or self.TOKEN_VALUES
+        token_manager.refresh_due_in.return_value = 0.0
+
+        refresher = TokenRefresher(token_manager, min_interval=0.01)
+        refresher.start()
+        for _ in range(3):
+            self.assertTrue(refreshed.acquire(timeout=5))
+        refresher.stop()
+
+        self.assertGreaterEqual(token_manager.get.call_count, 3)
+
+    @skipUnless(importlib.util.find_spec('gevent') is not None, 'requires gevent')
+    def test_register_login_from_thousands_of_greenlets_should_not_serialize(self):
+        greenlets = 2000
+        result = subprocess.run([sys.executable, os.path.join(ROOT, 'tests', 'green_stress.py'),
+                                 str(greenlets)], capture_output=True, text=True, timeout=120,
+                                env={**os.environ, 'PYTHONPATH': ROOT}, check=True)
+
+        stress = json.loads(result.stdout)
+        self.assertEqual(stress['low_risk'], greenlets)
+        self.assertLess(stress['elapsed'], stress['serial'] / 10)
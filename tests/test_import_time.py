@@ -0,0 +1,30 @@
+import subprocess
+import sys
+from typing import Final, Tuple
+from unittest import TestCase
+
+DEFERRED_MODULES: Final[Tuple[str, ...]] = ('requests', 'urllib3', 'asyncio', 'platform',
+                                            'importlib.metadata', 'email.utils',
+                                            'incognia.http_error')
+
+
+def modules_loaded_by(code: str) -> str:
+    code = (f'import sys; {code}; '
+            f'print(",".join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))')
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            check=True)
+    return result.stdout.strip()
+
+
+class TestImportTime(TestCase):
+    def test_import_should_defer_heavy_modules(self):
+        self.assertEqual(modules_loaded_by('import incognia.api'), '')
+
+    def test_import_of_the_exceptions_should_defer_requests(self):
+        self.assertEqual(modules_loaded_by('from incognia.exceptions import IncogniaError'), '')
+
+    def test_http_error_access_should_import_requests(self):
+        loaded = modules_loaded_by('from incognia.exceptions import IncogniaHTTPError')
+
+        self.assertEqual(loaded.split(',')[0], 'requests')
+        self.assertIn('incognia.http_error', loaded)
@@ -0,0 +1,64 @@
+from typing import Final
+from unittest import TestCase
+from unittest.mock import patch, Mock
+
+from incognia.api import IncogniaAPI
+from incognia.base_request import BaseRequest
+from incognia.json_util import encode, RawJSON, FragmentCache
+from incognia.token_manager import TokenValues, TokenManager
+
+
+class TestJsonUtil(TestCase):
+    CLIENT_ID: Final[str] = 'ANY_ID'
+    CLIENT_SECRET: Final[str] = 'ANY_SECRET'
+    REQUEST_TOKEN: Final[str] = 'ANY_REQUEST_TOKEN'
+    ACCOUNT_ID: Final[str] = 'ANY_ACCOUNT_ID'
+    TOKEN_VALUES: Final[TokenValues] = TokenValues('ACCESS_TOKEN', 'TOKEN_TYPE')
+    CUSTOM_PROPERTIES: Final[dict] = {
+        'store': 'São Paulo',
+        'tags': ['a', 'b'],
+        'nested': {'value': 1.5, 'empty': None},
+    }
+
+    def test_encode_should_skip_top_level_none_values(self):
+        self.assertEqual(encode({'a': 1, 'b': None}), b'{"a": 1}')
+
+    def test_encode_should_splice_raw_json_at_any_depth(self):
+        raw = RawJSON.of(self.CUSTOM_PROPERTIES)
+        expected = encode({'top': self.CUSTOM_PROPERTIES,
+                           'nested': [{'value': self.CUSTOM_PROPERTIES}]})
+
+        self.assertEqual(encode({'top': raw, 'nested': [{'value': raw}]}), expected)
+
+    def test_raw_json_should_accept_bytes(self):
+        self.assertEqual(RawJSON(b'{"a": 1}'), RawJSON('{"a": 1}'))
+
+    def test_encode_with_unknown_types_should_raise_a_TypeError(self):
+        self.assertRaises(TypeError, encode, {'a': object()})
+
+    def test_fragment_cache_should_reuse_fragments_and_evict_the_least_recently_used(self):
+        cache = FragmentCache(maxsize=2)
+
+        first = cache.get(self.CUSTOM_PROPERTIES, key='store-1')
+        self.assertIs(cache.get(self.CUSTOM_PROPERTIES, key='store-1'), first)
+        cache.get(('b', 1))
+        cache.get(('c', 2))
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+        self.assertIsNot(cache.get(self.CUSTOM_PROPERTIES, key='store-1'), first)
+
+    @patch.object(BaseRequest, 'post')
+    @patch.object(TokenManager, 'get', return_value=TOKEN_VALUES)
+    def test_register_login_with_raw_json_should_send_the_same_body_as_dicts(
+            self, mock_token_manager_get: Mock, mock_base_request_post: Mock):
+        api = IncogniaAPI(self.CLIENT_ID, self.CLIENT_SECRET)
+        api.register_login(self.REQUEST_TOKEN, self.ACCOUNT_ID,
+                           custom_properties=self.CUSTOM_PROPERTIES)
+        dict_call = mock_base_request_post.call_args
+
+        api.register_login(self.REQUEST_TOKEN, self.ACCOUNT_ID,
+                           custom_properties=RawJSON.of(self.CUSTOM_PROPERTIES))
+
+        mock_token_manager_get.assert_called()
+        self.assertEqual(mock_base_request_post.call_args, dict_call)
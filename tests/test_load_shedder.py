@@ -0,0 +1,77 @@
+import threading
+from typing import Final
+from unittest import TestCase
+from unittest.mock import patch, Mock
+
+import requests
+
+from incognia.base_request import BaseRequest
+from incognia.endpoints import Endpoints
+from incognia.exceptions import IncogniaLoadSheddingError
+from incognia.load_shedder import LoadShedder
+
+
+class TestLoadShedder(TestCase):
+    URL: Final[str] = Endpoints.TRANSACTIONS
+
+    def test_acquire_when_queue_is_full_should_shed_immediately(self):
+        shedder = LoadShedder(max_in_flight=1, max_queued=0)
+
+        shedder.acquire(self.URL)
+
+        self.assertRaises(IncogniaLoadSheddingError, shedder.acquire, self.URL)
+        self.assertEqual(shedder.shed, 1)
+        self.assertEqual(shedder.metrics()[self.URL],
+                         {'in_flight': 1, 'queued': 0, 'admitted': 1, 'shed_queue_full': 1,
+                          'shed_deadline': 0})
+
+    def test_acquire_when_queue_deadline_expires_should_shed_the_request(self):
+        shedder = LoadShedder(max_in_flight=1, max_queued=1, queue_deadline=0.01)
+
+        shedder.acquire(self.URL)
+
+        self.assertRaises(IncogniaLoadSheddingError, shedder.acquire, self.URL)
+        self.assertEqual(shedder.metrics()[self.URL]['shed_deadline'], 1)
+        self.assertEqual(shedder.metrics()[self.URL]['queued'], 0)
+
+    def test_acquire_should_admit_a_queued_request_when_a_slot_is_released(self):
+        shedder = LoadShedder(max_in_flight=1, max_queued=1, queue_deadline=5)
+        shedder.acquire(self.URL)
+        admitted = threading.Event()
+
+        def acquire():
+            shedder.acquire(self.URL)
+            admitted.set()
+
+        thread = threading.Thread(target=acquire)
+        thread.start()
+        self.assertFalse(admitted.wait(0.05))
+        shedder.release(self.URL)
+        thread.join(5)
+
+        self.assertTrue(admitted.is_set())
+        self.assertEqual(shedder.shed, 0)
+
+    def test_acquire_should_apply_limits_per_endpoint(self):
+        shedder = LoadShedder(max_in_flight=1, max_queued=0,
+                              endpoint_limits={Endpoints.FEEDBACKS: (2, 0, None)})
+
+        shedder.acquire(self.URL)
+        shedder.acquire(Endpoints.FEEDBACKS)
+        shedder.acquire(Endpoints.FEEDBACKS)
+
+        self.assertRaises(IncogniaLoadSheddingError, shedder.acquire, Endpoints.FEEDBACKS)
+        self.assertRaises(IncogniaLoadSheddingError, shedder.acquire, self.URL)
+
+    @patch('requests.post')
+    def test_post_should_release_the_admission_slot_after_the_request(
+            self, mock_requests_post: Mock):
+        response = requests.Response()
+        response._content, response.status_code = b'', 503
+        mock_requests_post.configure_mock(return_value=response)
+        shedder = LoadShedder(max_in_flight=1, max_queued=0)
+
+        base_request = BaseRequest(load_shedder=shedder)
+
+        self.assertRaises(requests.HTTPError, base_request.post, url=self.URL)
+        self.assertEqual(shedder.metrics()[self.URL]['in_flight'], 0)
@@ -0,0 +1,87 @@
+import asyncio
+from typing import Final
+from unittest import TestCase
+from unittest.mock import patch, Mock
+
+import requests
+
+from incognia.base_request import BaseRequest
+from incognia.exceptions import IncogniaRateLimitError, IncogniaHTTPError
+from incognia.rate_limiter import RateLimiter, TokenBucket, parse_retry_after
+from tests.helpers import FakeClock
+
+
+class TestRateLimiter(TestCase):
+    ENDPOINT: Final[str] = 'https://some-valid-link.com/api/v2/feedbacks'
+    OTHER_ENDPOINT: Final[str] = 'https://some-valid-link.com/api/v2/authentication/transactions'
+
+    def test_acquire_when_burst_is_exhausted_and_not_blocking_should_raise_an_error(self):
+        clock = FakeClock(100.0)
+        limiter = RateLimiter(rate=10, burst=2, block=False, clock=clock)
+
+        limiter.acquire(self.ENDPOINT)
+        limiter.acquire(self.ENDPOINT)
+
+        self.assertRaises(IncogniaRateLimitError, limiter.acquire, self.ENDPOINT)
+        limiter.acquire(self.OTHER_ENDPOINT)
+        clock.sleep(0.2)
+        limiter.acquire(self.ENDPOINT)
+
+    def test_acquire_when_blocking_should_wait_for_the_next_token(self):
+        clock = FakeClock(100.0)
+        limiter = RateLimiter(rate=4, burst=1, clock=clock)
+
+        with patch('incognia.rate_limiter.time.sleep', side_effect=clock.sleep):
+            limiter.acquire(self.ENDPOINT)
+            limiter.acquire(self.ENDPOINT)
+
+        self.assertAlmostEqual(clock.now, 100.25)
+
+    def test_acquire_when_wait_exceeds_timeout_should_raise_an_error(self):
+        limiter = RateLimiter(rate=1, burst=1, timeout=0.5, clock=FakeClock(100.0))
+
+        limiter.acquire(self.ENDPOINT)
+
+        self.assertRaises(IncogniaRateLimitError, limiter.acquire, self.ENDPOINT)
+
+    def test_acquire_async_should_wait_for_the_next_token(self):
+        limiter = RateLimiter(rate=100, burst=1)
+
+        async def acquire_twice():
+            await limiter.acquire_async(self.ENDPOINT)
+            await limiter.acquire_async(self.ENDPOINT)
+
+        asyncio.run(acquire_twice())
+
+    def test_throttle_should_slow_down_honor_retry_after_and_recover_gradually(self):
+        clock = FakeClock(100.0)
+        bucket = TokenBucket(rate=10, burst=10, recovery_seconds=10, clock=clock)
+
+        bucket.throttle(retry_after=2)
+        self.assertEqual(bucket.rate, 5)
+        self.assertAlmostEqual(bucket.try_acquire(), 2)
+
+        clock.sleep(5)
+        self.assertEqual(bucket.try_acquire(), 0)
+        self.assertAlmostEqual(bucket.rate, 10)
+
+    def test_parse_retry_after_should_accept_seconds_and_http_dates(self):
+        self.assertEqual(parse_retry_after('3'), 3.0)
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+        self.assertIsNone(parse_retry_after('soon'))
+        self.assertIsNone(parse_retry_after(None))
+
+    @patch('requests.post')
+    def test_post_when_response_is_429_should_throttle_the_endpoint(
+            self, mock_requests_post: Mock):
+        response = requests.Response()
+        response._content, response.status_code = b'', 429
+        response.headers['Retry-After'] = '30'
+        mock_requests_post.configure_mock(return_value=response)
+        limiter = RateLimiter(rate=10, burst=10, block=False)
+
+        base_request = BaseRequest(rate_limiter=limiter)
+
+        self.assertRaises(IncogniaHTTPError, base_request.post, url=self.ENDPOINT)
+        self.assertRaises(IncogniaRateLimitError, base_request.post, url=self.ENDPOINT)
+        mock_requests_post.assert_called_once()
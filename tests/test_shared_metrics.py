@@ -0,0 +1,127 @@
+import os
+import tempfile
+import threading
+from typing import Final
+from unittest import TestCase, skipUnless
+
+from incognia.base_request import BaseRequest
+from incognia.endpoints import Endpoints
+from incognia.exceptions import IncogniaLoadSheddingError
+from incognia.load_shedder import LoadShedder
+from incognia.shared_metrics import SharedMetrics
+from tests.stub_server import StubServer
+
+
+@skipUnless(os.name == 'posix', 'requires POSIX shared memory and record locks')
+class TestSharedMetrics(TestCase):
+    BUCKETS: Final[tuple] = (0.1, 1.0)
+
+    def test_snapshot_should_aggregate_outcomes_and_latencies_per_endpoint(self):
+        metrics = SharedMetrics(slots=4, buckets=self.BUCKETS)
+
+        metrics.observe(Endpoints.TRANSACTIONS, 200, 0.05)
+        metrics.observe(Endpoints.TRANSACTIONS, 503, 0.5)
+        metrics.observe(Endpoints.TRANSACTIONS, None, 2.0)
+        metrics.observe(f'{Endpoints.FEEDBACKS}?dry_run=true', 400, 0.05)
+        metrics.observe('https://other.example', None, 0.0, rejected=True)
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['transactions']['requests'],
+                         {'success': 1, 'client_error': 0, 'server_error': 1,
+                          'transport_error': 1, 'rejected': 0})
+        self.assertEqual(list(snapshot['transactions']['duration_buckets'].values()), [1, 1, 1])
+        self.assertAlmostEqual(snapshot['transactions']['duration_sum'], 2.55)
+        self.assertEqual(snapshot['feedbacks']['requests']['client_error'], 1)
+        self.assertEqual(snapshot['other']['requests']['rejected'], 1)
+        self.assertEqual(sum(snapshot['other']['duration_buckets'].values()), 0)
+
+    @skipUnless(hasattr(os, 'fork'), 'requires fork')
+    def test_forked_workers_should_share_counters_and_be_cleaned_up_when_dead(self):
+        metrics = SharedMetrics(slots=8, buckets=self.BUCKETS)
+        metrics.observe(Endpoints.TRANSACTIONS, 200, 0.01)
+
+        children = []
+        for _ in range(3):
+            pid = os.fork()
+            if pid == 0:
+                try:
+                    for _ in range(10):
+                        metrics.observe(Endpoints.TRANSACTIONS, 200, 0.01)
+                finally:
+                    os._exit(0)
+            children.append(pid)
+        for pid in children:
+            os.waitpid(pid, 0)
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['transactions']['requests']['success'], 31)
+        self.assertEqual(metrics.workers(), [os.getpid()])
+
+    def test_slots_of_finished_threads_should_be_retired_and_reused(self):
+        metrics = SharedMetrics(slots=2, buckets=self.BUCKETS)
+
+        for _ in range(3):
+            thread = threading.Thread(target=metrics.observe,
+                                      args=(Endpoints.SIGNUPS, 200, 0.01))
+            thread.start()
+            thread.join()
+
+        self.assertEqual(metrics.snapshot()['signups']['requests']['success'], 3)
+        self.assertEqual(metrics.workers(), [])
+
+    def test_observe_when_every_slot_is_in_use_should_drop_the_sample(self):
+        metrics = SharedMetrics(slots=2, buckets=self.BUCKETS)
+        metrics.observe(Endpoints.SIGNUPS, 200, 0.01)
+
+        with self.assertLogs('incognia.shared_metrics', 'WARNING'):
+            thread = threading.Thread(target=metrics.observe,
+                                      args=(Endpoints.SIGNUPS, 200, 0.01))
+            thread.start()
+            thread.join()
+
+        self.assertEqual(metrics.snapshot()['signups']['requests']['success'], 1)
+        self.assertEqual(metrics.dropped, 1)
+        self.assertIn('incognia_metrics_dropped_total 1\n', metrics.exposition())
+
+    def test_instances_on_the_same_file_should_see_each_other(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'metrics')
+            writer = SharedMetrics(path, slots=4, buckets=self.BUCKETS)
+            reader = SharedMetrics(path, slots=4, buckets=self.BUCKETS)
+
+            writer.observe(Endpoints.TOKEN, 200, 0.01)
+
+            self.assertEqual(reader.snapshot()['token']['requests']['success'], 1)
+            self.assertRaises(ValueError, SharedMetrics, path, slots=8)
+            writer.close()
+            reader.close()
+
+    def test_exposition_should_render_prometheus_counters_and_histograms(self):
+        metrics = SharedMetrics(slots=4, buckets=self.BUCKETS)
+        metrics.observe(Endpoints.TRANSACTIONS, 200, 0.5)
+
+        exposition = metrics.exposition()
+
+        self.assertIn('incognia_requests_total{endpoint="transactions",outcome="success"} 1\n',
+                      exposition)
+        self.assertIn('incognia_request_duration_seconds_bucket'
+                      '{endpoint="transactions",le="0.1"} 0\n', exposition)
+        self.assertIn('incognia_request_duration_seconds_bucket'
+                      '{endpoint="transactions",le="+Inf"} 1\n', exposition)
+        self.assertIn('incognia_request_duration_seconds_count{endpoint="transactions"} 1\n',
+                      exposition)
+
+    def test_post_should_record_exchanges_and_rejections(self):
+        metrics = SharedMetrics(slots=4)
+        shedder = LoadShedder(max_in_flight=1, max_queued=0)
+
+        with StubServer() as server:
+            base_request = BaseRequest(metrics=metrics, load_shedder=shedder)
+            base_request.post(f'{server.url}/api/v2/authentication/transactions')
+            shedder.acquire(Endpoints.TRANSACTIONS)
+            self.assertRaises(IncogniaLoadSheddingError, base_request.post,
+                              Endpoints.TRANSACTIONS)
+
+        requests = metrics.snapshot()['transactions']['requests']
+        self.assertEqual(requests['success'], 1)
+        self.assertEqual(requests['rejected'], 1)
@@ -0,0 +1,88 @@
+import json
+from typing import Final
+from unittest import TestCase
+from unittest.mock import patch, Mock
+
+from incognia.api import IncogniaAPI
+from incognia.base_request import BaseRequest
+from incognia.exceptions import IncogniaError
+from incognia.streaming import stream_transactions
+from incognia.token_manager import TokenValues, TokenManager
+from tests.helpers import RecordingAPI
+
+
+def transactions(count: int, pulled: list):
+    for index in range(count):
+        pulled.append(index)
+        yield {'type': 'payment' if index % 2 else 'login', 'request_token': 'token',
+               'account_id': f'account-{index}'}
+
+
+class TestStreaming(TestCase):
+    CLIENT_ID: Final[str] = 'ANY_ID'
+    CLIENT_SECRET: Final[str] = 'ANY_SECRET'
+    TOKEN_VALUES: Final[TokenValues] = TokenValues('ACCESS_TOKEN', 'TOKEN_TYPE')
+    ASSESSMENT: Final[dict] = {'risk_assessment': 'low_risk'}
+
+    def test_stream_when_ordered_should_yield_results_in_input_order(self):
+        api = RecordingAPI(delay=0.005)
+
+        results = list(stream_transactions(api, transactions(100, []), window=8))
+
+        self.assertEqual([result.index for result in results], list(range(100)))
+        self.assertEqual([result.assessment['account_id'] for result in results],
+                         [f'account-{index}' for index in range(100)])
+        self.assertEqual(results[1].assessment['type'], 'payment')
+        self.assertGreater(api.max_active, 1)
+        self.assertLessEqual(api.max_active, 8)
+
+    def test_stream_when_unordered_should_yield_every_result(self):
+        results = list(stream_transactions(RecordingAPI(delay=0.005), transactions(50, []),
+                                           window=8, ordered=False))
+
+        self.assertEqual(sorted(result.index for result in results), list(range(50)))
+
+    def test_stream_should_only_pull_from_the_source_as_the_window_frees_up(self):
+        pulled = []
+        results = stream_transactions(RecordingAPI(), transactions(1000, pulled), window=4)
+
+        for _ in range(10):
+            next(results)
+            self.assertLessEqual(len(pulled), 10 + 4)
+        results.close()
+
+        self.assertLess(len(pulled), 20)
+
+    def test_stream_should_report_errors_per_transaction_and_continue(self):
+        items = [{'type': 'login', 'request_token': 'token', 'account_id': 'fail'},
+                 {'type': 'signup', 'request_token': 'token', 'account_id': 'account'},
+                 {'type': 'login', 'request_token': 'token', 'account_id': 'account'}]
+
+        results = list(stream_transactions(RecordingAPI(), items))
+
+        self.assertIsInstance(results[0].error, IncogniaError)
+        self.assertIsInstance(results[1].error, IncogniaError)
+        self.assertIsNone(results[2].error)
+        self.assertEqual(results[2].assessment, {'type': 'login', 'account_id': 'account'})
+        self.assertIs(results[1].transaction, items[1])
+
+    def test_stream_with_invalid_window_should_raise_an_error(self):
+        self.assertRaises(ValueError, stream_transactions, RecordingAPI(), [], window=0)
+
+    @patch.object(BaseRequest, 'post')
+    @patch.object(TokenManager, 'get', return_value=TOKEN_VALUES)
+    def test_stream_transactions_should_validate_encode_and_post_each_transaction(
+            self, mock_token_manager_get: Mock, mock_base_request_post: Mock):
+        mock_base_request_post.configure_mock(return_value=self.ASSESSMENT)
+        api = IncogniaAPI(self.CLIENT_ID, self.CLIENT_SECRET)
+
+        results = list(api.stream_transactions(transactions(3, []), window=2))
+        invalid = next(api.stream_transactions(
+            [{'type': 'login', 'request_token': 'token', 'account_id': ''}]))
+
+        self.assertEqual([result.assessment for result in results], [self.ASSESSMENT] * 3)
+        self.assertEqual(mock_base_request_post.call_count, 3)
+        bodies = sorted(json.loads(call.kwargs['data'])['account_id']
+                        for call in mock_base_request_post.call_args_list)
+        self.assertEqual(bodies, ['account-0', 'account-1', 'account-2'])
+        self.assertIsInstance(invalid.error, IncogniaError)
@@ -1,12 +1,16 @@
 import base64
+import threading
 from typing import Final
 from unittest import TestCase
 from unittest.mock import Mock, patch
 
+import requests
+
 from incognia.base_request import BaseRequest
 from incognia.endpoints import Endpoints
 from incognia.exceptions import IncogniaHTTPError
 from incognia.token_manager import TokenManager, TokenValues
+from tests.helpers import FakeClock
 
 
 class TestTokenManager(TestCase):
@@ -74,3 +78,96 @@ class TestTokenManager(TestCase):
 
         self.assertEqual(first_token_values, self.SHORT_EXPIRATION_TOKEN_VALUES)
         self.assertEqual(second_token_values, self.TOKEN_VALUES)
+
+    @patch.object(BaseRequest, 'post')
+    def test_get_when_refresh_raises_should_release_the_lock(self, mock_requests_post: Mock):
+        clock = FakeClock()
+        mock_requests_post.configure_mock(side_effect=requests.ConnectionError)
+
+        token_manager = TokenManager(self.CLIENT_ID, self.CLIENT_SECRET, clock=clock)
+        self.assertRaises(requests.ConnectionError, token_manager.get)
+
+        clock.now += 1
+        mock_requests_post.configure_mock(side_effect=None, return_value=self.JSON_POST_RESPONSE)
+        self.assertEqual(token_manager.get(), self.TOKEN_VALUES)
+
+    @patch.object(BaseRequest, 'post')
+    def test_get_after_a_failed_refresh_should_back_off_exponentially(
+            self, mock_requests_post: Mock):
+        clock = FakeClock()
+        mock_requests_post.configure_mock(side_effect=IncogniaHTTPError)
+
+        token_manager = TokenManager(self.CLIENT_ID, self.CLIENT_SECRET,
+                                     failure_backoff_seconds=1.0, clock=clock)
+        self.assertRaises(IncogniaHTTPError, token_manager.get)
+        self.assertRaises(IncogniaHTTPError, token_manager.get)
+        self.assertEqual(mock_requests_post.call_count, 1)
+
+        clock.now = 1.0
+        self.assertRaises(IncogniaHTTPError, token_manager.get)
+        clock.now = 2.5
+        self.assertRaises(IncogniaHTTPError, token_manager.get)
+        self.assertEqual(mock_requests_post.call_count, 2)
+
+        clock.now = 3.0
+        self.assertRaises(IncogniaHTTPError, token_manager.get)
+        self.assertEqual(mock_requests_post.call_count, 3)
+
+    @patch.object(BaseRequest, 'post')
+    def test_get_when_refresh_fails_should_serve_the_still_valid_token(
+            self, mock_requests_post: Mock):
+        clock = FakeClock()
+        mock_requests_post.configure_mock(return_value=self.JSON_POST_RESPONSE)
+
+        token_manager = TokenManager(self.CLIENT_ID, self.CLIENT_SECRET, clock=clock)
+        token_manager.get()
+
+        clock.now = 895
+        mock_requests_post.configure_mock(side_effect=IncogniaHTTPError)
+        self.assertEqual(token_manager.get(), self.TOKEN_VALUES)
+        self.assertEqual(token_manager.get(), self.TOKEN_VALUES)
+        self.assertEqual(mock_requests_post.call_count, 2)
+
+        clock.now = 899.5
+        self.assertRaises(IncogniaHTTPError, token_manager.get)
+
+    @patch.object(BaseRequest, 'post')
+    def test_get_should_refresh_ahead_by_the_configured_margin(self, mock_requests_post: Mock):
+        clock = FakeClock()
+        mock_requests_post.configure_mock(return_value=self.JSON_POST_RESPONSE)
+
+        token_manager = TokenManager(self.CLIENT_ID, self.CLIENT_SECRET,
+                                     refresh_before_seconds=100, clock=clock)
+        token_manager.get()
+        clock.now = 799
+        token_manager.get()
+        self.assertEqual(mock_requests_post.call_count, 1)
+
+        clock.now = 800
+        token_manager.get()
+        self.assertEqual(mock_requests_post.call_count, 2)
+
+    @patch.object(BaseRequest, 'post')
+    def test_get_during_a_refresh_ahead_should_not_wait_for_it(self, mock_requests_post: Mock):
+        clock = FakeClock()
+        mock_requests_post.configure_mock(return_value=self.JSON_POST_RESPONSE)
+        token_manager = TokenManager(self.CLIENT_ID, self.CLIENT_SECRET, clock=clock)
+        token_manager.get()
+        refreshing, release = threading.Event(), threading.Event()
+
+        def slow_refresh(**kwargs):
+            refreshing.set()
+            release.wait(5)
+            return self.JSON_POST_RESPONSE
+
+        clock.now = 895
+        mock_requests_post.configure_mock(side_effect=slow_refresh)
+        refresher = threading.Thread(target=token_manager.get)
+        refresher.start()
+        refreshing.wait(5)
+
+        self.assertEqual(token_manager.get(), self.TOKEN_VALUES)
+        self.assertTrue(refresher.is_alive())
+        release.set()
+        refresher.join(5)
+        self.assertFalse(refresher.is_alive())
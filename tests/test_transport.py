@@ -0,0 +1,147 @@
+import asyncio
+import base64
+import importlib.util
+import json
+import socket
+import sys
+from typing import Final
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
+
+import requests
+
+from incognia.base_request import BaseRequest, USER_AGENT_HEADER
+from incognia.exceptions import IncogniaHTTPError
+from incognia.transport import (
+    Transport,
+    TransportResponse,
+    Urllib3Transport,
+    Http2Transport,
+    AsyncHttp2Transport,
+)
+from tests.stub_server import StubServer
+
+
+class RecordingTransport(Transport):
+    def __init__(self, response: TransportResponse):
+        self.response = response
+        self.calls = []
+
+    def post(self, url, headers, data, params, timeout, auth):
+        self.calls.append((url, dict(headers), data, params, timeout, auth))
+        return self.response
+
+
+HAS_HTTPX: Final[bool] = importlib.util.find_spec('httpx') is not None
+
+
+class TestTransport(TestCase):
+    PATH: Final[str] = '/api/v2/authentication/transactions'
+    JSON_RESPONSE: Final[dict] = {'risk_assessment': 'low_risk'}
+    DATA: Final[bytes] = b'{"type": "login"}'
+
+    def test_post_with_a_custom_transport_should_use_it(self):
+        transport = RecordingTransport(
+            TransportResponse(200, {}, json.dumps(self.JSON_RESPONSE).encode('utf-8')))
+
+        base_request = BaseRequest(transport=transport)
+        result = base_request.post('https://any.url', data=self.DATA)
+
+        self.assertEqual(result, self.JSON_RESPONSE)
+        self.assertEqual(transport.calls, [('https://any.url', USER_AGENT_HEADER, self.DATA,
+                                            None, base_request.timeout(), None)])
+
+    def test_post_with_a_custom_transport_and_error_status_should_raise_an_IncogniaHTTPError(
+            self):
+        transport = RecordingTransport(TransportResponse(404, {}, b''))
+
+        with self.assertRaises(IncogniaHTTPError) as context:
+            BaseRequest(transport=transport).post('https://any.url')
+
+        self.assertEqual(context.exception.response.status_code, 404)
+
+    def test_transport_without_post_should_not_be_instantiable(self):
+        class IncompleteTransport(Transport):
+            pass
+
+        self.assertRaises(TypeError, IncompleteTransport)
+
+    def test_urllib3_transport_should_post_body_params_and_basic_auth(self):
+        with StubServer(response=self.JSON_RESPONSE) as server:
+            base_request = BaseRequest(transport=Urllib3Transport())
+            result = base_request.post(f'{server.url}{self.PATH}', data=self.DATA,
+                                       params={'eval': False}, auth=('id', 'secret'))
+
+        self.assertEqual(result, self.JSON_RESPONSE)
+        request = server.requests[0]
+        self.assertEqual(request.path, f'{self.PATH}?eval=False')
+        self.assertEqual(request.body, self.DATA)
+        self.assertEqual(request.headers['Authorization'],
+                         f'Basic {base64.b64encode(b"id:secret").decode("ascii")}')
+        self.assertEqual(request.headers['User-Agent'], USER_AGENT_HEADER['User-Agent'])
+
+    def test_urllib3_transport_when_status_is_an_error_should_raise_an_IncogniaHTTPError(self):
+        with StubServer(status_code=400) as server:
+            base_request = BaseRequest(transport=Urllib3Transport())
+            with self.assertRaises(IncogniaHTTPError) as context:
+                base_request.post(f'{server.url}{self.PATH}')
+
+        self.assertEqual(str(context.exception),
+                         f'400 Client Error: Bad Request for url: {server.url}{self.PATH}')
+
+    def test_post_when_status_is_an_error_should_keep_the_requests_error_message(self):
+        with StubServer(status_code=503) as server:
+            with self.assertRaises(requests.HTTPError) as context:
+                BaseRequest().post(f'{server.url}{self.PATH}')
+
+        self.assertIsInstance(context.exception, IncogniaHTTPError)
+        self.assertEqual(
+            str(context.exception),
+            f'503 Server Error: Service Unavailable for url: {server.url}{self.PATH}')
+
+    def test_urllib3_transport_when_connection_fails_should_raise_a_ConnectionError(self):
+        with socket.socket() as unused:
+            unused.bind(('127.0.0.1', 0))
+            port = unused.getsockname()[1]
+
+        base_request = BaseRequest(transport=Urllib3Transport())
+
+        self.assertRaises(requests.ConnectionError, base_request.post,
+                          f'http://127.0.0.1:{port}{self.PATH}')
+
+    @skipUnless(HAS_HTTPX, 'httpx is not installed')
+    def test_http2_transport_should_fall_back_to_http1_servers(self):
+        with StubServer(response=self.JSON_RESPONSE) as server:
+            transport = Http2Transport()
+            result = BaseRequest(transport=transport).post(f'{server.url}{self.PATH}',
+                                                           data=self.DATA,
+                                                           params={'eval': False})
+            transport.close()
+
+        self.assertEqual(result, self.JSON_RESPONSE)
+        self.assertEqual(server.requests[0].path, f'{self.PATH}?eval=False')
+        self.assertEqual(server.requests[0].body, self.DATA)
+
+    def test_http2_transport_without_httpx_should_fall_back_to_urllib3(self):
+        with patch.dict(sys.modules, {'httpx': None}), \
+                StubServer(response=self.JSON_RESPONSE) as server:
+            result = BaseRequest(transport=Http2Transport()).post(f'{server.url}{self.PATH}')
+
+        self.assertEqual(result, self.JSON_RESPONSE)
+
+    @skipUnless(HAS_HTTPX, 'httpx is not installed')
+    def test_async_http2_transport_should_post_concurrently(self):
+        async def post_many(url):
+            transport = AsyncHttp2Transport()
+            try:
+                return await asyncio.gather(*(
+                    transport.post(url, USER_AGENT_HEADER, self.DATA, None, 5.0, None)
+                    for _ in range(5)))
+            finally:
+                await transport.close()
+
+        with StubServer(response=self.JSON_RESPONSE) as server:
+            responses = asyncio.run(post_many(f'{server.url}{self.PATH}'))
+
+        self.assertEqual([response.status_code for response in responses], [200] * 5)
+        self.assertEqual(len(server.requests), 5)
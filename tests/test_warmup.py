@@ -0,0 +1,92 @@
+import asyncio
+import importlib.util
+import sys
+import threading
+import time
+from typing import Final
+from unittest import TestCase, skipUnless
+from unittest.mock import patch, Mock
+
+from incognia.api import IncogniaAPI
+from incognia.base_request import BaseRequest
+from incognia.endpoints import Endpoints
+from incognia.token_manager import TokenValues, TokenManager
+from incognia.transport import Http2Transport, RequestsTransport, Urllib3Transport
+from tests.stub_server import StubServer
+
+
+class TestWarmup(TestCase):
+    CLIENT_ID: Final[str] = 'ANY_ID'
+    CLIENT_SECRET: Final[str] = 'ANY_SECRET'
+    TOKEN_VALUES: Final[TokenValues] = TokenValues('ACCESS_TOKEN', 'TOKEN_TYPE')
+    PATH: Final[str] = '/api/v2/authentication/transactions'
+
+    def test_urllib3_transport_warmup_should_open_pooled_connections_once(self):
+        with StubServer() as server:
+            transport = Urllib3Transport(maxsize=3)
+
+            self.assertEqual(transport.warmup(server.url, 5, 1.0), 3)
+            self.assertEqual(transport.warmup(server.url, 5, 1.0), 0)
+            BaseRequest(transport=transport).post(f'{server.url}{self.PATH}')
+
+            self.assertEqual(server.connections, 3)
+
+    @skipUnless(importlib.util.find_spec('httpx') is not None, 'httpx is not installed')
+    def test_http2_transport_warmup_should_open_connections_through_its_client(self):
+        with StubServer() as server:
+            transport = Http2Transport()
+            try:
+                self.assertEqual(transport.warmup(server.url, 2, 1.0), 2)
+                BaseRequest(transport=transport).post(f'{server.url}{self.PATH}')
+            finally:
+                transport.close()
+
+            self.assertGreaterEqual(server.connections, 1)
+            self.assertLessEqual(server.connections, 2)
+
+    def test_http2_transport_warmup_without_httpx_should_delegate_to_urllib3(self):
+        with patch.dict(sys.modules, {'httpx': None}), StubServer() as server:
+            transport = Http2Transport()
+
+            self.assertEqual(transport.warmup(server.url, 2, 1.0), 2)
+            self.assertEqual(server.connections, 2)
+
+    def test_requests_transport_warmup_should_only_resolve_dns(self):
+        with StubServer() as server:
+            self.assertEqual(RequestsTransport().warmup(server.url, 5, 1.0), 0)
+
+            self.assertEqual(server.connections, 0)
+
+    @patch.object(BaseRequest, 'warmup', return_value=2)
+    @patch.object(TokenManager, 'get', return_value=TOKEN_VALUES)
+    def test_warmup_should_fetch_the_token_and_open_connections(
+            self, mock_token_manager_get: Mock, mock_base_request_warmup: Mock):
+        api = IncogniaAPI(self.CLIENT_ID, self.CLIENT_SECRET)
+
+        self.assertEqual(api.warmup(connections=2), 2)
+        self.assertEqual(asyncio.run(api.warmup_async(connections=2)), 2)
+
+        mock_token_manager_get.assert_called()
+        mock_base_request_warmup.assert_called_with(Endpoints.BASE, 2)
+
+    @patch.object(TokenManager, 'get', return_value=TOKEN_VALUES)
+    def test_warmup_with_keep_warm_interval_should_warm_up_periodically(
+            self, mock_token_manager_get: Mock):
+        called = threading.Semaphore(0)
+
+        def warmup(*args):
+            called.release()
+            return 0
+
+        with patch.object(BaseRequest, 'warmup', side_effect=warmup):
+            api = IncogniaAPI(self.CLIENT_ID, self.CLIENT_SECRET)
+            api.warmup(keep_warm_interval=0.01)
+            for _ in range(3):
+                self.assertTrue(called.acquire(timeout=5))
+            api.stop_keep_warm()
+            time.sleep(0.05)
+            while called.acquire(blocking=False):
+                pass
+            time.sleep(0.05)
+
+            self.assertFalse(called.acquire(blocking=False))